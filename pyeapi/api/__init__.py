@@ -29,6 +29,6 @@
 # OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
 # IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
-from .abstract import Entity, EntityCollection
+from .abstract import Entity, EntityCollection, memoized
 
-__all__ = ['Entity', 'EntityCollection']
+__all__ = ['Entity', 'EntityCollection', 'memoized']
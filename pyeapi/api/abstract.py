@@ -41,9 +41,74 @@ ultimately derive from BaseEntity which provides some common functions to
 make building API modules easier.
 """
 
+import re
+
 from collections.abc import Callable, Mapping
+from functools import wraps
+from pyeapi.configmodel import Section
 from pyeapi.eapilib import CommandError
-from pyeapi.utils import make_iterable
+from pyeapi.utils import iter_sections, make_iterable
+
+
+def _copy(value):
+    """Returns a copy of a parsed model
+
+    Only the containers are copied, which is all that is needed for the
+    dict, list and set values returned by the API modules
+    """
+    if isinstance(value, dict):
+        return dict((k, _copy(v)) for k, v in value.items())
+    elif isinstance(value, list):
+        return [_copy(v) for v in value]
+    elif isinstance(value, set):
+        return set(value)
+    return value
+
+
+def memoized(method):
+    """Memoizes the return value of a get or getall method
+
+    The decorated method must derive its return value only from the
+    running-config and its arguments.  The value is stored on the node
+    using Node.memoize so it is shared by every instance of the API module
+    and discarded when the running-config changes.  A copy of the stored
+    value is returned on each call so callers are free to modify it.
+
+    Note:
+        Models are memoized per API module and method.  The sections they
+        are derived from are shared between modules: an interface block
+        read by interfaces, switchports and ipinterfaces is split into its
+        command lines once per running-config by get_section_models.
+
+    Args:
+        method (callable): The method to decorate
+
+    Returns:
+        The decorated method
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (type(self).__qualname__, method.__module__,
+               method.__qualname__, args,
+               tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return method(self, *args, **kwargs)
+        value = self.node.memoize(key, lambda: method(self, *args, **kwargs))
+        return _copy(value)
+    return wrapper
+
+
+def _same(value, existing, normalize=None):
+    """Returns True if a desired value matches the current value"""
+    if isinstance(value, bool) or isinstance(existing, bool):
+        return value is existing
+    if value in (None, '') or existing in (None, ''):
+        return value in (None, '') and existing in (None, '')
+    if normalize is not None:
+        return normalize(value) == normalize(existing)
+    return str(value) == str(existing)
 
 
 class BaseEntity(object):
@@ -60,10 +125,15 @@ class BaseEntity(object):
             current running configuration
         error (CommandError): Holds the latest CommandError exception
             instance if raised
+        RECONCILE_ATTRIBUTES (dict): Maps the attributes of the resource
+            to the command that configures them.  See reconcile_state
 
     Args:
         node (Node): An instance of Node
     """
+
+    RECONCILE_ATTRIBUTES = dict()
+
     def __init__(self, node):
         self.node = node
 
@@ -79,6 +149,15 @@ class BaseEntity(object):
     def error(self):
         return self.node.connection.error
 
+    def invalidate(self):
+        """Discards any state derived from the node configuration
+
+        This method is called by Node.refresh for API instances cached by
+        Node.api.  Resources that keep their own parse caches should
+        override it to clear them.
+        """
+        pass
+
     def get_block(self, parent, config='running_config'):
         """ Scans the config and returns a block of code
 
@@ -100,6 +179,128 @@ class BaseEntity(object):
         except TypeError:
             return None
 
+    def get_tree(self, parent):
+        """ Scans the structured running-config and returns a section
+
+        Note:
+            Most resource parsers read the sections through
+            get_section_models, which is built from the structured
+            running-config when the node uses the json config_format.
+            get_tree is provided for parsers that want to walk the nested
+            commands of a section directly.
+
+        Args:
+            parent (str): The parent string to search the config tree for
+
+        Returns:
+            A ConfigTree object that represents the section of the
+            running-config.  If the parent string is not found, then this
+            method will return None.
+
+        """
+        return self.node.running_config_tree.section(r'^%s$' % parent)
+
+    def get_section_keys(self, regex):
+        """ Yields the top level config lines that match a regex
+
+        When the node uses the json config_format, the lines are read from
+        the top level of the structured running-config without rendering
+        it as text.  Otherwise the running-config text is scanned.
+
+        Args:
+            regex (str): A regular expression searched in every top level
+                config line
+
+        Returns:
+            An iterator of the match objects in config order
+        """
+        if self.node.config_format == 'json':
+            pattern = re.compile(regex)
+            for line in self.node.running_config_tree.commands():
+                match = pattern.search(line)
+                if match:
+                    yield match
+        else:
+            for match in re.finditer(regex, self.config, re.M):
+                yield match
+
+    def get_sections(self, regex):
+        """ Yields the top level config sections whose line matches a regex
+
+        The sections are read in a single pass in config order.  When the
+        node uses the json config_format, the section lines are read from
+        the structured running-config without rendering it as text.
+
+        Args:
+            regex (str): A regular expression searched in every top level
+                config line
+
+        Returns:
+            An iterator of (section line, section text) tuples where the
+                text is the block returned by get_block for the same line
+        """
+        if self.node.config_format == 'json':
+            search = re.compile(regex).search
+            for tree in self.node.running_config_tree.children():
+                if search(tree.key):
+                    yield tree.key, tree.text()
+        else:
+            for section in iter_sections(self.config, regex):
+                yield section
+
+    def get_section_models(self, keyword):
+        """ Returns the normalized models of the top level config sections
+
+        Every top level section whose line starts with keyword is split
+        into a Section once per running-config.  The models are memoized
+        on the node, so all API modules that read a section (for instance
+        an interface block) share a single parse of it.  With the json
+        config_format the models are built from the structured
+        running-config without rendering it as text.
+
+        Args:
+            keyword (str): The first word of the section lines, for
+                instance 'interface'
+
+        Returns:
+            dict: The Section instances in config order keyed by the
+                section line without the keyword.  The dict is shared and
+                must not be modified
+        """
+        head = keyword + ' '
+
+        def build():
+            models = dict()
+            if self.node.config_format == 'json':
+                for tree in self.node.running_config_tree.children():
+                    if tree.key.startswith(head):
+                        models[tree.key[len(head):]] = Section.from_tree(tree)
+            else:
+                regex = '^%s' % re.escape(head)
+                for line, text in iter_sections(self.config, regex):
+                    models[line[len(head):]] = Section.from_text(text)
+            return models
+
+        # pinned so streaming a collection does not split every section
+        # once per resource
+        return self.node.memoize(('section_models', keyword), build,
+                                 pinned=True)
+
+    def get_section_model(self, keyword, name):
+        """ Returns the normalized model of a single top level section
+
+        See get_section_models.
+
+        Args:
+            keyword (str): The first word of the section line
+            name (str): The remainder of the section line, for instance the
+                interface name
+
+        Returns:
+            A Section instance or None if the section is not configured
+        """
+        return self.get_section_models(keyword).get(name)
+
     def configure(self, commands):
         """Sends the commands list to the node in config mode
 
@@ -163,6 +364,115 @@ class BaseEntity(object):
             # raise ValueError("abstract.command_builder: No value "
             #                  "received '%s'" % value)
 
+    def _reconcile_attributes(self, name):
+        """Returns the attribute to command mapping of reconcile_state
+
+        Args:
+            name (str): The resource name the mapping is requested for
+
+        Returns:
+            dict: The RECONCILE_ATTRIBUTES of the class.  Subclasses
+                override this method when the mapping depends on the
+                resource being configured
+        """
+        return self.RECONCILE_ATTRIBUTES
+
+    def _reconcile_parent(self, name):
+        """Returns the config lines that enter the mode of a resource
+
+        Args:
+            name (str): The resource name to build the lines for
+
+        Returns:
+            list: The config lines sent before the attribute commands
+        """
+        return list()
+
+    def _reconcile_create(self, name):
+        """Returns the config lines needed when the resource is missing
+
+        Args:
+            name (str): The resource name to build the lines for
+
+        Returns:
+            list: The config lines sent after the parent lines when the
+                current state of the resource is None
+        """
+        return list()
+
+    def _reconcile_lines(self, name, current, desired):
+        """Returns the attribute commands needed to reach the desired state
+
+        Each attribute of the desired dict is looked up in the mapping
+        returned by _reconcile_attributes.  The mapped value is either the
+        command string or a tuple of the command string and a callable used
+        to normalize both values before they are compared.  Scalar values
+        are rendered with command_builder so True enables the command and
+        None or False negate it.  List values are compared item by item
+        and only the added and removed items are configured, unless the
+        attribute has a normalize callable: the list is then normalized as
+        a whole and configured with a single command, as a scalar value.
+
+        Args:
+            name (str): The resource name being reconciled
+            current (dict): The current state of the resource or None
+            desired (dict): The desired attribute values
+
+        Returns:
+            list: The commands that configure the changed attributes
+
+        Raises:
+            ValueError: If an attribute has no command mapping
+        """
+        attributes = self._reconcile_attributes(name)
+        current = current or dict()
+        commands = list()
+        for attr, value in desired.items():
+            if attr not in attributes:
+                raise ValueError('attribute %s can not be reconciled' % attr)
+            command, normalize = attributes[attr], None
+            if isinstance(command, tuple):
+                command, normalize = command
+            existing = current.get(attr)
+            if normalize is not None and \
+                    isinstance(value, (list, tuple, set)):
+                value = normalize(value)
+            if isinstance(value, (list, tuple, set)):
+                existing = existing or list()
+                for item in existing:
+                    if item not in value:
+                        commands.append(self.command_builder(
+                            '%s %s' % (command, item), disable=True))
+                for item in value:
+                    if item not in existing:
+                        commands.append(self.command_builder(command,
+                                                             value=item))
+            elif not _same(value, existing, normalize):
+                commands.append(self.command_builder(command, value=value))
+        return commands
+
+    def reconcile_commands(self, desired):
+        raise NotImplementedError
+
+    def reconcile_state(self, desired):
+        """Configures the node to match the desired state
+
+        The commands returned by reconcile_commands are sent to the node in
+        a single request.  No request is sent if the node is already in
+        the desired state.
+
+        Args:
+            desired (dict): The desired state, see reconcile_commands
+
+        Returns:
+            True if the node is in the desired state or the commands are
+                executed without exception otherwise False is returned
+        """
+        commands = self.reconcile_commands(desired)
+        if not commands:
+            return True
+        return self.configure(commands)
+
     def configure_interface(self, name, commands):
         """Configures the specified interface with the commands
 
@@ -194,6 +504,21 @@ class Entity(BaseEntity, Callable):
     def get(self):
         raise NotImplementedError
 
+    def reconcile_commands(self, desired):
+        """Returns the commands needed to reach the desired state
+
+        Args:
+            desired (dict): The desired attribute values of the resource
+
+        Returns:
+            list: The commands to send to the node, empty if the resource
+                is already in the desired state
+        """
+        commands = self._reconcile_lines(None, self.get(), desired)
+        if commands:
+            commands[0:0] = self._reconcile_parent(None)
+        return commands
+
 
 class EntityCollection(BaseEntity, Mapping):
     """Abstract class for building EntityCollection resources
@@ -203,6 +528,10 @@ class EntityCollection(BaseEntity, Mapping):
     EntityCollection class should not be directly instantiated.
 
     Examples of an EntityCollection candidate include VLANs and interfaces
+
+    Iterating over the collection, len() and the in operator use an index
+    of the collection keys that is built once per running-config.  Values
+    are only parsed when accessed.
     """
 
     def __call__(self):
@@ -212,13 +541,84 @@ class EntityCollection(BaseEntity, Mapping):
         return self.get(value)
 
     def __len__(self):
-        return len(self.getall())
+        return len(self._key_index())
 
     def __iter__(self):
-        return iter(self.getall())
+        return iter(self._key_index())
+
+    def __contains__(self, value):
+        return value in self._key_index()
+
+    def _key_index(self):
+        key = (type(self).__qualname__, type(self).__module__, '_key_index')
+        return self.node.memoize(key, lambda: dict.fromkeys(self.iterkeys()))
+
+    def iterkeys(self):
+        """Yields the keys of the collection from the running-config
+
+        The default implementation returns the keys of getall.  Subclasses
+        override this method to derive the keys from the section header
+        lines of the configuration without parsing the section bodies.
+
+        Returns:
+            An iterator over the keys of the collection
+        """
+        return iter(self.getall() or {})
+
+    def iter_all(self):
+        """Yields the resources of the collection one at a time
+
+        Unlike getall, no dict of all resources is built and the yielded
+        resources are not memoized, so memory use does not grow with the
+        size of the collection and processing can start with the first
+        resource.
+
+        Returns:
+            An iterator of (name, resource) tuples
+        """
+        seen = set()
+        for name in self.iterkeys():
+            if name in seen:
+                continue
+            seen.add(name)
+            with self.node.memoize_paused():
+                value = self.get(name)
+            if value:
+                yield name, value
+
+    def stream(self):
+        """Alias of iter_all"""
+        return self.iter_all()
 
     def getall(self):
         raise NotImplementedError
 
     def get(self, name, default=None):
         raise NotImplementedError
+
+    def reconcile_commands(self, desired):
+        """Returns the commands needed to reach the desired state
+
+        Resources that do not exist are created using the lines returned
+        by _reconcile_parent and _reconcile_create.  Resources not present
+        in the desired dict are left untouched.
+
+        Args:
+            desired (dict): The desired attribute values keyed by the
+                resource name
+
+        Returns:
+            list: The commands to send to the node, empty if the resources
+                are already in the desired state
+        """
+        commands = list()
+        for name, attributes in desired.items():
+            current = self.get(name)
+            lines = self._reconcile_lines(name, current, attributes or {})
+            if current is None:
+                lines[0:0] = self._reconcile_create(name)
+            elif not lines:
+                continue
+            commands.extend(self._reconcile_parent(name))
+            commands.extend(lines)
+        return commands
@@ -40,17 +40,36 @@ following class implementations:
         access control lists in EOS
     * StandardAcls -- Class that manages the set of standard ACLs
     * ExtendedAcls -- Class that manages the set of extended ACLs
+    * CompactAcl -- A read-only ACL model for large ACLs that stores its
+        entries in StandardAclEntry or ExtendedAclEntry objects
 
 """
 import re
 
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from difflib import SequenceMatcher
+
 import netaddr
 
-from pyeapi.api import EntityCollection
+from pyeapi.api import EntityCollection, memoized
 from pyeapi.utils import ProxyCall
 
 VALID_ACLS = frozenset(['standard', 'extended'])
 
+# Matches the entry lines of an ACL block
+ENTRY_LINE_RE = re.compile(r'\d+ [p|d].*$', re.M)
+
+# Matches the top level line of an ACL, the type is None for extended ACLs
+ACL_LINE_RE = re.compile(r'^ip access-list (?:(standard) )?(.+)$')
+
+# Matches the end of a top level config block
+BLOCK_END_RE = re.compile(r'\n(?=[^ \t\n])')
+
+# The default sequence number increment used by reconcile
+SEQNO_STEP = 10
+
 
 def mask_to_prefixlen(mask):
     """Converts a subnet mask from dotted decimal to bit length
@@ -79,6 +98,171 @@ def prefixlen_to_mask(prefixlen):
     return str(netaddr.IPNetwork(addr).netmask)
 
 
+def iter_entries(entry_re, entry_class, config, pos=0, endpos=None):
+    """Parses the entries of an ACL block one at a time
+
+    The entry lines are matched in place between pos and endpos, so an
+    ACL block can be parsed directly from the running-config without
+    copying it.
+
+    Args:
+        entry_re (re.Pattern): The regex used to parse a single entry
+        entry_class (type): The AclEntry subclass to create
+        config (str): The config text holding the ACL block
+        pos (int): The position the block starts at
+        endpos (int): The position the block ends at.  The default is the
+            end of config
+
+    Returns:
+        An iterator of entry_class instances
+    """
+    if endpos is None:
+        endpos = len(config)
+    for item in ENTRY_LINE_RE.finditer(config, pos, endpos):
+        match = entry_re.match(config, item.start(), item.end())
+        if match:
+            yield entry_class.from_match(match)
+
+
+class AclEntry(object):
+    """Base class of the compact ACL entries
+
+    Subclasses list the entry attributes in __slots__, the seqno slot is
+    an int and the other slots hold the values of the entry dict returned
+    by StandardAcls.get and ExtendedAcls.get.
+    """
+    __slots__ = ()
+
+    def __init__(self, **kwargs):
+        for attr in self.__slots__:
+            setattr(self, attr, kwargs.get(attr))
+
+    def __eq__(self, other):
+        return type(self) is type(other) and \
+            self.as_tuple() == other.as_tuple()
+
+    def __repr__(self):
+        return '%s(%s)' % (type(self).__name__, ', '.join(
+            '%s=%r' % (attr, getattr(self, attr)) for attr in self.__slots__))
+
+    def as_tuple(self):
+        return tuple(getattr(self, attr) for attr in self.__slots__)
+
+    def as_dict(self):
+        """Returns the entry in the form of the entries of get
+
+        Returns:
+            dict: The entry attributes except the seqno
+        """
+        return dict((attr, getattr(self, attr))
+                    for attr in self.__slots__[1:])
+
+
+class StandardAclEntry(AclEntry):
+    """An entry of a standard ACL"""
+    __slots__ = ('seqno', 'action', 'srcaddr', 'srclen', 'log')
+
+    @classmethod
+    def from_match(cls, match):
+        (seq, act, anyip, host, ip, mlen, mask, log) = match.groups()
+        return cls(seqno=int(seq), action=act, srcaddr=ip or '0.0.0.0',
+                   srclen=mlen or mask_to_prefixlen(mask),
+                   log=log is not None)
+
+
+class ExtendedAclEntry(AclEntry):
+    """An entry of an extended ACL"""
+    __slots__ = ('seqno', 'action', 'protocol', 'srcaddr', 'srclen',
+                 'srcport', 'dstaddr', 'dstlen', 'dstport', 'other')
+
+    @classmethod
+    def from_match(cls, match):
+        return cls(seqno=int(match.group(1)), action=match.group(2),
+                   protocol=match.group(3),
+                   srcaddr=match.group(5) or 'any', srclen=match.group(6),
+                   srcport=match.group(7),
+                   dstaddr=match.group(9) or 'any', dstlen=match.group(10),
+                   dstport=match.group(12), other=match.group(13))
+
+
+class CompactAcl(Mapping):
+    """A read-only ACL model for large ACLs
+
+    The entries are stored as AclEntry objects in seqno order along with
+    an array of their seqnos, which is used to look up entries with a
+    binary search.  As a mapping, a CompactAcl behaves like the entries
+    dict returned by get: it is keyed by the seqno string and the entry
+    dicts are built when accessed.
+
+    Attributes:
+        name (str): The name of the ACL
+        type (str): The ACL type, either 'standard' or 'extended'
+
+    Args:
+        name (str): The name of the ACL
+        acl_type (str): The ACL type, either 'standard' or 'extended'
+        entries (iterable): The AclEntry objects of the ACL
+    """
+    __slots__ = ('name', 'type', '_seqnos', '_entries')
+
+    def __init__(self, name, acl_type, entries):
+        self.name = name
+        self.type = acl_type
+        entries = list(entries)
+        if any(entries[i].seqno >= entries[i + 1].seqno
+               for i in range(len(entries) - 1)):
+            entries = list(dict((e.seqno, e) for e in entries).values())
+            entries.sort(key=lambda e: e.seqno)
+        self._entries = entries
+        self._seqnos = array('q', (entry.seqno for entry in entries))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return (str(seqno) for seqno in self._seqnos)
+
+    def __getitem__(self, seqno):
+        try:
+            return self.entry(int(seqno)).as_dict()
+        except (TypeError, ValueError):
+            raise KeyError(seqno)
+
+    def __repr__(self):
+        return '%s(%r, %r, <%d entries>)' % (type(self).__name__, self.name,
+                                             self.type, len(self))
+
+    def entry(self, seqno):
+        """Returns the entry of a seqno
+
+        Args:
+            seqno (int): The sequence number of the entry
+
+        Returns:
+            The AclEntry object of the seqno
+
+        Raises:
+            KeyError: If the ACL has no entry with the seqno
+        """
+        index = bisect_left(self._seqnos, seqno)
+        if index < len(self._seqnos) and self._seqnos[index] == seqno:
+            return self._entries[index]
+        raise KeyError(seqno)
+
+    def entries(self):
+        """Returns an iterator of the AclEntry objects in seqno order"""
+        return iter(self._entries)
+
+    def to_dict(self):
+        """Returns the ACL in the form returned by get
+
+        Returns:
+            dict: The ACL name, type and entries
+        """
+        entries = dict((str(e.seqno), e.as_dict()) for e in self._entries)
+        return dict(name=self.name, type=self.type, entries=entries)
+
+
 class Acls(EntityCollection):
 
     def __init__(self, node, *args, **kwargs):
@@ -88,6 +272,7 @@ class Acls(EntityCollection):
     def get(self, name):
         return self.get_instance(name)[name]
 
+    @memoized
     def getall(self):
         """Returns all ACLs in a dict object.
 
@@ -101,9 +286,9 @@ class Acls(EntityCollection):
                 }
 
         """
-        acl_re = re.compile(r'^ip access-list (?:(standard) )?(.+)$', re.M)
         response = {'standard': {}, 'extended': {}}
-        for acl_type, name in acl_re.findall(self.config):
+        for match in self.get_section_keys(ACL_LINE_RE.pattern):
+            acl_type, name = match.groups()
             acl = self.get(name)
             if acl_type and acl_type == 'standard':
                 response['standard'][name] = acl
@@ -111,9 +296,37 @@ class Acls(EntityCollection):
                 response['extended'][name] = acl
         return response
 
+    def iterkeys(self):
+        # the collection is keyed by ACL name, unlike the dict of getall
+        # that groups the ACLs by type
+        for match in self.get_section_keys(ACL_LINE_RE.pattern):
+            yield match.group(2)
+
+    def iter_all(self):
+        """Yields all ACLs one at a time
+
+        Unlike getall, the ACLs are not grouped by type.  See
+        EntityCollection.iter_all.
+
+        Returns:
+            An iterator of (name, acl) tuples
+        """
+        instances = dict()
+        for match in self.get_section_keys(ACL_LINE_RE.pattern):
+            acl_type = match.group(1) or 'extended'
+            if acl_type not in instances:
+                instances[acl_type] = ACL_CLASS_MAP[acl_type](self.node)
+            with self.node.memoize_paused():
+                acl = instances[acl_type].get(match.group(2))
+            yield match.group(2), acl
+
     def __getattr__(self, name):
         return ProxyCall(self.marshall, name)
 
+    def invalidate(self):
+        # the instance type of an ACL is derived from the config
+        self._instances.clear()
+
     def marshall(self, name, *args, **kwargs):
         acl_name = args[0]
         acl_instance = self.get_instance(acl_name)
@@ -126,10 +339,8 @@ class Acls(EntityCollection):
     def get_instance(self, name):
         if name in self._instances:
             return self._instances[name]
-        acl_re = re.compile(r'^ip access-list (?:(standard) )?(%s)$' % name,
-                            re.M)
-        match = acl_re.search(self.config)
-        if match:
+        for match in self.get_section_keys(
+                r'^ip access-list (?:(standard) )?(%s)$' % name):
             acl_type = match.group(1) or 'extended'
             return self.create_instance(match.group(2), acl_type)
         return {name: None}
@@ -147,6 +358,28 @@ class Acls(EntityCollection):
         acl_instance = self.create_instance(name, type)
         return acl_instance.create(name)
 
+    def reconcile(self, name, entries, type='standard', step=SEQNO_STEP):
+        """Configures an ACL with a desired list of entries
+
+        The call is sent to the ACL class of the configured ACL.  See
+        ExtendedAcls.reconcile.
+
+        Args:
+            name (str): The name of the ACL
+            entries (list): The desired entries in order
+            type (str): The type of the ACL created if it is not
+                configured, either 'standard' or 'extended'
+            step (int): The seqno increment used for new entries
+
+        Returns:
+            dict: The changes, see ExtendedAcls.reconcile
+        """
+        if name in self._instances or name in self:
+            acl_instance = self.get_instance(name)
+        else:
+            acl_instance = self.create_instance(name, type)
+        return acl_instance.reconcile(name, entries, step=step)
+
 
 class StandardAcls(EntityCollection):
 
@@ -159,6 +392,7 @@ class StandardAcls(EntityCollection):
                           r'(?: ([0-9]+(?:\.[0-9]+){3}))?'
                           r'(?: (log))?')
 
+    @memoized
     def get(self, name):
         config = self.get_block('ip access-list standard %s' % name)
         if not config:
@@ -167,17 +401,47 @@ class StandardAcls(EntityCollection):
         resource.update(self._parse_entries(config))
         return resource
 
+    def iterkeys(self):
+        for match in self.get_section_keys(
+                r'^ip access-list standard (.+)$'):
+            yield match.group(1)
+
+    @memoized
+    def get_compact(self, name):
+        """Returns a standard ACL as a CompactAcl
+
+        The entries are parsed in place from the running-config.
+
+        Args:
+            name (str): The name of the ACL
+
+        Returns:
+            A CompactAcl object or None if the ACL is not configured
+        """
+        return _compact(self, name, 'standard',
+                        'ip access-list standard %s' % name)
+
+    def reconcile(self, name, entries, step=SEQNO_STEP):
+        """Configures a standard ACL with a desired list of entries
+
+        See ExtendedAcls.reconcile.
+
+        Args:
+            name (str): The name of the ACL
+            entries (list): The desired entries in order, each entry is the
+                entry line without the seqno, e.g. 'permit 1.2.3.0/24 log'
+            step (int): The seqno increment used for new entries
+
+        Returns:
+            dict: The changes, see ExtendedAcls.reconcile
+        """
+        return _reconcile(self, name, 'standard',
+                          'ip access-list standard %s' % name, entries, step)
+
     def _parse_entries(self, config):
         entries = dict()
-        for item in re.finditer(r'\d+ [p|d].*$', config, re.M):
-            match = self.entry_re.match(item.group(0))
-            (seq, act, anyip, host, ip, mlen, mask, log) = match.groups()
-            entry = dict()
-            entry['action'] = act
-            entry['srcaddr'] = ip or '0.0.0.0'
-            entry['srclen'] = mlen or mask_to_prefixlen(mask)
-            entry['log'] = log is not None
-            entries[seq] = entry
+        for entry in iter_entries(self.entry_re, StandardAclEntry, config):
+            entries[str(entry.seqno)] = entry.as_dict()
         return dict(entries=entries)
 
     def create(self, name):
@@ -231,6 +495,7 @@ class ExtendedAcls(EntityCollection):
                           r'(?: ((?:eq|gt|lt|neq|range) [\w-]+))?'
                           r'(?: (.+))?')
 
+    @memoized
     def get(self, name):
         config = self.get_block('ip access-list %s' % name)
         if not config:
@@ -239,22 +504,74 @@ class ExtendedAcls(EntityCollection):
         resource.update(self._parse_entries(config))
         return resource
 
+    def iterkeys(self):
+        for match in self.get_section_keys(
+                r'^ip access-list (?!standard )(.+)$'):
+            yield match.group(1)
+
+    @memoized
+    def get_compact(self, name):
+        """Returns an extended ACL as a CompactAcl
+
+        The entries are parsed in place from the running-config.
+
+        Args:
+            name (str): The name of the ACL
+
+        Returns:
+            A CompactAcl object or None if the ACL is not configured
+        """
+        return _compact(self, name, 'extended', 'ip access-list %s' % name)
+
+    def reconcile(self, name, entries, step=SEQNO_STEP):
+        """Configures an extended ACL with a desired list of entries
+
+        The desired entries are compared with the entries of the ACL in
+        the running-config.  Entries that are already configured in the
+        desired order keep their seqno, the other entries are removed and
+        the missing entries are inserted between them.  If there are not
+        enough free seqnos between two kept entries, the ACL is
+        resequenced with a larger increment before the new entries are
+        added.  All commands are sent in a single request using a config
+        session, so either all or none of the changes are applied.
+
+        Args:
+            name (str): The name of the ACL, the ACL is created if it is
+                not configured
+            entries (list): The desired entries in order, each entry is the
+                entry line without the seqno, e.g. 'permit tcp any any'
+            step (int): The seqno increment used for new entries
+
+        Returns:
+            dict: The changes with the following keys::
+
+                {
+                    "added": {<seqno>: {...}, ...},
+                    "removed": {<seqno>: {...}, ...},
+                    "resequence": None or (<start>, <increment>),
+                    "result": True or False
+                }
+
+            The removed seqnos are the seqnos of the current ACL and the
+            added seqnos are the seqnos of the new entries after the
+            optional resequence.  The result key is False if the node
+            rejected the changes.
+
+            When called while a Node.transaction is open, the commands
+            join that transaction and the result key is None.  They are
+            sent when that transaction commits and are only applied
+            atomically if it was opened with session=True.
+
+        Raises:
+            ValueError: If an entry can not be parsed
+        """
+        return _reconcile(self, name, 'extended', 'ip access-list %s' % name,
+                          entries, step)
+
     def _parse_entries(self, config):
         entries = dict()
-        for item in re.finditer(r'\d+ [p|d].*$', config, re.M):
-            match = self.entry_re.match(item.group(0))
-            if match:
-                entry = dict()
-                entry['action'] = match.group(2)
-                entry['protocol'] = match.group(3)
-                entry['srcaddr'] = match.group(5) or 'any'
-                entry['srclen'] = match.group(6)
-                entry['srcport'] = match.group(7)
-                entry['dstaddr'] = match.group(9) or 'any'
-                entry['dstlen'] = match.group(10)
-                entry['dstport'] = match.group(12)
-                entry['other'] = match.group(13)
-                entries[match.group(1)] = entry
+        for entry in iter_entries(self.entry_re, ExtendedAclEntry, config):
+            entries[str(entry.seqno)] = entry.as_dict()
         return dict(entries=entries)
 
     def create(self, name):
@@ -298,6 +615,100 @@ class ExtendedAcls(EntityCollection):
 
 ACL_CLASS_MAP = {'standard': StandardAcls, 'extended': ExtendedAcls}
 
+ENTRY_CLASS_MAP = {'standard': StandardAclEntry, 'extended': ExtendedAclEntry}
+
+
+def _compact(acls, name, acl_type, parent):
+    entry_class = ENTRY_CLASS_MAP[acl_type]
+    if acls.node.config_format == 'json':
+        tree = acls.node.running_config_tree.child(parent)
+        if tree is None:
+            return None
+        entries = iter_entries(acls.entry_re, entry_class,
+                               '\n'.join(tree.commands()))
+        return CompactAcl(name, acl_type, entries)
+    config = acls.config
+    match = re.search(r'^%s$' % re.escape(parent), config, re.M)
+    if not match:
+        return None
+    end = BLOCK_END_RE.search(config, match.end())
+    end = end.start() if end else len(config)
+    entries = iter_entries(acls.entry_re, entry_class, config, match.end(),
+                           end)
+    return CompactAcl(name, acl_type, entries)
+
+
+def _parse_entry(acls, acl_type, line):
+    match = acls.entry_re.match('0 %s' % line.strip())
+    if not match:
+        raise ValueError('invalid %s acl entry %r' % (acl_type, line))
+    return ENTRY_CLASS_MAP[acl_type].from_match(match)
+
+
+def _entry_key(entry):
+    # the prefix length is an int when parsed from a mask
+    return tuple(str(value) for value in entry.as_tuple()[1:])
+
+
+def _reconcile(acls, name, acl_type, parent, entries, step):
+    desired = [(line.strip(), _parse_entry(acls, acl_type, line))
+               for line in entries]
+    current = acls.get_compact(name)
+    current = list(current.entries()) if current else []
+
+    matcher = SequenceMatcher(None, [_entry_key(e) for e in current],
+                              [_entry_key(e) for _, e in desired],
+                              autojunk=False)
+    removed = list()
+    kept = list()
+    runs = list()
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            kept.extend(current[i1:i2])
+            continue
+        removed.extend(current[i1:i2])
+        if j2 > j1:
+            runs.append((len(kept), desired[j1:j2]))
+
+    # the new entries of a run are inserted after the kept entry
+    # preceding the run and before the kept entry following it
+    seqnos = [entry.seqno for entry in kept]
+    resequence = None
+    if any(len(run) >= (seqnos[index] - (seqnos[index - 1] if index else 0))
+           for index, run in runs if index < len(seqnos)):
+        increment = max([step] + [len(run) + 1 for _, run in runs])
+        resequence = (increment, increment)
+        seqnos = [increment * (i + 1) for i in range(len(seqnos))]
+
+    added = list()
+    for index, run in runs:
+        lower = seqnos[index - 1] if index else 0
+        if index < len(seqnos):
+            spacing = (seqnos[index] - lower) // (len(run) + 1)
+        else:
+            spacing = step
+        for offset, (line, entry) in enumerate(run, 1):
+            added.append((lower + spacing * offset, line, entry))
+
+    response = dict(added=dict((str(s), e.as_dict()) for s, _, e in added),
+                    removed=dict((str(e.seqno), e.as_dict())
+                                 for e in removed),
+                    resequence=resequence, result=True)
+    if not added and not removed and current:
+        return response
+
+    commands = [parent]
+    commands.extend('no %s' % entry.seqno for entry in removed)
+    if resequence:
+        commands.append('resequence %s %s' % resequence)
+    commands.extend('%s %s' % (seqno, line) for seqno, line, _ in added)
+    commands.append('exit')
+    with acls.node.transaction(session=True) as txn:
+        txn.add(commands)
+    # the commands that joined an open transaction are not sent yet
+    response['result'] = txn.error is None if txn.committed else None
+    return response
+
 
 def instance(node):
     return Acls(node)
@@ -38,11 +38,58 @@ from collections import namedtuple
 
 import netaddr
 
-from pyeapi.api import Entity, EntityCollection
+from pyeapi.api import Entity, EntityCollection, memoized
 from pyeapi.utils import make_iterable
 
 Network = namedtuple('Network', 'prefix length route_map')
 
+NEIGHBOR_RE = re.compile(r'^(no )?neighbor (\S+)(?: (.*))?$')
+
+
+def parse_neighbor_lines(config):
+    """Groups the neighbor lines of a router bgp block in a single pass
+
+    Every 'neighbor <name> ...' line (negated or not) is recorded with the
+    VRF and address-family sub-section it is configured in.  Lines of the
+    top level of the block are in the 'default' VRF and lines outside of
+    an address-family sub-section have an address-family of None.
+
+    Args:
+        config (str): The router bgp block
+
+    Returns:
+        dict: The lines of every neighbor in config order, keyed by the
+            neighbor name.  Each line is a tuple of (vrf, address_family,
+            negated, text) where text is the part of the line that follows
+            the neighbor name
+    """
+    neighbors = dict()
+    vrf = 'default'
+    family = None
+    vrf_indent = family_indent = None
+    for line in config.splitlines()[1:]:
+        text = line.strip()
+        if not text or text.startswith('!'):
+            continue
+        indent = len(line) - len(line.lstrip())
+        if family_indent is not None and indent <= family_indent:
+            family = family_indent = None
+        if vrf_indent is not None and indent <= vrf_indent:
+            vrf = 'default'
+            vrf_indent = None
+        if text.startswith('vrf '):
+            vrf, vrf_indent = text[4:], indent
+            continue
+        if text.startswith('address-family '):
+            family, family_indent = text[15:], indent
+            continue
+        match = NEIGHBOR_RE.match(text)
+        if match:
+            negated, name, rest = match.groups()
+            neighbors.setdefault(name, list()).append(
+                (vrf, family, negated is not None, rest or ''))
+    return neighbors
+
 
 class Bgp(Entity):
     """The Bgp class implements global BGP router configuration
@@ -59,6 +106,7 @@ class Bgp(Entity):
         self._neighbors = BgpNeighbors(self.node)
         return self._neighbors
 
+    @memoized
     def get(self):
         """Returns the bgp routing configuration as a dict object
         """
@@ -181,78 +229,166 @@ class Bgp(Entity):
 
 class BgpNeighbors(EntityCollection):
 
-    def get(self, name):
-        config = self.get_block('^router bgp .*')
-        response = dict(name=name)
-        response.update(self._parse_peer_group(config, name))
-        response.update(self._parse_remote_as(config, name))
-        response.update(self._parse_send_community(config, name))
-        response.update(self._parse_shutdown(config, name))
-        response.update(self._parse_description(config, name))
-        response.update(self._parse_next_hop_self(config, name))
-        response.update(self._parse_route_map_in(config, name))
-        response.update(self._parse_route_map_out(config, name))
+    def _index(self):
+        key = (type(self).__qualname__, type(self).__module__, '_index')
+
+        def build():
+            config = self.get_block('^router bgp .*')
+            return parse_neighbor_lines(config) if config else None
+        # pinned so iter_all does not parse the block for every neighbor
+        return self.node.memoize(key, build, pinned=True)
+
+    def _lines(self, name, vrf=None):
+        lines = (self._index() or {}).get(name, [])
+        if vrf is None:
+            return lines
+        return [line for line in lines if line[0] == vrf]
+
+    @memoized
+    def get(self, name, vrf=None):
+        """Returns the configuration of a BGP neighbor
+
+        The neighbor lines are looked up in an index of the router bgp
+        block that is built once per running-config.
+
+        Args:
+            name (str): The neighbor address or peer group name
+            vrf (str): The VRF to return the neighbor configuration of,
+                'default' for the top level of the router bgp block.  The
+                default value of None uses the lines of all VRFs
+
+        Returns:
+            dict: The neighbor configuration
+        """
+        lines = self._lines(name, vrf)
+        if self.version_number >= '4.23':
+            peer_group = 'peer group '
+        else:
+            peer_group = 'peer-group '
+
+        response = dict(name=name, peer_group=None, remote_as=None,
+                        send_community=True, shutdown=False,
+                        description=None, next_hop_self=True,
+                        route_map_in=None, route_map_out=None)
+        found = set()
+
+        def first(key, value):
+            if key not in found:
+                found.add(key)
+                response[key] = value
+
+        for _, _, negated, text in lines:
+            if text.startswith(peer_group) and \
+                    text[len(peer_group):][:1].strip():
+                first('peer_group', text[len(peer_group):].split()[0])
+            elif text.startswith('remote-as '):
+                first('remote_as', text[len('remote-as '):])
+            elif text.startswith('description '):
+                first('description', text[len('description '):])
+            elif text.startswith('send-community') and negated:
+                response['send_community'] = False
+            elif text.startswith('next-hop-self') and negated:
+                response['next_hop_self'] = False
+            elif text.startswith('shutdown') and not negated:
+                response['shutdown'] = True
+            elif text.startswith('route-map '):
+                words = text.split()
+                if len(words) > 2 and words[2] == 'in':
+                    first('route_map_in', words[1])
+                elif len(words) > 2 and words[2] == 'out':
+                    first('route_map_out', words[1])
         return response
 
-    def getall(self):
-        config = self.get_block('^router bgp .*')
-        if not config:
+    @memoized
+    def getall(self, vrf=None):
+        """Returns the configuration of all BGP neighbors
+
+        Args:
+            vrf (str): The VRF to return the neighbors of, 'default' for
+                the top level of the router bgp block.  The default value
+                of None returns the neighbors of all VRFs
+
+        Returns:
+            dict: The neighbor configurations keyed by neighbor name, or
+                None if BGP is not configured
+        """
+        index = self._index()
+        if index is None:
             return None
 
         collection = dict()
-        for neighbor in re.findall(r'neighbor ([^\s]+)', config):
-            collection[neighbor] = self.get(neighbor)
+        for name in self.iterkeys(vrf):
+            collection[name] = self.get(name, vrf)
         return collection
 
-    def _parse_peer_group(self, config, name):
-        if self.version_number >= '4.23':
-            regexp = r'neighbor {} peer group ([^\s]+)'.format(name)
-        else:
-            regexp = r'neighbor {} peer-group ([^\s]+)'.format(name)
-        match = re.search(regexp, config)
-        value = match.group(1) if match else None
-        return dict(peer_group=value)
-
-    def _parse_remote_as(self, config, name):
-        remote_as_re = rf'(?<=neighbor {name} remote-as ).*'
-        match = re.search(remote_as_re, config)
-        return { 'remote_as': match.group(0) if match else None}
-
-    def _parse_send_community(self, config, name):
-        exp = 'no neighbor {} send-community'.format(name)
-        value = exp in config
-        return dict(send_community=not value)
-
-    def _parse_shutdown(self, config, name):
-        regexp = r'(?<!no )neighbor {} shutdown'.format(name)
-        match = re.search(regexp, config, re.M)
-        value = True if match else False
-        return dict(shutdown=value)
-
-    def _parse_description(self, config, name):
-        regexp = r'neighbor {} description (.*)$'.format(name)
-        match = re.search(regexp, config, re.M)
-        value = match.group(1) if match else None
-        return dict(description=value)
-
-    def _parse_next_hop_self(self, config, name):
-        exp = 'no neighbor {} next-hop-self'.format(name)
-        value = exp in config
-        return dict(next_hop_self=not value)
+    def iterkeys(self, vrf=None):
+        for name, lines in (self._index() or {}).items():
+            if vrf is None or any(line[0] == vrf for line in lines):
+                yield name
 
-    def _parse_route_map_in(self, config, name):
-        regexp = r'neighbor {} route-map ([^\s]+) in'.format(name)
-        match = re.search(regexp, config, re.M)
-        value = match.group(1) if match else None
-        return dict(route_map_in=value)
+    def vrfs(self):
+        """Returns the VRFs BGP neighbors are configured in
 
-    def _parse_route_map_out(self, config, name):
-        regexp = r'neighbor {} route-map ([^\s]+) out'.format(name)
-        match = re.search(regexp, config, re.M)
-        value = match.group(1) if match else None
-        return dict(route_map_out=value)
+        Returns:
+            list: The VRF names in config order, 'default' for the neighbors
+                of the top level of the router bgp block
+        """
+        vrfs = dict()
+        for lines in (self._index() or {}).values():
+            vrfs.update((line[0], None) for line in lines)
+        return list(vrfs)
+
+    def get_address_families(self, name, vrf='default'):
+        """Returns the address-family configuration of a BGP neighbor
+
+        Args:
+            name (str): The neighbor address or peer group name
+            vrf (str): The VRF of the neighbor.  The default value is
+                'default', the top level of the router bgp block
+
+        Returns:
+            dict: The configuration of every address-family sub-section the
+                neighbor is configured in, keyed by address-family::
+
+                    {
+                        "ipv4": {
+                            "activate": True,
+                            "route_map_in": "RM-IN",
+                            "route_map_out": None
+                        }
+                    }
+        """
+        families = dict()
+        for _, family, negated, text in self._lines(name, vrf):
+            if family is None:
+                continue
+            response = families.setdefault(family, dict(
+                activate=False, route_map_in=None, route_map_out=None))
+            words = text.split()
+            if words[:1] == ['activate']:
+                response['activate'] = not negated
+            elif len(words) > 2 and words[0] == 'route-map' and \
+                    words[2] in ('in', 'out') and not negated:
+                response['route_map_%s' % words[2]] = words[1]
+        return families
 
     def ispeergroup(self, name):
+        """Returns True if name is a peer group
+
+        Peer groups defined in the router bgp block are looked up in the
+        neighbor index, any other name that is not an ip address is also
+        considered to be a peer group.
+
+        Args:
+            name (str): The neighbor or peer group name
+
+        Returns:
+            bool: True if name is a peer group
+        """
+        keyword = 'peer group' if self.version_number >= '4.23' \
+            else 'peer-group'
+        if any(text == keyword for _, _, _, text in self._lines(name)):
+            return True
         try:
             netaddr.IPAddress(name)
             return False
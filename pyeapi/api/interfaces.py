@@ -59,11 +59,15 @@ Parameters:
 
 import re
 
-from pyeapi.api import EntityCollection
-from pyeapi.utils import ProxyCall, CliVariants
+from pyeapi.api import EntityCollection, memoized
+from pyeapi.eapilib import CommandError
+from pyeapi.utils import ProxyCall, CliVariants, VlanSet
+from pyeapi.utils import expand_range
 
 MIN_LINKS_RE = re.compile(r'(?<=\s{3}min-links\s)(?P<value>.+)$', re.M)
 
+MCAST_GROUP_RE = re.compile(r'[\d]{3}\.[\d]+\.[\d]+\.[\d]+$')
+
 DEFAULT_LACP_MODE = 'on'
 DEFAULT_LACP_FALLBACK = 'disabled'
 DEFAULT_LACP_FALLBACK_TIMEOUT = 90
@@ -92,6 +96,12 @@ class Interfaces(EntityCollection):
     def get(self, name):
         return self.get_instance(name)[name]
 
+    def _reconcile_attributes(self, name):
+        return self.get_instance(name)._reconcile_attributes(name)
+
+    def _reconcile_parent(self, name):
+        return self.get_instance(name)._reconcile_parent(name)
+
     def getall(self):
         """Returns all interfaces in a dict object.
 
@@ -105,18 +115,23 @@ class Interfaces(EntityCollection):
                 }
 
         """
-        interfaces_re = re.compile(r'(?<=^interface\s)(.+)$', re.M)
-
         response = dict()
-        for name in interfaces_re.findall(self.config):
-            interface = self.get(name)
-            if interface:
-                response[name] = interface
+        for name, config in self.get_section_models('interface').items():
+            instance = self.get_instance(name)
+            response[name] = instance._parse_resource(name, config)
         return response
 
+    def iterkeys(self):
+        for match in self.get_section_keys(r'(?<=^interface\s)(.+)$'):
+            yield match.group(1)
+
     def __getattr__(self, name):
         return ProxyCall(self.marshall, name)
 
+    def invalidate(self):
+        for instance in self._instances.values():
+            instance.invalidate()
+
     def get_instance(self, interface):
         cls = INTERFACE_CLASS_MAP.get(interface[0:2]) or BaseInterface
         if cls in self._instances:
@@ -141,9 +156,16 @@ class Interfaces(EntityCollection):
 
 class BaseInterface(EntityCollection):
 
+    RECONCILE_ATTRIBUTES = dict(description='description',
+                                shutdown='shutdown')
+
     def __str__(self):
         return 'Interface'
 
+    def _reconcile_parent(self, name):
+        return ['interface %s' % name]
+
+    @memoized
     def get(self, name):
         """Returns a generic interface as a set of key/value pairs
 
@@ -167,10 +189,22 @@ class BaseInterface(EntityCollection):
                 the interface configuration.  If the specified interface
                 does not exist, then None is returned
         """
-        config = self.get_block('^interface %s' % name)
+        config = self.get_section_model('interface', name)
         if not config:
             return None
 
+        return self._parse_resource(name, config)
+
+    def _parse_resource(self, name, config):
+        """Builds the interface resource from its config block
+
+        Args:
+            name (str): The interface identifier
+            config (Section): The interface config section to scan
+
+        Returns:
+            dict: The interface resource as returned by get
+        """
         resource = dict(name=name, type='generic')
         resource.update(self._parse_shutdown(config))
         resource.update(self._parse_description(config))
@@ -180,7 +214,7 @@ class BaseInterface(EntityCollection):
         """Scans the specified config block and returns the shutdown value
 
         Args:
-            config (str): The interface config block to scan
+            config (Section): The interface config section to scan
 
         Returns:
             dict: Returns a dict object with the shutdown value retrieved
@@ -194,7 +228,7 @@ class BaseInterface(EntityCollection):
         """Scans the specified config block and returns the description value
 
         Args:
-            config (str): The interface config block to scan
+            config (Section): The interface config section to scan
 
         Returns:
             dict: Returns a dict object with the description value retrieved
@@ -202,11 +236,7 @@ class BaseInterface(EntityCollection):
                 configured, None is returned as the value.  The returned dict
                 is intended to be merged into the interface resource dict.
         """
-        value = None
-        match = re.search(r'description (.+)$', config, re.M)
-        if match:
-            value = match.group(1)
-        return dict(description=value)
+        return dict(description=config.get('description') or None)
 
     def create(self, name):
         """Creates a new interface on the node
@@ -329,9 +359,15 @@ class BaseInterface(EntityCollection):
 
 class EthernetInterface(BaseInterface):
 
+    RECONCILE_ATTRIBUTES = dict(BaseInterface.RECONCILE_ATTRIBUTES,
+                                sflow='sflow enable',
+                                flowcontrol_send='flowcontrol send',
+                                flowcontrol_receive='flowcontrol receive')
+
     def __str__(self):
         return 'EthernetInterface'
 
+    @memoized
     def get(self, name):
         """Returns an interface as a set of key/value pairs
 
@@ -352,12 +388,15 @@ class EthernetInterface(BaseInterface):
                     "flowcontrol_receive": [on, off]
                 }
         """
-        config = self.get_block('^interface %s' % name)
+        config = self.get_section_model('interface', name)
 
         if not config:
             return None
 
-        resource = super(EthernetInterface, self).get(name)
+        return self._parse_resource(name, config)
+
+    def _parse_resource(self, name, config):
+        resource = super(EthernetInterface, self)._parse_resource(name, config)
         resource.update(dict(name=name, type='ethernet'))
         resource.update(self._parse_sflow(config))
         resource.update(self._parse_flowcontrol_send(config))
@@ -368,48 +407,42 @@ class EthernetInterface(BaseInterface):
         """Scans the specified config block and returns the sflow value
 
         Args:
-            config (str): The interface config block to scan
+            config (Section): The interface config section to scan
 
         Returns:
             dict: Returns a dict object with the sflow value retrieved
                 from the config block.  The returned dict object is intended
                 to be merged into the interface resource dict
         """
-        value = 'no sflow' not in config
+        value = config.get('no sflow') is None
         return dict(sflow=value)
 
     def _parse_flowcontrol_send(self, config):
         """Scans the config block and returns the flowcontrol send value
 
         Args:
-            config (str): The interface config block to scan
+            config (Section): The interface config section to scan
 
         Returns:
             dict: Returns a dict object with the flowcontrol send value
                 retrieved from the config block.  The returned dict object
                 is intended to be merged into the interface resource dict
         """
-        value = 'off'
-        match = re.search(r'flowcontrol send (\w+)$', config, re.M)
-        if match:
-            value = match.group(1)
+        value = config.get('flowcontrol send') or 'off'
         return dict(flowcontrol_send=value)
 
     def _parse_flowcontrol_receive(self, config):
         """Scans the config block and returns the flowcontrol receive value
 
         Args:
-            config (str): The interface config block to scan
+            config (Section): The interface config section to scan
 
         Returns:
             dict: Returns a dict object with the flowcontrol receive value
                 retrieved from the config block.  The returned dict object
                 is intended to be merged into the interface resource dict
         """
-        value = 'off'
-        match = re.search(r'flowcontrol receive (\w+)$', config, re.M)
-        if match:
-            value = match.group(1)
+        value = config.get('flowcontrol receive') or 'off'
         return dict(flowcontrol_receive=value)
 
     def create(self, name):
@@ -577,9 +610,15 @@ class EthernetInterface(BaseInterface):
 
 class PortchannelInterface(BaseInterface):
 
+    RECONCILE_ATTRIBUTES = dict(
+        BaseInterface.RECONCILE_ATTRIBUTES,
+        minimum_links='port-channel min-links',
+        lacp_timeout='port-channel lacp fallback timeout')
+
     def __str__(self):
         return 'PortchannelInterface'
 
+    @memoized
     def get(self, name):
         """Returns a Port-Channel interface as a set of key/value pairs
 
@@ -601,11 +640,15 @@ class PortchannelInterface(BaseInterface):
                 }
 
         """
-        config = self.get_block('^interface %s' % name)
+        config = self.get_section_model('interface', name)
         if not config:
             return None
 
-        response = super(PortchannelInterface, self).get(name)
+        return self._parse_resource(name, config)
+
+    def _parse_resource(self, name, config):
+        response = super(PortchannelInterface, self)._parse_resource(name,
+                                                                     config)
         response.update(dict(name=name, type='portchannel'))
 
         response['members'] = self.get_members(name)
@@ -616,25 +659,20 @@ class PortchannelInterface(BaseInterface):
         return response
 
     def _parse_minimum_links(self, config):
-        value = 0
-        match = re.search(r'port-channel min-links (\d+)', config)
-        if match:
-            value = int(match.group(1))
-        return dict(minimum_links=value)
+        value = config.get('port-channel min-links')
+        return dict(minimum_links=int(value) if value else 0)
 
     def _parse_lacp_fallback(self, config):
-        value = DEFAULT_LACP_FALLBACK
-        match = re.search(r'lacp fallback (static|individual)', config)
-        if match:
-            value = match.group(1)
+        value = config.get('port-channel lacp fallback')
+        if value not in ('static', 'individual'):
+            value = DEFAULT_LACP_FALLBACK
         return dict(lacp_fallback=value)
 
     def _parse_lacp_timeout(self, config):
-        value = DEFAULT_LACP_FALLBACK_TIMEOUT
-        match = re.search(r'lacp fallback timeout (\d+)', config)
-        if match:
-            value = int(match.group(1))
-        return dict(lacp_timeout=value)
+        value = config.get('port-channel lacp fallback timeout')
+        if not value:
+            return dict(lacp_timeout=DEFAULT_LACP_FALLBACK_TIMEOUT)
+        return dict(lacp_timeout=int(value))
 
     def get_lacp_mode(self, name):
         """Returns the LACP mode for the specified Port-Channel interface
@@ -652,10 +690,12 @@ class PortchannelInterface(BaseInterface):
         if not members:
             return DEFAULT_LACP_MODE
 
-        for member in self.get_members(name):
-            match = re.search(r'channel-group\s\d+\smode\s(?P<value>.+)',
-                              self.get_block('^interface %s' % member))
-            return match.group('value')
+        for member in members:
+            config = self.get_section_model('interface', member)
+            value = config.get('channel-group') if config else None
+            if value and ' mode ' in value:
+                return value.split(' mode ', 1)[1]
+            return None
 
     def get_members(self, name):
         """Returns the member interfaces for the specified Port-Channel
@@ -668,12 +708,46 @@ class PortchannelInterface(BaseInterface):
             A list of physical interface names that belong to the specified
                 interface
         """
+        members = self._get_all_members()
+        if members is not None:
+            return list(members.get(name, []))
+
         grpid = re.search(r'(\d+)', name).group()
         command = 'show port-channel %s all-ports' % grpid
         config = self.node.enable(command, 'text')
         return re.findall(r'\b(?!Peer)Ethernet[\d/]*\b',
                           config[0]['result']['output'])
 
+    def _get_all_members(self):
+        """Returns the member interfaces of all Port-Channels
+
+        The membership of every Port-Channel is retrieved with a single
+        json command and stored with the running-config, so it is only
+        requested again once the configuration changes.
+
+        Returns:
+            A dict of member interface lists keyed by Port-Channel name or
+                None if the node did not return json output
+        """
+        def build():
+            try:
+                response = self.node.enable('show port-channel all-ports')
+            except CommandError:
+                return None
+            result = response[0]['result']
+            if not isinstance(result, dict) or 'portChannels' not in result:
+                return None
+            members = dict()
+            for name, channel in result['portChannels'].items():
+                ports = list(channel.get('activePorts', {}))
+                ports.extend(channel.get('inactivePorts', {}))
+                members[name] = [port for port in ports
+                                 if port.startswith('Ethernet')]
+            return members
+
+        key = (type(self).__qualname__, '_get_all_members')
+        return self.node.memoize(key, build, pinned=True)
+
     def set_members(self, name, members, mode=None):
         """Configures the array of member interfaces for the Port-Channel
 
@@ -816,9 +890,15 @@ class VxlanInterface(BaseInterface):
     DEFAULT_SRC_INTF = ''
     DEFAULT_MCAST_GRP = ''
 
+    RECONCILE_ATTRIBUTES = dict(BaseInterface.RECONCILE_ATTRIBUTES,
+                                source_interface='vxlan source-interface',
+                                multicast_group='vxlan multicast-group',
+                                udp_port='vxlan udp-port')
+
     def __str__(self):
         return 'VxlanInterface'
 
+    @memoized
     def get(self, name):
         """Returns a Vxlan interface as a set of key/value pairs
 
@@ -843,11 +923,14 @@ class VxlanInterface(BaseInterface):
                 the interface configuration.  If the specified interface
                 does not exist, then None is returned
         """
-        config = self.get_block('^interface %s' % name)
+        config = self.get_section_model('interface', name)
         if not config:
             return None
 
-        response = super(VxlanInterface, self).get(name)
+        return self._parse_resource(name, config)
+
+    def _parse_resource(self, name, config):
+        response = super(VxlanInterface, self)._parse_resource(name, config)
         response.update(dict(name=name, type='vxlan'))
 
         response.update(self._parse_source_interface(config))
@@ -867,56 +950,61 @@ class VxlanInterface(BaseInterface):
         will return DEFAULT_SRC_INTF instead.
 
         Args:
-            config (str): The Vxlan config block to scan
+            config (Section): The Vxlan config section to scan
 
         Return:
             dict: A dict object intended to be merged into the resource dict
         """
-        match = re.search(r'vxlan source-interface ([^\s]+)', config)
-        value = match.group(1) if match else self.DEFAULT_SRC_INTF
-        return dict(source_interface=value)
+        value = config.get('vxlan source-interface')
+        if not value:
+            return dict(source_interface=self.DEFAULT_SRC_INTF)
+        return dict(source_interface=value.split(' ', 1)[0])
 
     def _parse_multicast_group(self, config):
-        match = re.search(r'vxlan multicast-group '
-                          r'([\d]{3}\.[\d]+\.[\d]+\.[\d]+)',
-                          config)
-        value = match.group(1) if match else self.DEFAULT_MCAST_GRP
+        value = self.DEFAULT_MCAST_GRP
+        for group in config.getall('vxlan multicast-group'):
+            if MCAST_GROUP_RE.match(group):
+                value = group
+                break
         return dict(multicast_group=value)
 
     def _parse_multicast_decap(self, config):
-        val1 = 'vxlan multicast-group decap' in config
-        val2 = 'no vxlan multicast-group decap' in config
-        return dict( multicast_decap=bool(val1 ^ val2) )
+        value = 'vxlan multicast-group decap' in config
+        return dict( multicast_decap=value )
 
     def _parse_udp_port(self, config):
-        match = re.search(r'vxlan udp-port (\d+)', config)
-        value = int(match.group(1))
+        value = int(config.get('vxlan udp-port'))
         return dict(udp_port=value)
 
     def _parse_vlans(self, config):
-        vlans = frozenset(re.findall(r'vxlan vlan (\d+)', config))
         values = dict()
-
-        for vid in vlans:
-            values[vid] = dict()
-
-            regexp = r'vxlan vlan {} vni (\d+)'.format(vid)
-            match = re.search(regexp, config)
-            values[vid]['vni'] = match.group(1) if match else None
-
-            regexp = r'vxlan vlan {} flood vtep (.*)$'.format(vid)
-            matches = re.search(regexp, config, re.M)
-            flood_list = matches.group(1).split(' ') if matches else []
-            values[vid]['flood_list'] = flood_list
-
+        for line in config.getall('vxlan vlan'):
+            ids, _, setting = line.partition(' ')
+            try:
+                vids = list(VlanSet(ids))
+            except ValueError:
+                continue
+            vnis = list()
+            if setting.startswith('vni '):
+                match = re.match(r'[\d,-]+', setting[4:])
+                vnis = expand_range(match.group(0)) if match else []
+            for offset, vid in enumerate(vids):
+                entry = values.setdefault(str(vid), dict())
+                if setting.startswith('vni ') and vnis:
+                    # a range of vlans maps to a range of vnis
+                    vni = vnis[offset] if len(vnis) == len(vids) else vnis[0]
+                    entry.setdefault('vni', vni)
+                elif setting.startswith('flood vtep '):
+                    entry.setdefault('flood_list', setting[11:].split(' '))
+
+        for entry in values.values():
+            entry.setdefault('vni', None)
+            entry.setdefault('flood_list', [])
         return dict(vlans=values)
 
     def _parse_flood_list(self, config):
-        match = re.search(r'^ *vxlan flood vtep +([\d. ]+)$', config, re.M)
-        values = list()
-        if match:
-            values = match.group(1).split(' ')
-        return dict(flood_list=values)
+        value = config.get('vxlan flood vtep')
+        return dict(flood_list=value.split() if value else [])
 
     def set_source_interface(self, name, value=None, default=False,
                              disable=False):
@@ -1089,6 +1177,38 @@ class VxlanInterface(BaseInterface):
             CliVariants(f'vxlan vlan remove {vid} vni $',
                 f'vxlan vlan remove {vid} vni') )
 
+    def set_vlans(self, name, vlans):
+        """Configures the vlan to vni mappings of the interface
+
+        The desired mappings are compared with the mappings configured in
+        the running-config and only the mappings that are added, changed
+        or removed are sent, in a single request.
+
+        Args:
+            name (str): The interface identifier
+            vlans (dict): The desired vni of each vlan id
+
+        Returns:
+            True if the commands complete successfully
+        """
+        desired = dict((int(vid), str(vni)) for vid, vni in vlans.items())
+        config = self.get(name)
+        current = config['vlans'] if config else dict()
+        current = dict((int(vid), value['vni'])
+                       for vid, value in current.items() if value['vni'])
+
+        removed = VlanSet(current) - VlanSet(desired)
+        commands = ['vxlan vlan add %s vni %s' % (vid, desired[vid])
+                    for vid in sorted(desired)
+                    if current.get(vid) != desired[vid]]
+        if removed:
+            commands.append(CliVariants(
+                ['vxlan vlan remove %s vni $' % vid for vid in removed],
+                ['vxlan vlan remove %s vni' % vid for vid in removed]))
+        if not commands:
+            return True
+        return self.configure_interface(name, commands)
+
 
 INTERFACE_CLASS_MAP = {
     'Et': EthernetInterface,
@@ -46,19 +46,18 @@ Parameters:
         RFC 8200 for more information.
 """
 
-import re
-
-from pyeapi.api import EntityCollection
+from pyeapi.api import EntityCollection, memoized
 from pyeapi.utils import _interpolate_docstr
 
 IP_MTU_MIN = 68
 IP_MTU_MAX = 65535
 
-SWITCHPORT_RE = re.compile(r'no switchport$', re.M)
-
 
 class Ipinterfaces( EntityCollection ):
 
+    RECONCILE_ATTRIBUTES = dict(address='ip address', mtu='mtu')
+
+    @memoized
     def get( self, name ):
         """Returns the specific IP interface properties
 
@@ -81,9 +80,11 @@ class Ipinterfaces( EntityCollection ):
                 the current configuration of the node.  If the specified
                 interface does not exist then None is returned.
         """
-        config = self.get_block( 'interface %s' % name )
+        config = self.get_section_model( 'interface', name )
+        if not config:
+            return None
         if name[ 0:2 ] in [
-                'Et', 'Po' ] and not SWITCHPORT_RE.search( config, re.M ):
+                'Et', 'Po' ] and 'no switchport' not in config:
             return None
 
         resource = dict( name=name )
@@ -99,12 +100,13 @@ class Ipinterfaces( EntityCollection ):
         value is not configured, then None is returned for the value
 
         Args:
-            config (str): The interface configuration block to parse
+            config (Section): The interface configuration section to parse
 
         Return:
             dict: A dict object intended to be merged into the resource dict
         """
-        match = re.findall( r'ip address ([^\s]+)', config, re.M )
+        match = [ value.split( ' ', 1 )[ 0 ]
+                  for value in config.getall( 'ip address' ) ]
         primary, secondary = ( match[0],
                 match[1:] ) if match else ( None, None )
         return dict( address=primary,
@@ -118,14 +120,15 @@ class Ipinterfaces( EntityCollection ):
         expected to always be present in the provided config block
 
         Args:
-            config (str): The interface configuration block to parse
+            config (Section): The interface configuration section to parse
 
         Return:
             dict: A dict object intended to be merged into the resource dict
         """
-        match = re.search(r'mtu (\d+)', config)
-        return dict( mtu=int(match.group( 1 )) if match else None )
+        value = config.get( 'mtu' )
+        return dict( mtu=int( value ) if value else None )
 
+    @memoized
     def getall(self):
         """ Returns all of the IP interfaces found in the running-config
 
@@ -139,15 +142,26 @@ class Ipinterfaces( EntityCollection ):
                     'Ethernet2': {...}
                 }
         """
-        interfaces_re = re.compile(r'^interface\s(.+)', re.M)
-
         response = dict()
-        for name in interfaces_re.findall(self.config):
+        for name in self.iterkeys():
             interface = self.get(name)
             if interface:
                 response[name] = interface
         return response
 
+    def iterkeys( self ):
+        for name, config in self.get_section_models( 'interface' ).items():
+            if name[ 0:2 ] in [
+                    'Et', 'Po' ] and 'no switchport' not in config:
+                continue
+            yield name
+
+    def _reconcile_parent(self, name):
+        return ['interface %s' % name]
+
+    def _reconcile_create(self, name):
+        return ['no switchport']
+
     def create(self, name):
         """ Creates a new IP interface instance
 
@@ -66,9 +66,8 @@ Interface Parameters:
 
 """
 
-import re
-
-from pyeapi.api import Entity
+from pyeapi.api import Entity, memoized
+from pyeapi.configmodel import Section
 
 
 class Mlag(Entity):
@@ -78,6 +77,7 @@ class Mlag(Entity):
     with the nodes MLAG configuraiton.
     """
 
+    @memoized
     def get(self):
         """Returns the Mlag configuration as a resource dict
 
@@ -97,7 +97,8 @@ class Mlag(Entity):
             dict: A dict object that is intended to be merged into the
                 resource dict
         """
-        config = self.get_block('mlag configuration')
+        config = self.get_section_model('mlag', 'configuration') or \
+            Section('mlag configuration', [])
         cfg = dict()
         cfg.update(self._parse_domain_id(config))
         cfg.update(self._parse_local_interface(config))
@@ -110,63 +111,57 @@ class Mlag(Entity):
         """Scans the config block and parses the domain-id value
 
         Args:
-            config (str): The config block to scan
+            config (Section): The mlag configuration section to scan
 
         Returns:
             dict: A dict object that is intended to be merged into the
                 resource dict
         """
-        match = re.search(r'domain-id (.+)$', config)
-        value = match.group(1) if match else None
-        return dict(domain_id=value)
+        return dict(domain_id=config.get('domain-id'))
 
     def _parse_local_interface(self, config):
         """Scans the config block and parses the local-interface value
 
         Args:
-            config (str): The config block to scan
+            config (Section): The mlag configuration section to scan
 
         Returns:
             dict: A dict object that is intended to be merged into the
                 resource dict
         """
-        match = re.search(r'local-interface (\w+)', config)
-        value = match.group(1) if match else None
-        return dict(local_interface=value)
+        value = config.get('local-interface')
+        return dict(local_interface=value.split(' ', 1)[0] if value else None)
 
     def _parse_peer_address(self, config):
         """Scans the config block and parses the peer-address value
 
         Args:
-            config (str): The config block to scan
+            config (Section): The mlag configuration section to scan
 
         Returns:
             dict: A dict object that is intended to be merged into the
                 resource dict
         """
-        match = re.search(r'peer-address (\d+\.\d+\.\d+\.\d+)$', config)
-        value = match.group(1) if match else None
-        return dict(peer_address=value)
+        return dict(peer_address=config.get('peer-address'))
 
     def _parse_peer_link(self, config):
         """Scans the config block and parses the peer-link value
 
         Args:
-            config (str): The config block to scan
+            config (Section): The mlag configuration section to scan
 
         Returns:
             dict: A dict object that is intended to be merged into the
                 resource dict
         """
-        match = re.search(r'peer-link (\S+)', config)
-        value = match.group(1) if match else None
-        return dict(peer_link=value)
+        value = config.get('peer-link')
+        return dict(peer_link=value.split(' ', 1)[0] if value else None)
 
     def _parse_shutdown(self, config):
         """Scans the config block and parses the shutdown value
 
         Args:
-            config (str): The config block to scan
+            config (Section): The mlag configuration section to scan
 
         Returns:
             dict: A dict object that is intended to be merged into the
@@ -183,12 +178,10 @@ class Mlag(Entity):
                 resource dict.
         """
         interfaces = dict()
-        names = re.findall(r'^interface (Po.+)$', self.config, re.M)
-        for name in names:
-            config = self.get_block('interface %s' % name)
-            match = re.search(r'mlag (\d+)', config)
-            if match:
-                interfaces[name] = dict(mlag_id=match.group(1))
+        for name, config in self.get_section_models('interface').items():
+            value = config.get('mlag')
+            if name.startswith('Po') and value and value.isdigit():
+                interfaces[name] = dict(mlag_id=value)
         return dict(interfaces=interfaces)
 
     def _configure_mlag(self, string, value, default, disable):
@@ -40,7 +40,7 @@ Arguments:
 
 import re
 
-from pyeapi.api import Entity
+from pyeapi.api import Entity, memoized
 
 
 class Ntp(Entity):
@@ -50,6 +50,7 @@ class Ntp(Entity):
     def __init__(self, *args, **kwargs):
         super(Ntp, self).__init__(*args, **kwargs)
 
+    @memoized
     def get(self):
         """Returns the current NTP configuration
 
@@ -37,7 +37,7 @@ OSPF configurations
 """
 
 import re
-from pyeapi.api import Entity
+from pyeapi.api import Entity, memoized
 from pyeapi.utils import make_iterable
 
 class Ospf(Entity):
@@ -48,6 +48,7 @@ class Ospf(Entity):
         super(Ospf, self).__init__(*args, **kwargs)
         pass
 
+    @memoized
     def get(self, vrf=None):
         """Returns the OSPF routing configuration
 
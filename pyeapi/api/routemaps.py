@@ -44,7 +44,10 @@ Notes:
 
 import re
 
-from pyeapi.api import EntityCollection
+from pyeapi.api import EntityCollection, memoized
+from pyeapi.utils import split_sections
+
+ROUTEMAP_RE = re.compile(r'^route-map\s([\w-]+)\s(\w+)\s(\d+)$')
 
 
 class Routemaps(EntityCollection):
@@ -54,6 +57,7 @@ class Routemaps(EntityCollection):
     with the nodes routemaps configuraiton.
     """
 
+    @memoized
     def get(self, name):
         """Provides a method to retrieve all routemap configuration
         related to the name attribute.
@@ -98,15 +102,54 @@ class Routemaps(EntityCollection):
 
         return self._parse_entries(name)
 
+    @memoized
     def getall(self):
         resources = dict()
-        routemaps_re = re.compile(r'^route-map\s([\w-]+)\s\w+\s\d+$', re.M)
-        for name in routemaps_re.findall(self.config):
-            routemap = self.get(name)
-            if routemap:
-                resources[name] = routemap
+        if self.node.config_format == 'json':
+            for name in self.iterkeys():
+                routemap = self.get(name)
+                if routemap:
+                    resources[name] = routemap
+            return resources
+
+        # walk the route-map sections once instead of scanning the config
+        # for every name and looking up the block of every entry
+        blocks = split_sections(self.config, ROUTEMAP_RE.pattern)
+        for key, config in blocks.items():
+            name, action, seqno = ROUTEMAP_RE.match(key).groups()
+            entries = resources.setdefault(name, dict())
+            entries.setdefault(action, dict())[int(seqno)] = \
+                self._parse_entry(config)
         return resources
 
+    def iterkeys(self):
+        for match in self.get_section_keys(ROUTEMAP_RE.pattern):
+            yield match.group(1)
+
+    def iter_all(self):
+        """Yields the route-maps one name at a time
+
+        The route-map sections are read in a single pass and a route-map
+        is yielded once the section of the next route-map is found.  EOS
+        lists the entries of a route-map together so each route-map is
+        yielded once.  See EntityCollection.iter_all.
+
+        Returns:
+            An iterator of (name, routemap) tuples where routemap has the
+                form of the value returned by get
+        """
+        name = routemap = None
+        for key, config in self.get_sections(ROUTEMAP_RE.pattern):
+            entry, action, seqno = ROUTEMAP_RE.match(key).groups()
+            if entry != name:
+                if routemap:
+                    yield name, routemap
+                name, routemap = entry, dict()
+            routemap.setdefault(action, dict())[int(seqno)] = \
+                self._parse_entry(config)
+        if routemap:
+            yield name, routemap
+
     def _parse_entries(self, name):
 
         routemap_re = re.compile(r'^route-map\s%s\s(\w+)\s(\d+)$'
@@ -115,18 +158,42 @@ class Routemaps(EntityCollection):
         for entry in routemap_re.findall(self.config):
             resource = dict()
             action, seqno = entry
-            routemap = self.get_block(r'route-map\s%s\s%s\s%s'
+            routemap = self.get_block('route-map %s %s %s'
                                       % (name, action, seqno))
 
-            resource = dict(name=name, action=action, seqno=seqno, attr=dict())
-            resource['attr'].update(self._parse_match_statements(routemap))
-            resource['attr'].update(self._parse_set_statements(routemap))
-            resource['attr'].update(self._parse_continue_statement(routemap))
-            resource['attr'].update(self._parse_description(routemap))
+            resource = dict(name=name, action=action, seqno=seqno,
+                            attr=self._parse_entry(routemap))
             entries.append(resource)
 
         return self._merge_entries(entries)
 
+    def _parse_entry(self, config):
+        """Parses the attributes of a route-map entry in a single pass
+
+        Args:
+            config (str): The block of the route-map entry
+
+        Returns:
+            dict: The match, set, continue and description attributes
+        """
+        attr = dict(match=list(), set=list())
+        attr['continue'] = None
+        attr['description'] = None
+        for line in config.split('\n')[1:]:
+            words = line.split(None, 1)
+            if len(words) < 2 or not line[:1].isspace():
+                continue
+            keyword = words[0]
+            if keyword == 'match' or keyword == 'set':
+                attr[keyword].append(line.lstrip()[len(keyword) + 1:])
+            elif keyword == 'continue':
+                if attr['continue'] is None and words[1].isdigit():
+                    attr['continue'] = int(words[1])
+            elif keyword == 'description':
+                if attr['description'] is None:
+                    attr['description'] = line.lstrip()[len(keyword) + 1:]
+        return attr
+
     def _merge_entries(self, entries):
         response = dict()
         for e in entries:
@@ -138,26 +205,6 @@ class Routemaps(EntityCollection):
 
         return response
 
-    def _parse_match_statements(self, config):
-        match_re = re.compile(r'^\s+match\s(.+)$', re.M)
-        return dict(match=match_re.findall(config))
-
-    def _parse_set_statements(self, config):
-        set_re = re.compile(r'^\s+set\s(.+)$', re.M)
-        return dict(set=set_re.findall(config))
-
-    def _parse_continue_statement(self, config):
-        continue_re = re.compile(r'^\s+continue\s(\d+)$', re.M)
-        match = continue_re.search(config)
-        value = int(match.group(1)) if match else None
-        return {'continue': value}
-
-    def _parse_description(self, config):
-        desc_re = re.compile(r'^\s+description\s(.+)$', re.M)
-        match = desc_re.search(config)
-        value = match.group(1) if match else None
-        return dict(description=value)
-
     def create(self, name, action, seqno):
         """Creates a new routemap on the node
 
@@ -51,11 +51,19 @@ Notes:
     The 'default' prefix function of the 'ip route' command,
     'default ip route ...', currently equivalent to the 'no ip route ...'
     command.
+
+    The static routes are indexed by destination prefix once per
+    running-config (see RouteIndex), which allows the longest_match and
+    within queries to be answered without scanning the configuration.
 """
 
 import re
 
-from pyeapi.api import EntityCollection
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from ipaddress import IPv4Network
+
+from pyeapi.api import EntityCollection, memoized
 
 # Define the regex to match ip route lines (by lines in regex):
 #   'ip route' header
@@ -73,6 +81,114 @@ ROUTES_RE = re.compile(r'(?<=^ip route)'
                        r'(?: tag (\d+))?'
                        r'(?: name (\S+))?', re.M)
 
+# The default maximum number of commands sent per request by converge
+CHUNK_SIZE = 1000
+
+
+def parse_prefix(value):
+    """Parses an IPv4 address or prefix in the form of A.B.C.D[/E]
+
+    Args:
+        value (string): The address or prefix to parse
+
+    Returns:
+        An IPv4Network object.  Host bits are allowed and are masked off.
+
+    Raises:
+        ValueError: If value is not an IPv4 address or prefix
+    """
+    try:
+        return IPv4Network(str(value), strict=False)
+    except ValueError:
+        raise ValueError('invalid ip prefix %r' % value)
+
+
+class RouteIndex(object):
+    """An index of the static routes keyed by destination prefix
+
+    Attributes:
+        routes (dict): The static routes in the form returned by
+            StaticRoute.getall
+
+    Args:
+        routes (dict): The static routes in the form returned by
+            StaticRoute.getall
+    """
+
+    def __init__(self, routes):
+        self.routes = routes
+        self._by_length = dict()
+        entries = list()
+        for ip_dest in routes:
+            network = parse_prefix(ip_dest)
+            address = int(network.network_address)
+            self._by_length.setdefault(network.prefixlen,
+                                       dict())[address] = ip_dest
+            entries.append((address, network.prefixlen, ip_dest))
+        entries.sort()
+        self._entries = entries
+        self._addresses = [entry[0] for entry in entries]
+        self._lengths = sorted(self._by_length, reverse=True)
+
+    def __len__(self):
+        return len(self.routes)
+
+    def __contains__(self, ip_dest):
+        return ip_dest in self.routes
+
+    def get(self, ip_dest):
+        """Returns the routes for a destination or None"""
+        return self.routes.get(ip_dest)
+
+    def covering(self, prefix):
+        """Returns the destinations that contain an address or prefix
+
+        Args:
+            prefix (string): An address or prefix in the form A.B.C.D[/E]
+
+        Returns:
+            A list of destination prefixes, longest prefix first
+        """
+        network = parse_prefix(prefix)
+        address = int(network.network_address)
+        result = list()
+        for length in self._lengths:
+            if length > network.prefixlen:
+                continue
+            mask = (0xffffffff << (32 - length)) & 0xffffffff
+            ip_dest = self._by_length[length].get(address & mask)
+            if ip_dest is not None:
+                result.append(ip_dest)
+        return result
+
+    def longest_match(self, prefix):
+        """Returns the longest destination prefix that contains prefix
+
+        Args:
+            prefix (string): An address or prefix in the form A.B.C.D[/E]
+
+        Returns:
+            The destination prefix or None if no route contains prefix
+        """
+        for ip_dest in self.covering(prefix):
+            return ip_dest
+        return None
+
+    def within(self, prefix):
+        """Returns the destinations that fall inside a prefix
+
+        Args:
+            prefix (string): A prefix in the form A.B.C.D/E
+
+        Returns:
+            A list of destination prefixes ordered by address
+        """
+        network = parse_prefix(prefix)
+        start = bisect_left(self._addresses, int(network.network_address))
+        end = bisect_right(self._addresses, int(network.broadcast_address))
+        return [ip_dest for _, length, ip_dest in self._entries[start:end]
+                if length >= network.prefixlen]
+
 
 class StaticRoute(EntityCollection):
     """The StaticRoute class provides a configuration instance
@@ -83,6 +199,7 @@ class StaticRoute(EntityCollection):
     def __str__(self):
         return 'StaticRoute'
 
+    @memoized
     def get(self, name):
         """Retrieves the ip route information for the destination
         ip address specified.
@@ -118,8 +235,9 @@ class StaticRoute(EntityCollection):
 
         # Return the route configurations for the specified ip address,
         # or None if its not found
-        return self.getall().get(name)
+        return self.index().get(name)
 
+    @memoized
     def getall(self):
         """Return all ip routes configured on the switch as a resource dict
 
@@ -148,36 +266,204 @@ class StaticRoute(EntityCollection):
             a next_hop_ip, then that key value will be set as 'None'.
         """
 
-        # Find all the ip routes in the config
-        matches = ROUTES_RE.findall(self.config)
+        return self.index().routes
+
+    def iterkeys(self):
+        for match in self.get_section_keys(ROUTES_RE.pattern):
+            yield match.group(1)
+
+    def index(self):
+        """Returns the index of the static routes in the running-config
+
+        The index is built once per running-config and shared by get,
+        getall, longest_match and within.  The returned object must not be
+        modified.
+
+        Returns:
+            A RouteIndex object
+        """
+        def build():
+            # Parse the ip routes of the config and add them to the
+            # routes dict
+            routes = dict()
+            for match in self.get_section_keys(ROUTES_RE.pattern):
+                self._add_route(routes, match.groups(''))
+
+            return RouteIndex(routes)
+
+        key = (type(self).__qualname__, 'index')
+        return self.node.memoize(key, build, pinned=True)
+
+    @memoized
+    def longest_match(self, prefix):
+        """Returns the static routes of the longest matching destination
+
+        Args:
+            prefix (string): An ip address or prefix in the form of
+                A.B.C.D[/E]
+
+        Returns:
+            dict: The routes of the longest destination prefix that
+                contains prefix, keyed by the destination, in the form
+                returned by getall, or None if no static route matches
+        """
+        index = self.index()
+        ip_dest = index.longest_match(prefix)
+        if ip_dest is None:
+            return None
+        return {ip_dest: index.get(ip_dest)}
 
-        # Parse the routes and add them to the routes dict
+    @memoized
+    def within(self, prefix):
+        """Returns the static routes that fall inside a prefix
+
+        Args:
+            prefix (string): The prefix in the form of A.B.C.D/E, for
+                instance '10.0.0.0/8'
+
+        Returns:
+            dict: The static routes whose destination is contained in
+                prefix in the form returned by getall
+        """
+        index = self.index()
+        return dict((ip_dest, index.get(ip_dest))
+                    for ip_dest in index.within(prefix))
+
+    def iter_all(self):
+        """Yields the static routes one destination at a time
+
+        The route lines of each destination are counted first, then the
+        routes are read from the running-config in order and a destination
+        is yielded as soon as its last route line is read.  Each
+        destination is yielded once with all of its routes, whatever the
+        order of the route lines, and only the destinations whose lines are
+        interleaved are held in memory.  See EntityCollection.iter_all.
+
+        Returns:
+            An iterator of (ip_dest, routes) tuples where routes has the
+                form of the values returned by getall
+        """
+        remaining = Counter(self.iterkeys())
         routes = dict()
-        for match in matches:
-
-            # Get the four identifying components
-            ip_dest = match[0]
-            next_hop = match[1]
-            next_hop_ip = None if match[2] == '' else match[2]
-            distance = int(match[3])
-
-            # Create the data dict with the remaining components
-            data = {}
-            data['tag'] = None if match[4] == '' else int(match[4])
-            data['route_name'] = None if match[5] == '' else match[5]
-
-            # Build the complete dict entry from the four components
-            # and the data.
-            # temp_dict = parent_dict[key] = parent_dict.get(key, {})
-            # This creates the keyed dict in the parent_dict if it doesn't
-            # exist, or reuses the existing keyed dict.
-            # The temp_dict is used to make things more readable.
-            ip_dict = routes[ip_dest] = routes.get(ip_dest, {})
-            nh_dict = ip_dict[next_hop] = ip_dict.get(next_hop, {})
-            nhip_dict = nh_dict[next_hop_ip] = nh_dict.get(next_hop_ip, {})
-            nhip_dict[distance] = data
-
-        return routes
+        for match in self.get_section_keys(ROUTES_RE.pattern):
+            ip_dest = match.group(1)
+            self._add_route(routes, match.groups(''))
+            remaining[ip_dest] -= 1
+            if remaining[ip_dest] <= 0:
+                yield ip_dest, routes.pop(ip_dest)
+
+    def _add_route(self, routes, match):
+        # Get the four identifying components
+        ip_dest = match[0]
+        next_hop = match[1]
+        next_hop_ip = None if match[2] == '' else match[2]
+        distance = int(match[3])
+
+        # Create the data dict with the remaining components
+        data = {}
+        data['tag'] = None if match[4] == '' else int(match[4])
+        data['route_name'] = None if match[5] == '' else match[5]
+
+        # Build the complete dict entry from the four components
+        # and the data.
+        # temp_dict = parent_dict[key] = parent_dict.get(key, {})
+        # This creates the keyed dict in the parent_dict if it doesn't
+        # exist, or reuses the existing keyed dict.
+        # The temp_dict is used to make things more readable.
+        ip_dict = routes[ip_dest] = routes.get(ip_dest, {})
+        nh_dict = ip_dict[next_hop] = ip_dict.get(next_hop, {})
+        nhip_dict = nh_dict[next_hop_ip] = nh_dict.get(next_hop_ip, {})
+        nhip_dict[distance] = data
+
+    def converge(self, routes, replace=True, chunk_size=CHUNK_SIZE):
+        """Configures the node with a desired set of static routes
+
+        The desired routes are compared with the indexed routes of the
+        running-config and only the lines needed to add, modify or remove
+        routes are sent.  The lines are sent in requests of at most
+        chunk_size commands.  A route is identified by its ip_dest,
+        next_hop, next_hop_ip and distance, a route with the same identity
+        but a different tag or route_name is modified in place.
+
+        Note:
+            When called while a Node.transaction is open, the lines join
+            that transaction and are sent when it commits, chunk_size is
+            not applied.  The routes that change then have the status
+            'pending' and the outcome is reported by the results of that
+            transaction.
+
+        Args:
+            routes (dict): The desired static routes in the form returned
+                by getall
+            replace (bool): If True, configured routes that are not in
+                routes are removed.  The default value is True
+            chunk_size (int): The maximum number of commands sent per
+                request.  The default value is CHUNK_SIZE
+
+        Returns:
+            dict: The status of every route keyed by the tuple (ip_dest,
+                next_hop, next_hop_ip, distance).  The status is one of
+                'added', 'modified', 'removed', 'unchanged', 'failed' or
+                'pending'
+
+        Raises:
+            ValueError: If a destination is not an ip prefix
+        """
+        desired = self._flatten(routes)
+        for ip_dest, _, _, _ in desired:
+            parse_prefix(ip_dest)
+        current = self._flatten(self.index().routes)
+
+        status = dict()
+        changes = list()
+        if replace:
+            for route in current:
+                if route not in desired:
+                    command = self._build_commands(
+                        route[0], route[1], next_hop_ip=route[2],
+                        distance=route[3])
+                    changes.append((route, 'removed', 'no ' + command))
+        for route, data in desired.items():
+            if route not in current:
+                state = 'added'
+            elif current[route] != data:
+                state = 'modified'
+            else:
+                status[route] = 'unchanged'
+                continue
+            command = self._build_commands(
+                route[0], route[1], next_hop_ip=route[2], distance=route[3],
+                tag=data[0] or None, route_name=data[1])
+            changes.append((route, state, command))
+
+        for start in range(0, len(changes), chunk_size):
+            chunk = changes[start:start + chunk_size]
+            with self.node.transaction() as txn:
+                for _, _, command in chunk:
+                    txn.add(command)
+            if not txn.committed:
+                # the lines joined an open transaction
+                for route, _, _ in chunk:
+                    status[route] = 'pending'
+                continue
+            for (route, state, _), result in zip(chunk, txn.results):
+                status[route] = state if result else 'failed'
+        return status
+
+    @staticmethod
+    def _flatten(routes):
+        flat = dict()
+        for ip_dest, next_hops in routes.items():
+            for next_hop, next_hop_ips in next_hops.items():
+                for next_hop_ip, distances in next_hop_ips.items():
+                    for distance, data in distances.items():
+                        data = data or {}
+                        # EOS shows the default tag as tag 0
+                        tag = data.get('tag') or 0
+                        route = (ip_dest, next_hop, next_hop_ip,
+                                 int(distance))
+                        flat[route] = (tag, data.get('route_name'))
+        return flat
 
     def create(self, ip_dest, next_hop, **kwargs):
         """Create a static route
@@ -215,7 +501,8 @@ class StaticRoute(EntityCollection):
             **kwargs['route_name'] (string): Route name
 
         Returns:
-            True if the operation succeeds, otherwise False.
+            True if the operation succeeds, otherwise False.  A route that
+            is not configured is not sent to the node.
         """
 
         # Call _set_route with the delete flag set to True
@@ -237,7 +524,8 @@ class StaticRoute(EntityCollection):
             **kwargs['route_name'] (string): Route name
 
         Returns:
-            True if the operation succeeds, otherwise False.
+            True if the operation succeeds, otherwise False.  A route that
+            is not configured is not sent to the node.
         """
 
         # Call _set_route with the default flag set to True
@@ -332,6 +620,24 @@ class StaticRoute(EntityCollection):
 
         return commands
 
+    def _route_exists(self, ip_dest, next_hop, next_hop_ip=None,
+                      distance=None):
+        """Checks the route index for a configured route
+
+        A next_hop_ip or distance of None matches any value.
+
+        Returns:
+            True if a matching route is configured, otherwise False
+        """
+        next_hops = (self.index().get(ip_dest) or {}).get(next_hop) or {}
+        for hop_ip, distances in next_hops.items():
+            if next_hop_ip is not None and hop_ip != next_hop_ip:
+                continue
+            if distance is None or \
+                    str(distance) in [str(value) for value in distances]:
+                return True
+        return False
+
     def _set_route(self, ip_dest, next_hop, **kwargs):
         """Configure a static route
 
@@ -351,13 +657,26 @@ class StaticRoute(EntityCollection):
                 route instead of creating or setting values for the route
 
         Returns:
-            True if the operation succeeds, otherwise False.
+            True if the operation succeeds, otherwise False.  False is
+                returned without sending a request if ip_dest is not an ip
+                prefix.  Deleting or defaulting a route that is not
+                configured succeeds without sending a request.
         """
 
-        commands = self._build_commands(ip_dest, next_hop, **kwargs)
+        try:
+            parse_prefix(ip_dest)
+        except ValueError:
+            return False
 
         delete = kwargs.get('delete', False)
         default = kwargs.get('default', False)
+        if (delete or default) and \
+                not self._route_exists(ip_dest, next_hop,
+                                       kwargs.get('next_hop_ip'),
+                                       kwargs.get('distance')):
+            return True
+
+        commands = self._build_commands(ip_dest, next_hop, **kwargs)
 
         # Prefix with 'no' if delete is set
         if delete:
@@ -53,9 +53,7 @@ Interface Parameters:
         interface or False if it is disabled
 """
 
-import re
-
-from pyeapi.api import Entity, EntityCollection
+from pyeapi.api import Entity, EntityCollection, memoized
 
 
 class Stp(Entity):
@@ -178,6 +176,7 @@ class StpInterfaces(EntityCollection):
     cannot be created or deleted.
     """
 
+    @memoized
     def get(self, name):
         """Returns the specified interfaces STP configuration resource
 
@@ -203,7 +202,9 @@ class StpInterfaces(EntityCollection):
         if not isvalidinterface(name):
             return None
 
-        config = self.get_block(r'^interface\s%s$' % name)
+        config = self.get_section_model('interface', name)
+        if config is None:
+            return None
         resp = dict()
         resp.update(self._parse_bpduguard(config))
         resp.update(self._parse_portfast(config))
@@ -215,18 +216,19 @@ class StpInterfaces(EntityCollection):
         return dict(bpduguard=value)
 
     def _parse_portfast(self, config):
-        value = 'no spanning-tree portfast' not in config
+        value = config.get('no spanning-tree portfast') is None
         return dict(portfast=value)
 
     def _parse_portfast_type(self, config):
         if 'spanning-tree portfast network' in config:
             value = 'network'
-        elif 'no spanning-tree portfast' in config:
+        elif config.get('no spanning-tree portfast') is not None:
             value = 'normal'
         else:
             value = 'edge'
         return dict(portfast_type=value)
 
+    @memoized
     def getall(self):
         """Returns the collection of STP interfaces
 
@@ -237,16 +239,18 @@ class StpInterfaces(EntityCollection):
             A Python dictionary object that represents all configured
                 spanning-tree interfaces indexed by interface name.
         """
-        interfaces_re = re.compile(r'(?<=^interface\s)(.+)$', re.M)
-
         response = dict()
-        for name in interfaces_re.findall(self.config):
-            if name[0:2] in ['Et', 'Po']:
-                interface = self.get(name)
-                if interface:
-                    response[name] = interface
+        for name in self.iterkeys():
+            interface = self.get(name)
+            if interface:
+                response[name] = interface
         return response
 
+    def iterkeys(self):
+        for name in self.get_section_models('interface'):
+            if name[0:2] in ['Et', 'Po']:
+                yield name
+
     def configure_interface(self, name, cmds):
         if not isvalidinterface(name):
             raise ValueError('invalid interface value specified')
@@ -37,10 +37,8 @@ physical Ethernet and bundled Port-Channel interfaces.
 
 """
 
-import re
-
-from pyeapi.api import EntityCollection
-from pyeapi.utils import make_iterable
+from pyeapi.api import EntityCollection, memoized
+from pyeapi.utils import make_iterable, VlanSet
 
 
 class Switchports(EntityCollection):
@@ -54,6 +52,14 @@ class Switchports(EntityCollection):
 
     """
 
+    RECONCILE_ATTRIBUTES = dict(
+        mode='switchport mode',
+        access_vlan='switchport access vlan',
+        trunk_native_vlan='switchport trunk native vlan',
+        trunk_allowed_vlans=('switchport trunk allowed vlan', VlanSet),
+        trunk_groups='switchport trunk group')
+
+    @memoized
     def get(self, name):
         """Returns a dictionary object that represents a switchport
 
@@ -76,8 +82,8 @@ class Switchports(EntityCollection):
                 the specified argument is not a switchport then None
                 is returned
         """
-        config = self.get_block('interface %s' % name)
-        if 'no switchport\n' in config:
+        config = self.get_section_model('interface', name)
+        if not config or 'no switchport' in config:
             return
 
         resource = dict(name=name)
@@ -92,70 +98,68 @@ class Switchports(EntityCollection):
         """Scans the specified config and parses the switchport mode value
 
         Args:
-            config (str): The interface configuration block to scan
+            config (Section): The interface configuration section
 
         Returns:
             dict: A Python dict object with the value of switchport mode.
                 The dict returned is intended to be merged into the resource
                 dict
         """
-        value = re.search(r'switchport mode (\w+)', config, re.M)
-        return dict(mode=value.group(1))
+        return dict(mode=config.get('switchport mode'))
 
     def _parse_trunk_groups(self, config):
         """Scans the specified config and parses the trunk group values
 
         Args:
-            config (str): The interface configuraiton blcok
+            config (Section): The interface configuration section
 
         Returns:
             A dict object with the trunk group values that can be merged
                 into the resource dict
         """
-        values = re.findall(r'switchport trunk group ([^\s]+)', config, re.M)
-        return dict(trunk_groups=values)
+        return dict(trunk_groups=config.getall('switchport trunk group'))
 
     def _parse_access_vlan(self, config):
         """Scans the specified config and parse the access-vlan value
         Args:
-            config (str): The interface configuration block to scan
+            config (Section): The interface configuration section
 
         Returns:
             dict: A Python dict object with the value of switchport access
                 value.  The dict returned is intended to be merged into the
                 resource dict
         """
-        value = re.search(r'switchport access vlan (\d+)', config)
-        return dict(access_vlan=value.group(1) if value else None)
+        return dict(access_vlan=config.get('switchport access vlan'))
 
     def _parse_trunk_native_vlan(self, config):
         """Scans the specified config and parse the trunk native vlan value
 
         Args:
-            config (str): The interface configuration block to scan
+            config (Section): The interface configuration section
 
         Returns:
             dict: A Python dict object with the value of switchport trunk
                 native vlan value.  The dict returned is intended to be
                 merged into the resource dict
         """
-        match = re.search(r'switchport trunk native vlan (\d+)', config)
-        return dict(trunk_native_vlan=match.group(1))
+        value = config.get('switchport trunk native vlan')
+        return dict(trunk_native_vlan=value)
 
     def _parse_trunk_allowed_vlans(self, config):
         """Scans the specified config and parse the trunk allowed vlans value
 
         Args:
-            config (str): The interface configuration block to scan
+            config (Section): The interface configuration section
 
         Returns:
             dict: A Python dict object with the value of switchport trunk
                 allowed vlans value.  The dict returned is intended to be
                 merged into the resource dict
         """
-        match = re.search(r'switchport trunk allowed vlan (.+)$', config, re.M)
-        return dict(trunk_allowed_vlans=match.group(1))
+        value = config.get('switchport trunk allowed vlan')
+        return dict(trunk_allowed_vlans=value)
 
+    @memoized
     def getall(self):
         """Returns a dict object to all Switchports
 
@@ -166,15 +170,25 @@ class Switchports(EntityCollection):
             A Python dictionary object that represents all configured
                 switchports in the current running configuration
         """
-        interfaces_re = re.compile(r'(?<=^interface\s)([Et|Po][^.\s]+)$', re.M)
-
         response = dict()
-        for name in interfaces_re.findall(self.config):
+        for name in self.iterkeys():
             interface = self.get(name)
             if interface:
                 response[name] = interface
         return response
 
+    def iterkeys(self):
+        for name, config in self.get_section_models('interface').items():
+            if name[0:2] in ['Et', 'Po'] and '.' not in name and \
+                    'no switchport' not in config:
+                yield name
+
+    def _reconcile_parent(self, name):
+        return ['interface %s' % name]
+
+    def _reconcile_create(self, name):
+        return ['no ip address', 'switchport']
+
     def create(self, name):
         """Creates a new logical layer 2 interface
 
@@ -341,6 +355,44 @@ class Switchports(EntityCollection):
                                        disable=disable)
         return self.configure_interface(name, command)
 
+    def update_trunk_allowed_vlans(self, name, value):
+        """Configures the trunk allowed vlans with add and remove commands
+
+        The desired VLANs are compared with the trunk allowed vlans of the
+        running-config and only the VLANs that differ are added or removed.
+        The allowed vlans are replaced if the interface has no trunk
+        allowed vlan configuration.
+
+        Args:
+            name (string): The interface identifier.  The name must be the
+                full interface name (eg Ethernet1, not Et1)
+            value (str, VlanSet, iterable): The desired trunk allowed vlans
+                in the EOS range syntax, as a VlanSet or as VLAN IDs
+
+        Returns:
+            True if the operation succeeds otherwise False
+        """
+        desired = VlanSet(value)
+        string = 'switchport trunk allowed vlan'
+        replace = '%s %s' % (string, desired or 'none')
+
+        config = self.get_section_model('interface', name)
+        if not config or not config.get(string):
+            return self.configure_interface(name, replace)
+
+        allowed = self._parse_trunk_allowed_vlans(config)
+        current = VlanSet(allowed['trunk_allowed_vlans'])
+        if current == desired:
+            return True
+        commands = list()
+        if current - desired:
+            commands.append('%s remove %s' % (string, current - desired))
+        if desired - current:
+            commands.append('%s add %s' % (string, desired - current))
+        if not desired:
+            commands = [replace]
+        return self.configure_interface(name, commands)
+
     def set_trunk_groups(self, intf, value=None, default=False, disable=False):
         """Configures the switchport trunk group value
 
@@ -44,7 +44,7 @@ System Attributes:
 
 import re
 
-from pyeapi.api import Entity
+from pyeapi.api import Entity, memoized
 
 
 class System(Entity):
@@ -54,6 +54,7 @@ class System(Entity):
     and provide node level configuration such as hostname
     """
 
+    @memoized
     def get(self):
         """Returns the system configuration abstraction
 
@@ -52,7 +52,7 @@ Parameters:
 
 import re
 
-from pyeapi.api import EntityCollection
+from pyeapi.api import EntityCollection, memoized
 
 DEFAULT_ENCRYPTION = 'cleartext'
 ENCRYPTION_MAP = {'cleartext': 0, 'md5': 5, 'sha512': 'sha512', 'nologin': '*'}
@@ -82,6 +82,7 @@ class Users(EntityCollection):
     following configuration line that might contain the users sshkey.
     """
 
+    @memoized
     def get(self, name):
         """Returns the local user configuration as a resource dict
 
@@ -96,6 +97,7 @@ class Users(EntityCollection):
         """
         return self.getall().get(name)
 
+    @memoized
     def getall(self):
         """Returns all local users configuration as a resource dict
 
@@ -125,6 +127,10 @@ class Users(EntityCollection):
             resources.update(self._parse_username(user))
         return resources
 
+    def iterkeys(self):
+        for match in self.get_section_keys(r'^username (\S+) privilege '):
+            yield match.group(1)
+
     def _parse_username(self, config):
         """Scans the config block and returns the username as a dict
 
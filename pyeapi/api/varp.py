@@ -47,7 +47,9 @@ Arguments:
 
 import re
 
-from pyeapi.api import EntityCollection
+from pyeapi.api import EntityCollection, memoized
+
+VLAN_INTERFACE_RE = re.compile(r'Vlan\d+$')
 
 
 class Varp(EntityCollection):
@@ -63,6 +65,7 @@ class Varp(EntityCollection):
         self._interfaces = VarpInterfaces(self.node)
         return self._interfaces
 
+    @memoized
     def get(self):
         """Returns the current VARP configuration
 
@@ -93,10 +96,12 @@ class Varp(EntityCollection):
         return resource
 
     def _parse_mac_address(self):
-        mac_address_re = re.compile(r'^ip\svirtual-router\smac-address\s'
-                                    r'((?:[a-f0-9]{2}:){5}[a-f0-9]{2})$', re.M)
-        mac = mac_address_re.search(self.config)
-        mac = mac.group(1) if mac else None
+        mac = None
+        for match in self.get_section_keys(
+                r'^ip\svirtual-router\smac-address\s'
+                r'((?:[a-f0-9]{2}:){5}[a-f0-9]{2})$'):
+            mac = match.group(1)
+            break
         return dict(mac_address=mac)
 
     def _parse_interfaces(self):
@@ -145,9 +150,9 @@ class VarpInterfaces(EntityCollection):
     """The VarpInterfaces class helps manage interfaces with
     virtual-router configuration.
     """
+    @memoized
     def get(self, name):
-        interface_re = r'interface\s%s' % name
-        config = self.get_block(interface_re)
+        config = self.get_section_model('interface', name)
 
         if not config:
             return None
@@ -156,15 +161,20 @@ class VarpInterfaces(EntityCollection):
         resource.update(self._parse_virtual_addresses(config))
         return resource
 
+    @memoized
     def getall(self):
         resources = dict()
-        interfaces_re = re.compile(r'^interface\s(Vlan\d+)$', re.M)
-        for name in interfaces_re.findall(self.config):
+        for name in self.iterkeys():
             interface_detail = self.get(name)
             if interface_detail:
                 resources[name] = interface_detail
         return resources
 
+    def iterkeys(self):
+        for name in self.get_section_models('interface'):
+            if VLAN_INTERFACE_RE.match(name):
+                yield name
+
     def set_addresses(self, name, addresses=None, default=False,
                       disable=False):
 
@@ -194,9 +204,9 @@ class VarpInterfaces(EntityCollection):
         return self.configure(commands) if commands else True
 
     def _parse_virtual_addresses(self, config):
-        virt_ip_re = re.compile(r'^\s+ip\svirtual-router\saddress\s(\S+)$',
-                                re.M)
-        return dict(addresses=virt_ip_re.findall(config))
+        values = config.getall('ip virtual-router address')
+        return dict(addresses=[value for value in values
+                               if value and ' ' not in value])
 
 
 def instance(node):
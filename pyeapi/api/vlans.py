@@ -51,13 +51,8 @@ Parameters:
 
 import re
 
-from pyeapi.api import EntityCollection
-from pyeapi.utils import make_iterable
-
-VLAN_ID_RE = re.compile(r'(?:vlan\s)(?P<value>.*)$', re.M)
-NAME_RE = re.compile(r'(?:name\s)(?P<value>.*)$', re.M)
-STATE_RE = re.compile(r'(?:state\s)(?P<value>.*)$', re.M)
-TRUNK_GROUP_RE = re.compile(r'(?:trunk\sgroup\s)(?P<value>.*)$', re.M)
+from pyeapi.api import EntityCollection, memoized
+from pyeapi.utils import make_iterable, VlanSet
 
 
 def isvlan(value):
@@ -88,6 +83,10 @@ class Vlans(EntityCollection):
 
     """
 
+    RECONCILE_ATTRIBUTES = dict(name='name', state='state',
+                                trunk_groups='trunk group')
+
+    @memoized
     def get(self, value):
         """Returns the VLAN configuration as a resource dict.
 
@@ -101,8 +100,15 @@ class Vlans(EntityCollection):
                 key/value pairs.
 
         """
-        config = self.get_block('vlan %s' % value)
-        if not config:
+        models = self.get_section_models('vlan')
+        config = models.get(value)
+        if config is None:
+            # the value may be a regular expression, for instance to match
+            # a grouped vlan section
+            match = re.compile(r'(?:%s)$' % value).match
+            config = next((model for vid, model in models.items()
+                           if match(vid)), None)
+        if config is None:
             return None
 
         response = dict(vlan_id=self._parse_vlan_id(config))
@@ -112,6 +118,9 @@ class Vlans(EntityCollection):
 
         return response
 
+    def _reconcile_parent(self, name):
+        return ['vlan %s' % name]
+
     def _parse_vlan_id(self, config):
         """ _parse_vlan_id scans the provided configuration block and extracts
         the vlan id.  The config block is expected to always return the
@@ -119,14 +128,12 @@ class Vlans(EntityCollection):
         dict.
 
         Args:
-            config (str): The vlan configuration block from the nodes running
-                configuration
+            config (Section): The vlan config section to scan
 
         Returns:
             Str: vlan id (or range/list of vlan ids)
         """
-        value = VLAN_ID_RE.search(config).group('value')
-        return value
+        return config.key[len('vlan '):]
 
     def _parse_name(self, config):
         """ _parse_name scans the provided configuration block and extracts
@@ -135,13 +142,12 @@ class Vlans(EntityCollection):
         dict.
 
         Args:
-            config (str): The vlan configuration block from the nodes running
-                configuration
+            config (Section): The vlan config section to scan
 
         Returns:
             dict: resource dict attribute
         """
-        value = NAME_RE.search(config).group('value')
+        value = config.get('name')
         return dict(name=value)
 
     def _parse_state(self, config):
@@ -151,13 +157,12 @@ class Vlans(EntityCollection):
         the response dict.
 
         Args:
-            config (str): The vlan configuration block from the nodes
-                running configuration
+            config (Section): The vlan config section to scan
 
         Returns:
             dict: resource dict attribute
         """
-        value = STATE_RE.search(config).group('value')
+        value = config.get('state')
         return dict(state=value)
 
     def _parse_trunk_groups(self, config):
@@ -167,15 +172,15 @@ class Vlans(EntityCollection):
         to be merged into the response dict.
 
         Args:
-            config (str): The vlan configuration block form the node's
-                running configuration
+            config (Section): The vlan config section to scan
 
         Returns:
             dict: resource dict attribute
         """
-        values = TRUNK_GROUP_RE.findall(config)
+        values = config.getall('trunk group')
         return dict(trunk_groups=values)
 
+    @memoized
     def getall(self):
         """Returns a dict object of all Vlans in the running-config
 
@@ -183,14 +188,27 @@ class Vlans(EntityCollection):
             A dict object of Vlan attributes
 
         """
-        # RE to find standalone and grouped (ranged, enumerated) vlans (#197)
-        vlans_re = re.compile(r'(?<=^vlan\s)[\d,\-]+', re.M)
-
         response = dict()
-        for vid in vlans_re.findall(self.config):
+        for vid in self.iterkeys():
             response[vid] = self.get(vid)
         return response
 
+    def get_vlan_set(self):
+        """Returns the VLAN IDs configured in the running-config
+
+        Grouped (ranged, enumerated) vlan sections are included without
+        parsing their configuration.
+
+        Returns:
+            A VlanSet of the configured VLAN IDs
+        """
+        return VlanSet(','.join(self.iterkeys()))
+
+    def iterkeys(self):
+        # RE to find standalone and grouped (ranged, enumerated) vlans (#197)
+        for match in self.get_section_keys(r'(?<=^vlan\s)[\d,\-]+'):
+            yield match.group(0)
+
     def create(self, vid):
         """ Creates a new VLAN resource
 
@@ -231,6 +249,96 @@ class Vlans(EntityCollection):
         command = 'default vlan %s' % vid
         return self.configure(command) if isvlan(vid) else False
 
+    def create_vlans(self, vids, attributes=None):
+        """Creates and configures a set of VLANs in a single request
+
+        The VLANs that are not configured are created and the name, state
+        and trunk groups of every VLAN are set to the values in attributes.
+        Lines that would not change the running-config are not sent and
+        VLANs that need the same lines are configured together using a
+        range command, for instance 'vlan 100-199'.
+
+        Example:
+
+            >>> vlans.create_vlans('100-199', {100: dict(name='web'),
+            ...                                101: dict(state='suspend')})
+
+        Args:
+            vids (str, VlanSet, iterable): The VLAN IDs to create in the
+                EOS range syntax, as a VlanSet or as VLAN IDs
+            attributes (dict): The attributes of the VLANs keyed by VLAN ID.
+                The attributes are the name, state and trunk_groups keys of
+                get, attributes that are not included are left unchanged.
+                VLANs in attributes are created as well
+
+        Returns:
+            True if the operation was successful otherwise False
+        """
+        attributes = dict((int(vid), value)
+                          for vid, value in (attributes or {}).items())
+        desired = VlanSet(vids) | VlanSet(attributes)
+        current = self._vlan_index()
+
+        groups = dict()
+        for vid in desired:
+            config = current.get(vid)
+            lines = self._vlan_lines(vid, config, attributes.get(vid) or {})
+            if lines or config is None:
+                groups.setdefault(lines, list()).append(vid)
+
+        commands = list()
+        for lines, members in sorted(groups.items(), key=lambda x: x[1][0]):
+            commands.append('vlan %s' % VlanSet(members))
+            commands.extend(lines)
+        return self.configure(commands) if commands else True
+
+    def delete_vlans(self, vids):
+        """Deletes a set of VLANs in a single request
+
+        Only the VLANs that are configured are deleted, using range
+        commands, for instance 'no vlan 100-199'.
+
+        Args:
+            vids (str, VlanSet, iterable): The VLAN IDs to delete in the
+                EOS range syntax, as a VlanSet or as VLAN IDs
+
+        Returns:
+            True if the operation was successful otherwise False
+        """
+        vids = VlanSet(vids) & VlanSet(self._vlan_index())
+        return self.configure('no vlan %s' % vids) if vids else True
+
+    def _vlan_index(self):
+        # the configuration of grouped vlan sections applies to every vlan
+        # of the group
+        index = dict()
+        for key, config in self.getall().items():
+            for vid in VlanSet(key):
+                index[vid] = config
+        return index
+
+    @staticmethod
+    def _vlan_lines(vid, config, attributes):
+        if config is None:
+            config = dict(name='VLAN%04d' % vid, state='active',
+                          trunk_groups=[])
+        lines = list()
+        name = attributes.get('name')
+        if name is not None and name != config['name']:
+            lines.append('name %s' % name)
+        state = attributes.get('state')
+        if state is not None and state != config['state']:
+            lines.append('state %s' % state)
+        trunk_groups = attributes.get('trunk_groups')
+        if trunk_groups is not None:
+            trunk_groups = make_iterable(trunk_groups)
+            lines.extend('no trunk group %s' % group
+                         for group in config['trunk_groups']
+                         if group not in trunk_groups)
+            lines.extend('trunk group %s' % group for group in trunk_groups
+                         if group not in config['trunk_groups'])
+        return tuple(lines)
+
     def configure_vlan(self, vid, commands):
         """ Configures the specified Vlan using commands
 
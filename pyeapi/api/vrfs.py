@@ -49,11 +49,98 @@ Parameters:
 
 import re
 
-from pyeapi.api import EntityCollection
+from pyeapi.api import EntityCollection, memoized
+from pyeapi.configtree import ConfigTree
 from pyeapi.utils import make_iterable
 
-RD_RE = re.compile(r'(?:\srd\s)(?P<value>.*)$', re.M)
-DESCRIPTION_RE = re.compile(r'(?:description\s)(?P<value>.*)$', re.M)
+VRF_INTERFACE_RE = re.compile(r'^vrf (?:forwarding )?(\S+)$')
+
+# global configuration commands that enable routing in a vrf
+VRF_ROUTING = dict(ipv4_routing='ip routing vrf %s',
+                   ipv6_routing='ipv6 unicast-routing vrf %s')
+
+
+def _top_level(config):
+    """Yields the top level lines of a config with their section commands
+
+    Args:
+        config (str|ConfigTree): The running-config text or tree
+
+    Returns:
+        An iterator of (line, commands) tuples where commands lists the
+            lines of the section body without indentation
+    """
+    if isinstance(config, ConfigTree):
+        for tree in config.children():
+            yield tree.key, tree.commands()
+        return
+    line = None
+    commands = list()
+    for text in config.splitlines():
+        if text.startswith(' '):
+            commands.append(text.strip())
+            continue
+        if line is not None:
+            yield line, commands
+        line = text
+        commands = list()
+    if line is not None:
+        yield line, commands
+
+
+def parse_vrfs(config, keyword='instance'):
+    """Builds the VRF model of a running-config in a single pass
+
+    The vrf sections provide the route distinguisher and description of
+    each VRF.  The global 'no ip routing vrf' and 'no ipv6 unicast-routing
+    vrf' lines disable routing and the vrf line of the interface sections
+    provides the interface membership.
+
+    Args:
+        config (str|ConfigTree): The running-config to parse, either as
+            text or as the structured running-config
+        keyword (str): The keyword of the vrf sections, either 'instance'
+            or 'definition'
+
+    Returns:
+        dict: The VRFs keyed by name in config order.  Each VRF is a dict
+            with the rd, description, ipv4_routing, ipv6_routing and
+            interfaces keys
+    """
+    header = 'vrf %s ' % keyword
+    vrfs = dict()
+    disabled = set()
+    members = dict()
+    for line, commands in _top_level(config):
+        if line.startswith(header):
+            vrf = vrfs.setdefault(line[len(header):].strip(),
+                                  dict(rd=None, description=None))
+            for text in commands:
+                if text.startswith('rd ') and vrf['rd'] is None:
+                    vrf['rd'] = text[3:]
+                elif text.startswith('description ') and \
+                        vrf['description'] is None:
+                    vrf['description'] = text[12:]
+                elif text == 'no description' and \
+                        vrf['description'] is None:
+                    vrf['description'] = ''
+        elif line.startswith('interface '):
+            interface = line[10:].strip()
+            for text in commands:
+                match = VRF_INTERFACE_RE.match(text)
+                if match:
+                    members.setdefault(match.group(1),
+                                       list()).append(interface)
+        elif line.startswith('no ip routing vrf '):
+            disabled.add(('ipv4_routing', line[18:].strip()))
+        elif line.startswith('no ipv6 unicast-routing vrf '):
+            disabled.add(('ipv6_routing', line[28:].strip()))
+
+    for name, vrf in vrfs.items():
+        for attr in VRF_ROUTING:
+            vrf[attr] = (attr, name) not in disabled
+        vrf['interfaces'] = members.get(name, list())
+    return vrfs
 
 
 class Vrfs(EntityCollection):
@@ -64,9 +151,31 @@ class Vrfs(EntityCollection):
 
     """
 
+    RECONCILE_ATTRIBUTES = dict(rd='rd', description='description')
+
+    def _index(self):
+        if self.version_number >= '4.23':
+            keyword = 'instance'
+        else:
+            keyword = 'definition'
+        key = (type(self).__qualname__, type(self).__module__, '_index',
+               keyword)
+
+        def build():
+            if self.node.config_format == 'json':
+                return parse_vrfs(self.node.running_config_tree, keyword)
+            return parse_vrfs(self.config, keyword)
+
+        # pinned so iter_all does not parse the config for every vrf
+        return self.node.memoize(key, build, pinned=True)
+
+    @memoized
     def get(self, value):
         """Returns the VRF configuration as a resource dict.
 
+        The VRF is looked up in a model of all VRFs that is built in a
+        single pass over the running-config.
+
         Args:
             value (string): The vrf name to retrieve from the
                 running configuration.
@@ -76,78 +185,65 @@ class Vrfs(EntityCollection):
                 key/value pairs.
 
         """
-        if self.version_number >= '4.23':
-            config = self.get_block('vrf instance %s' % value)
-        else:
-            config = self.get_block('vrf definition %s' % value)
-        if not config:
+        vrf = self._index().get(value)
+        if vrf is None:
             return None
         response = dict(vrf_name=value)
-        response.update(self._parse_rd(config))
-        response.update(self._parse_description(config))
-        config = self.get_block('no ip routing vrf %s' % value)
-        if config:
-            response['ipv4_routing'] = False
-        else:
-            response['ipv4_routing'] = True
-        config = self.get_block('no ipv6 unicast-routing vrf %s' % value)
-        if config:
-            response['ipv6_routing'] = False
-        else:
-            response['ipv6_routing'] = True
-
+        for attr in ('rd', 'description', 'ipv4_routing', 'ipv6_routing'):
+            response[attr] = vrf[attr]
         return response
 
-    def _parse_rd(self, config):
-        """ _parse_rd scans the provided configuration block and extracts
-        the vrf rd. The return dict is intended to be merged into the response
-        dict.
-
-        Args:
-            config (str): The vrf configuration block from the nodes running
-                configuration
+    @memoized
+    def getall(self):
+        """Returns a dict object of all VRFs in the running-config
 
         Returns:
-            dict: resource dict attribute
+            A dict object of VRF attributes
+
         """
-        match = RD_RE.search(config)
-        if match:
-            value = match.group('value')
-        else:
-            value = match
-        return dict(rd=value)
+        response = dict()
+        for vrf in self.iterkeys():
+            response[vrf] = self.get(vrf)
+        return response
 
-    def _parse_description(self, config):
-        """ _parse_description scans the provided configuration block and
-        extracts the vrf description value. The return dict is intended to
-        be merged into the response dict.
+    def iterkeys(self):
+        return iter(list(self._index()))
+
+    def get_interfaces(self, vrf_name):
+        """Returns the interfaces that are members of a VRF
 
         Args:
-            config (str): The vrf configuration block from the nodes
-                running configuration
+            vrf_name (str): The VRF name to return the interfaces for
 
         Returns:
-            dict: resource dict attribute
+            list: The names of the interfaces configured with the VRF in
+                config order, or None if the VRF does not exist
         """
-        value = DESCRIPTION_RE.search(config).group('value')
-        return dict(description=value)
-
-    def getall(self):
-        """Returns a dict object of all VRFs in the running-config
-
-        Returns:
-            A dict object of VRF attributes
+        vrf = self._index().get(vrf_name)
+        if vrf is None:
+            return None
+        return list(vrf['interfaces'])
 
-        """
+    def _reconcile_parent(self, name):
         if self.version_number >= '4.23':
-            vrfs_re = re.compile(r'(?<=^vrf instance\s)(\w+)', re.M)
-        else:
-            vrfs_re = re.compile(r'(?<=^vrf definition\s)(\w+)', re.M)
-
-        response = dict()
-        for vrf in vrfs_re.findall(self.config):
-            response[vrf] = self.get(vrf)
-        return response
+            return ['vrf instance %s' % name]
+        return ['vrf definition %s' % name]
+
+    def _reconcile_lines(self, name, current, desired):
+        block = dict((key, value) for key, value in desired.items()
+                     if key not in VRF_ROUTING)
+        commands = super(Vrfs, self)._reconcile_lines(name, current, block)
+        routing = list()
+        for attr, value in desired.items():
+            if attr in VRF_ROUTING and \
+                    (current or {}).get(attr, False) is not bool(value):
+                routing.append(self.command_builder(VRF_ROUTING[attr] % name,
+                                                    value=bool(value)))
+        if routing:
+            # leave the vrf mode before sending the global commands
+            commands.append('exit')
+            commands.extend(routing)
+        return commands
 
     def create(self, vrf_name, rd=None):
         """ Creates a new VRF resource
@@ -155,7 +155,9 @@ Notes:
 
 import re
 
-from pyeapi.api import EntityCollection
+from itertools import chain
+
+from pyeapi.api import EntityCollection, memoized
 
 PROPERTIES = ['primary_ip', 'priority', 'description', 'secondary_ip',
               'ip_version', 'enable', 'timers_advertise',
@@ -163,6 +165,94 @@ PROPERTIES = ['primary_ip', 'priority', 'description', 'secondary_ip',
               'preempt_delay_min', 'preempt_delay_reload',
               'delay_reload', 'track', 'bfd_ip']
 
+# Matches the start of a (negated) vrrp line of an interface section
+VRRP_LINE_RE = re.compile(r'(no |)vrrp (\d+)')
+
+# Values of a vrrp that has no line for the attribute
+VRRP_DEFAULTS = dict(enable=True, primary_ip=None, priority=None,
+                     timers_advertise=None, preempt=False, secondary_ip=[],
+                     description='', mac_addr_adv_interval=None,
+                     preempt_delay_min=None, preempt_delay_reload=None,
+                     bfd_ip='', ip_version=None, delay_reload=None, track=[])
+
+# Attributes that collect the values of all matching lines
+VRRP_LIST_KEYS = frozenset(['secondary_ip', 'track'])
+
+IP_RE = r'(\d+\.\d+\.\d+\.\d+)'
+
+
+def _vrrp_lines(config):
+    """Returns the vrrp and negated vrrp lines of an interface Section"""
+    return chain(config.commands('vrrp'), config.commands('no vrrp'))
+
+
+def _track_entry(match):
+    entry = {'name': match.group(1), 'action': match.group(2)}
+    amount = int(match.group(3)) if match.group(3) else None
+    if amount:
+        entry['amount'] = amount
+    return entry
+
+
+def _vrrp_rules(legacy):
+    """Returns the vrrp line rules for the EOS config syntax
+
+    Each rule is a tuple of the attribute name, the compiled regex that
+    is matched against the text following 'vrrp <vrid> ' and a callable
+    that returns the attribute value from the match object.  The rules are
+    grouped by the first word of the line they match so each line is only
+    matched against its candidate rules.  Rules that can match a line
+    starting with any word are stored under None.
+
+    Args:
+        legacy (bool): True for the syntax used before EOS 4.21.3
+
+    Returns:
+        A dict of rule lists keyed by the first word of the line
+    """
+    group = (lambda m: m.group(1))
+    number = (lambda m: int(m.group(1)))
+    rules = [
+        ('delay_reload', 'delay reload' if legacy else 'timers delay reload',
+         r' (\d+)$', number),
+        ('description', 'description' if legacy else 'session description',
+         r'(.*)$', lambda m: m.group(1).lstrip()),
+        ('enable', 'shutdown' if legacy else 'disabled', r'$',
+         lambda m: False),
+        ('ip_version', 'ip version' if legacy else 'ipv4 version',
+         r' (\d+)$', number),
+        ('mac_addr_adv_interval', 'mac-address advertisement-interval',
+         r' (\d+)$', number),
+        ('preempt', 'preempt', r'$', lambda m: True),
+        ('preempt_delay_min', 'preempt delay minimum', r' (\d+)$', number),
+        ('preempt_delay_reload', 'preempt delay reload', r' (\d+)$',
+         number),
+        ('primary_ip', 'ip' if legacy else 'ipv4', r' %s$' % IP_RE, group),
+        ('priority', 'priority' if legacy else 'priority-level', r' (\d+)$',
+         number),
+        ('secondary_ip', 'ip' if legacy else 'ipv4',
+         r' %s secondary$' % IP_RE, group),
+        ('timers_advertise',
+         'timers advertise' if legacy else 'advertisement interval',
+         r' (\d+)$', number),
+        ('track', 'track' if legacy else 'tracked-object',
+         r' (\S+) (decrement|shutdown)(?:( \d+$|$))', _track_entry),
+        ('bfd_ip', 'bfd ip', r'(?: %s|)$' % IP_RE, group),
+    ]
+    table = dict()
+    for key, prefix, regex, value in rules:
+        word = prefix.split(' ')[0]
+        if word == prefix and not regex.startswith((' ', '$')):
+            word = None
+        table.setdefault(word, []).append(
+            (key, re.compile(re.escape(prefix) + regex), value))
+    return table
+
+
+# The vrrp line rules keyed by EOS version >= 4.21.3
+VRRP_RULES = {False: _vrrp_rules(legacy=True),
+              True: _vrrp_rules(legacy=False)}
+
 
 class Vrrp(EntityCollection):
     """The Vrrp class provides management of the VRRP configuration
@@ -171,6 +261,7 @@ class Vrrp(EntityCollection):
     working with the node's vrrp configurations.
     """
 
+    @memoized
     def get(self, name):
         """Get the vrrp configurations for a single node interface
 
@@ -191,43 +282,17 @@ class Vrrp(EntityCollection):
 
         # Get the config for the interface. Return None if the
         # interface is not defined
-        config = self.get_block('interface %s' % interface)
+        config = self.get_section_model('interface', interface)
         if config is None:
             return config
 
-        # Find all occurrences of vrids in this interface and make
-        # a set of the unique vrid numbers
-        match = set(re.findall(r'^\s+(?:no |)vrrp (\d+)', config, re.M))
-        if not match:
-            return None
-
-        # Initialize the result dict
-        result = dict()
-
-        for vrid in match:
-            subd = dict()
-
-            # Parse the vrrp configuration for the vrid(s) in the list
-            subd.update(self._parse_delay_reload(config, vrid))
-            subd.update(self._parse_description(config, vrid))
-            subd.update(self._parse_enable(config, vrid))
-            subd.update(self._parse_ip_version(config, vrid))
-            subd.update(self._parse_mac_addr_adv_interval(config, vrid))
-            subd.update(self._parse_preempt(config, vrid))
-            subd.update(self._parse_preempt_delay_min(config, vrid))
-            subd.update(self._parse_preempt_delay_reload(config, vrid))
-            subd.update(self._parse_primary_ip(config, vrid))
-            subd.update(self._parse_priority(config, vrid))
-            subd.update(self._parse_secondary_ip(config, vrid))
-            subd.update(self._parse_timers_advertise(config, vrid))
-            subd.update(self._parse_track(config, vrid))
-            subd.update(self._parse_bfd_ip(config, vrid))
-
-            result.update({int(vrid): subd})
+        # Parse the vrrp configuration of every vrid in the interface
+        result = self._parse_vrrps(config)
 
         # If result dict is empty, return None, otherwise return result
         return result if result else None
 
+    @memoized
     def getall(self):
         """Get the vrrp configurations for all interfaces on a node
 
@@ -238,155 +303,77 @@ class Vrrp(EntityCollection):
 
         vrrps = dict()
 
-        # Find the available interfaces
-        interfaces = re.findall(r'^interface\s(\S+)', self.config, re.M)
-
-        # Get the vrrps defined for each interface
-        for interface in interfaces:
-            vrrp = self.get(interface)
+        # Walk the interface sections once and parse the vrrps of each
+        for name, config in self.get_section_models('interface').items():
+            vrrp = self._parse_vrrps(config)
             # Only add those interfaces that have vrrps defined
             if vrrp:
-                vrrps.update({interface: vrrp})
+                vrrps[name] = vrrp
 
         return vrrps
 
-    def _parse_enable(self, config, vrid):
-        if self.version_number >= '4.21.3':
-            match = re.search(r'^\s+vrrp %s disabled$' % vrid, config, re.M)
-        else:
-            match = re.search(r'^\s+vrrp %s shutdown$' % vrid, config, re.M)
-        if match:
-            return dict(enable=False)
-        return dict(enable=True)
+    def iterkeys(self):
+        # an interface is a key if its section has a vrrp line, which is
+        # the case when _parse_vrrps returns a non-empty dict
+        for name, config in self.get_section_models('interface').items():
+            if any(VRRP_LINE_RE.match(line) for line in _vrrp_lines(config)):
+                yield name
 
-    def _parse_primary_ip(self, config, vrid):
-        if self.version_number >= '4.21.3':
-            match = re.search(r'^\s+vrrp %s ipv4 (\d+\.\d+\.\d+\.\d+)$' %
-                              vrid, config, re.M)
-        else:
-            match = re.search(r'^\s+vrrp %s ip (\d+\.\d+\.\d+\.\d+)$' %
-                              vrid, config, re.M)
-        value = match.group(1) if match else None
-        return dict(primary_ip=value)
+    def iter_all(self):
+        """Yields the vrrp configurations one interface at a time
 
-    def _parse_priority(self, config, vrid):
-        if self.version_number >= '4.21.3':
-            match = re.search(r'^\s+vrrp %s priority-level (\d+)$' %
-                              vrid, config, re.M)
-        else:
-            match = re.search(r'^\s+vrrp %s priority (\d+)$' %
-                              vrid, config, re.M)
-        value = int(match.group(1)) if match else None
-        return dict(priority=value)
+        See EntityCollection.iter_all.
 
-    def _parse_timers_advertise(self, config, vrid):
-        if self.version_number >= '4.21.3':
-            match = re.search(r'^\s+vrrp %s advertisement interval (\d+)$' %
-                              vrid, config, re.M)
-        else:
-            match = re.search(r'^\s+vrrp %s timers advertise (\d+)$' %
-                              vrid, config, re.M)
-        value = int(match.group(1)) if match else None
-        return dict(timers_advertise=value)
-
-    def _parse_preempt(self, config, vrid):
-        match = re.search(r'^\s+vrrp %s preempt$' % vrid, config, re.M)
-        if match:
-            return dict(preempt=True)
-        return dict(preempt=False)
-
-    def _parse_secondary_ip(self, config, vrid):
-        if self.version_number >= '4.21.3':
-            matches = re.findall(r'^\s+vrrp %s ipv4 (\d+\.\d+\.\d+\.\d+) '
-                                 r'secondary$' % vrid, config, re.M)
-        else:
-            matches = re.findall(r'^\s+vrrp %s ip (\d+\.\d+\.\d+\.\d+) '
-                                 r'secondary$' % vrid, config, re.M)
-        value = matches if matches else []
-        return dict(secondary_ip=value)
+        Returns:
+            An iterator of (interface, vrrp configuration) tuples for the
+                interfaces that have vrrps defined
+        """
+        for name in self.get_section_models('interface'):
+            with self.node.memoize_paused():
+                vrrp = self.get(name)
+            if vrrp:
+                yield name, vrrp
 
-    def _parse_description(self, config, vrid):
-        if self.version_number >= '4.21.3':
-            match = re.search(r'^\s+vrrp %s session description(.*)$' %
-                              vrid, config, re.M)
-        else:
-            match = re.search(r'^\s+vrrp %s description(.*)$' %
-                              vrid, config, re.M)
-        if match:
-            return dict(description=match.group(1).lstrip())
-        return dict(description='')
-
-    def _parse_mac_addr_adv_interval(self, config, vrid):
-        match = re.search(r'^\s+vrrp %s mac-address advertisement-interval '
-                          r'(\d+)$' % vrid, config, re.M)
-        value = int(match.group(1)) if match else None
-        return dict(mac_addr_adv_interval=value)
-
-    def _parse_preempt_delay_min(self, config, vrid):
-        match = re.search(r'^\s+vrrp %s preempt delay minimum (\d+)$' %
-                          vrid, config, re.M)
-        value = int(match.group(1)) if match else None
-        return dict(preempt_delay_min=value)
-
-    def _parse_preempt_delay_reload(self, config, vrid):
-        match = re.search(r'^\s+vrrp %s preempt delay reload (\d+)$' %
-                          vrid, config, re.M)
-        value = int(match.group(1)) if match else None
-        return dict(preempt_delay_reload=value)
-
-    def _parse_bfd_ip(self, config, vrid):
-        match = re.search(r'^\s+vrrp %s bfd ip'
-                          r'(?: (\d+\.\d+\.\d+\.\d+)|)$' %
-                          vrid, config, re.M)
-        if match:
-            return dict(bfd_ip=match.group(1))
-        return dict(bfd_ip='')
-
-    def _parse_ip_version(self, config, vrid):
-        if self.version_number >= '4.21.3':
-            match = re.search(r'^\s+vrrp %s ipv4 version (\d+)$' %
-                              vrid, config, re.M)
-        else:
-            match = re.search(r'^\s+vrrp %s ip version (\d+)$' %
-                              vrid, config, re.M)
-        value = int(match.group(1)) if match else None
-        return dict(ip_version=value)
+    def _parse_vrrps(self, config):
+        """Parses all vrrps of an interface config block in a single pass
 
-    def _parse_delay_reload(self, config, vrid):
-        if self.version_number >= '4.21.3':
-            match = re.search(r'^\s+vrrp %s timers delay reload (\d+)$' %
-                              vrid, config, re.M)
-        else:
-            match = re.search(r'^\s+vrrp %s delay reload (\d+)$' %
-                              vrid, config, re.M)
-        value = int(match.group(1)) if match else None
-        return dict(delay_reload=value)
+        Args:
+            config (Section): The interface config section to scan
 
-    def _parse_track(self, config, vrid):
-        if self.version_number >= '4.21.3':
-            matches = re.findall(r'^\s+vrrp %s tracked-object (\S+) '
-                                 r'(decrement|shutdown)(?:( \d+$|$))' %
-                                 vrid, config, re.M)
-        else:
-            matches = re.findall(r'^\s+vrrp %s track (\S+) '
-                                 r'(decrement|shutdown)(?:( \d+$|$))' %
-                                 vrid, config, re.M)
-        value = []
-        for match in matches:
-            tr_obj = match[0]
-            action = match[1]
-            amount = None if match[2] == '' else int(match[2])
-            entry = {
-                'name': tr_obj,
-                'action': action,
-            }
-            if amount:
-                entry.update({'amount': amount})
-            value.append(entry)
+        Returns:
+            A dict of the vrrp configurations keyed by VRID
+        """
+        rules = VRRP_RULES[self.version_number >= '4.21.3']
+        groups = dict()
+        for line in _vrrp_lines(config):
+            match = VRRP_LINE_RE.match(line)
+            if not match:
+                continue
+            group = groups.setdefault(match.group(2), dict())
+            rest = line[match.end():]
+            if match.group(1) or not rest.startswith(' '):
+                continue
+            rest = rest[1:]
+            candidates = rules.get(rest.split(' ', 1)[0], [])
+            for key, regex, value in candidates + rules.get(None, []):
+                found = regex.match(rest)
+                if not found:
+                    continue
+                if key in VRRP_LIST_KEYS:
+                    group.setdefault(key, []).append(value(found))
+                elif key not in group:
+                    group[key] = value(found)
 
-        # Return the list, sorted for easier comparison
-        track_list = sorted(value, key=lambda k: (k['name'], k['action']))
-        return dict(track=track_list)
+        result = dict()
+        for vrid, group in groups.items():
+            subd = dict(VRRP_DEFAULTS)
+            subd.update(group)
+            subd['secondary_ip'] = list(subd['secondary_ip'])
+            # Return the list, sorted for easier comparison
+            subd['track'] = sorted(subd['track'],
+                                   key=lambda k: (k['name'], k['action']))
+            result[int(vrid)] = subd
+        return result
 
     def create(self, interface, vrid, **kwargs):
         """Creates a vrrp instance from an interface
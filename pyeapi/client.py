@@ -91,16 +91,23 @@ contains the settings for nodes used by the connect_to function.
 
 """
 from uuid import uuid4
+import json
 import os
 import re
+import threading
 
+from contextlib import contextmanager
 from functools import lru_cache
+from itertools import product
 
 # Note: SafeConfigParser is deprecated and replaced by ConfigParser
 from configparser import ConfigParser as SafeConfigParser
 from configparser import Error as SafeConfigParserError
 
 from pyeapi.utils import load_module, make_iterable, debug, CliVariants
+from pyeapi.utils import CliVariantsCache, CLI_VARIANTS_CACHE
+from pyeapi.configcache import ConfigCache, fingerprint
+from pyeapi.configtree import ConfigTree
 
 from pyeapi.eapilib import HttpEapiConnection, HttpsEapiConnection
 from pyeapi.eapilib import HttpsEapiCertConnection
@@ -123,6 +130,35 @@ TRANSPORTS = {
 
 DEFAULT_TRANSPORT = 'https'
 
+# Matches an anchored regular expression without special characters other
+# than (escaped) dots, i.e. ^^interface Ethernet1.1$
+SECTION_LITERAL_RE = re.compile(r'^\^+([^\s\\^$|?*+()\[\]{}]'
+                                r'(?:[^\\^$|?*+()\[\]{}]|\\\.)*)\$$')
+
+# Config commands that enter or leave a config mode.  Transaction.build
+# only merges blocks that do not match this expression after their first
+# line; any other block is sent exactly as it was added
+CONFIG_MODE_RE = re.compile(
+    r'^(?:(?:interface|vlan|vrf|router|address-family|(?:ip|ipv6|mac) '
+    r'access-list|ip prefix-list|route-map|mlag|management|monitor|'
+    r'policy-map|class-map|control-plane|daemon|peer-filter|exit|end)\b|!)')
+
+# String values of the boolean options read from eapi.conf that disable
+# the option
+FALSE_STRINGS = ('', 'false', 'no', 'off')
+
+# Lazily loaded Node properties that can be retrieved with Node.prefetch
+PREFETCH_ITEMS = ('version', 'running_config', 'startup_config')
+
+# Candidate commands used to cheaply detect running-config changes.  The
+# commands are tried in order and the first one accepted by the node is
+# remembered; its text output serves as a token that changes whenever the
+# running-config changes (a change counter, a last-change timestamp or a
+# checksum, depending on what the EOS release supports).
+CONFIG_PROBES = ['show running-config checksum',
+                 'show configuration timestamp',
+                 'show configuration counter']
+
 
 class Config(SafeConfigParser):
     """Conifguration instance for managing the eapi.conf file.
@@ -394,7 +430,7 @@ def make_connection(transport, **kwargs):
 def connect(transport=None, host='localhost', username='admin',
             password='', port=None, key_file=None, cert_file=None,
             ca_file=None, timeout=60, return_node=False, context=None,
-            **kwargs):
+            prefetch=None, **kwargs):
     """ Creates a connection using the supplied settings
 
     This function will create a connection to an Arista EOS node using
@@ -421,6 +457,10 @@ def connect(transport=None, host='localhost', username='admin',
         context (ssl.SSLContext): ssl object's context. The default is None
         return_node (bool): Returns a Node object if True, otherwise
             returns an EapiConnection object.
+        prefetch (bool, list, str): The Node properties to retrieve at
+            connect time with Node.prefetch.  If True all properties are
+            retrieved.  A string is treated as a comma separated list.  Only
+            used if return_node is True.  The default is None
 
 
     Returns:
@@ -455,12 +495,241 @@ def connect(transport=None, host='localhost', username='admin',
                                  cert_file=cert_file, ca_file=ca_file,
                                  port=port, timeout=timeout, context=context)
     if return_node:
-        return Node(connection, transport=transport, host=host,
+        node = Node(connection, transport=transport, host=host,
                     username=username, password=password, key_file=key_file,
                     cert_file=cert_file, ca_file=ca_file, port=port, **kwargs)
+        if isinstance(prefetch, str) and \
+                prefetch.strip().lower() in FALSE_STRINGS:
+            prefetch = None
+        if prefetch:
+            if isinstance(prefetch, str):
+                prefetch = [] if prefetch.lower() in ['true', 'yes', 'on'] \
+                    else [item.strip() for item in prefetch.split(',')]
+            elif prefetch is True:
+                prefetch = []
+            node.prefetch(*prefetch)
+        return node
     return connection
 
 
+class Transaction(object):
+    """Buffers configuration commands and sends them in a single request
+
+    A Transaction is created by Node.transaction.  While the transaction is
+    open, every call to Node.config (and thus every API setter) appends its
+    commands to the transaction instead of sending them to the node.  When
+    the transaction is committed the buffered command blocks are merged by
+    section, duplicate lines are removed and the result is sent with a
+    single configure terminal (or configure session) request.
+
+    Blocks that start with the same line (for instance 'interface Ethernet1')
+    are merged into the first block that started the section, unless a
+    later block negates or defaults the section.  Sections are sent in the
+    order they first appear.  Within a section only the last occurrence of
+    a duplicate line is kept.
+
+    Only blocks that stay in the config mode entered by their first line
+    are merged.  A block that enters another mode or leaves the mode after
+    its first line (see CONFIG_MODE_RE), or that starts with a global
+    command, is sent exactly as it was added.  Blocks added after it are
+    not merged into the sections that precede it.
+
+    Attributes:
+        node (Node): The node the transaction is sent to
+        session (bool): If True the commands are sent in a config session
+            that is committed in the same request
+        blocks (list): The buffered command blocks, one per config call
+        results (list): A boolean per buffered block indicating if the
+            block was applied.  This attribute is populated by commit
+        committed (bool): True once commit has been called.  Callers that
+            open a nested Node.transaction use it to tell that their
+            commands joined an outer transaction that is not sent yet
+        response (list): The response of the request sent by commit
+        error (CommandError): The exception raised by the node, if any
+
+    Args:
+        node (Node): The node the transaction is sent to
+        session (bool): If True the commands are sent in a config session
+    """
+
+    def __init__(self, node, session=False):
+        self.node = node
+        self.session = session
+        self.blocks = list()
+        self.results = list()
+        self.response = None
+        self.error = None
+        self.committed = False
+
+    def add(self, commands):
+        """Appends a block of commands to the transaction
+
+        Args:
+            commands (str, list, CliVariants): The config commands
+
+        Returns:
+            A list with an empty response per command, the same form as the
+                response of Node.config
+        """
+        commands = list(make_iterable(commands))
+        if commands:
+            self.blocks.append(commands)
+        return [{} for _ in commands]
+
+    @staticmethod
+    def _linekey(line):
+        return line if isinstance(line, str) else ('id', id(line))
+
+    @staticmethod
+    def _mergeable(block):
+        def changes_mode(line):
+            return isinstance(line, str) and \
+                CONFIG_MODE_RE.match(line) is not None
+        if len(block) == 1:
+            return True
+        return changes_mode(block[0]) and \
+            not any(changes_mode(line) for line in block[1:])
+
+    @staticmethod
+    def _conflicts(first, second):
+        def norm(line):
+            for prefix in ('no ', 'default '):
+                if line.startswith(prefix):
+                    return line[len(prefix):]
+            return line
+        if not isinstance(first, str) or not isinstance(second, str):
+            return False
+        first, second = norm(first), norm(second)
+        return first == second or first.startswith(second + ' ') or \
+            second.startswith(first + ' ')
+
+    def build(self):
+        """Merges the buffered blocks into a single command list
+
+        Returns:
+            A tuple of the merged command list and, for each block, the
+                list of positions its lines have in the merged list
+        """
+        sections = list()
+        latest = dict()
+        for index, block in enumerate(self.blocks):
+            if not self._mergeable(block):
+                latest.clear()
+                sections.append([list(block), [index], False])
+                continue
+            key = self._linekey(block[0])
+            position = latest.get(key)
+            if position is not None and any(
+                    self._conflicts(block[0], section[0][0])
+                    for section in sections[position + 1:]):
+                position = None
+            if position is None:
+                position = latest[key] = len(sections)
+                sections.append([[block[0]], list(), True])
+            sections[position][0].extend(block[1:])
+            sections[position][1].append(index)
+
+        commands = list()
+        positions = dict()
+        for lines, blocks, merged in sections:
+            if not merged:
+                positions[blocks[0]] = list(range(len(commands),
+                                                  len(commands) + len(lines)))
+                commands.extend(lines)
+                continue
+            seen = set()
+            kept = list()
+            for line in reversed(lines[1:]):
+                linekey = self._linekey(line)
+                if linekey not in seen:
+                    seen.add(linekey)
+                    kept.append(line)
+            kept.reverse()
+            header = len(commands)
+            commands.append(lines[0])
+            commands.extend(kept)
+            offsets = dict((self._linekey(line), header + offset + 1)
+                           for offset, line in enumerate(kept))
+            for index in blocks:
+                positions[index] = [header] + \
+                    [offsets[self._linekey(line)]
+                     for line in self.blocks[index][1:]]
+        return commands, [positions[i] for i in range(len(self.blocks))]
+
+    def commit(self):
+        """Sends the buffered commands to the node
+
+        Returns:
+            True if all commands were applied, otherwise False.  The
+                per-block results are available in the results attribute
+        """
+        self.committed = True
+        if not self.blocks:
+            return True
+        commands, positions = self.build()
+        failed = None
+        try:
+            if self.session and not self.node._session_name:
+                self.response = self._commit_session(commands)
+            else:
+                self.response = self.node.config(commands)
+        except CommandError as exc:
+            self.error = exc
+            failed = self._failed_position(exc, commands)
+        if self.error is None:
+            self.results = [True] * len(self.blocks)
+        else:
+            self.results = [failed is not None and max(pos) < failed
+                            for pos in positions]
+        return self.error is None
+
+    def _commit_session(self, commands):
+        node = self.node
+        node._session_name = uuid4()
+        try:
+            response = node.config(commands + ['commit'])
+        except CommandError:
+            try:
+                node._configure_session(['abort'])
+            except CommandError:
+                pass
+            raise
+        finally:
+            node._session_name = None
+        if node.autorefresh:
+            node.refresh(force=True)
+        return response[:-1]
+
+    def _failed_position(self, exc, commands):
+        # only a configure terminal request applies the commands that
+        # precede the failing one
+        if self.session and not self.node._session_name:
+            return None
+        failed = None
+        for index, output in enumerate(exc.output or []):
+            if isinstance(output, dict) and 'errors' in output:
+                # the response includes the enable and configure commands
+                failed = index - 2
+                break
+        if failed is None:
+            return None
+        # map the failed command of the variant that was sent last back to
+        # the position of the CliVariants in commands
+        choice = list(getattr(exc, 'variants', None) or ())
+        if len(choice) != sum(isinstance(c, CliVariants) for c in commands):
+            return None
+        selected = iter(choice)
+        sent = 0
+        for position, command in enumerate(commands):
+            if isinstance(command, CliVariants):
+                sent += len(command.variants[next(selected)])
+            else:
+                sent += 1
+            if sent > failed:
+                return position
+        return None
+
+
 class Node(object):
     """Represents a single device for sending and receiving eAPI messages
 
@@ -476,6 +745,9 @@ class Node(object):
         running_config (str): The running-config from the device.  This
             property is lazily loaded and refreshed over the life cycle of
             the instance.
+        running_config_tree (ConfigTree): The running-config from the
+            device as a structured command tree.  This property is lazily
+            loaded and refreshed over the life cycle of the instance.
         startup_config (str): The startup-config from the device.  This
             property is lazily loaded and refreshed over the life cycle of
             the instance.
@@ -484,26 +756,77 @@ class Node(object):
             must be manually refreshed.
         config_defaults (bool): If True, the default config options will be
             shown in the running-config output
+        config_format (str): The encoding used to retrieve the
+            running-config.  If 'json', the running-config is retrieved as a
+            structured command tree and section lookups are answered from
+            the tree.  The running_config text is then rendered from the
+            tree.  The API modules list their keys from the top level of
+            the tree (see BaseEntity.get_section_keys) but still parse the
+            text of each section, rendered by Node.section.  The default
+            value is 'text'
+        config_probe (bool, str): If True, a cached running-config is
+            validated against the node with a cheap probe command (see
+            CONFIG_PROBES) before it is re-downloaded after a refresh.  A
+            string value specifies the probe command to use.  Probing only
+            applies to the text config_format.  The default value is False
+        config_cache (str): The directory of an on-disk running-config
+            cache.  If specified along with config_probe, the running-config
+            and its section index are stored per connection name and reused
+            by new instances as long as the probe reports no change
+        variants_cache (CliVariantsCache): Remembers which CliVariants
+            variant succeeded per EOS version so config sends it first.  The
+            cache is shared by all nodes unless a CliVariantsCache instance
+            or the filename of a persisted cache is specified with the
+            variants_cache keyword
         settings (dict): Provides access to the settings used to create the
             Node instance.
 
+    A Node instance can be shared by multiple threads.  Lazily loaded
+    properties are retrieved only once under contention, requests and
+    config changes are serialized against refreshes, and config sessions
+    and transactions are tracked per thread.
+
     Args:
         connection (EapiConnection): An instance of EapiConnection used as the
             transport for sending and receiving eAPI requests and responses.
         **kwargs: An arbitrary list of keyword arguments
     """
     def __init__(self, connection, **kwargs):
+        self._lock = threading.RLock()
+        self._local = threading.local()
         self._connection = connection
         self._running_config = None
+        self._running_config_tree = None
         self._startup_config = None
         self._version = None
         self._version_number = None
         self._model = None
         self._session_name = None
+        self._transaction = None
 
         self._enablepwd = kwargs.get('enablepwd')
         self.autorefresh = kwargs.get('autorefresh', True)
         self.config_defaults = kwargs.get('config_defaults', True)
+        self.config_format = kwargs.get('config_format', 'text')
+        self.config_probe = kwargs.get('config_probe', False)
+        if isinstance(self.config_probe, str) and \
+                self.config_probe.strip().lower() in FALSE_STRINGS:
+            self.config_probe = False
+        self.variants_cache = kwargs.get('variants_cache', CLI_VARIANTS_CACHE)
+        if isinstance(self.variants_cache, str):
+            self.variants_cache = CliVariantsCache(self.variants_cache)
+        self._config_token = None
+        self._config_stale = False
+        self._probe_command = None
+        self._probe_stats = dict(hits=0, misses=0)
+        self._probe_token = None
+        self._sections_seed = None
+        self._fingerprint = None
+        self._models = (None, dict())
+        self._apis = dict()
+        self._config_cache = None
+        if kwargs.get('config_cache'):
+            self._config_cache = ConfigCache(kwargs['config_cache'])
         self.settings = kwargs
 
     def __str__(self):
@@ -518,60 +841,383 @@ class Node(object):
 
     @property
     def running_config(self):
+        config = self._running_config
+        if config is not None and not self._config_stale:
+            return config
+        with self._lock:
+            return self._load_running_config()
+
+    def _load_running_config(self):
         if self._running_config is not None:
+            if not self._config_stale or self._probe_config():
+                self._config_stale = False
+                return self._running_config
+        self._config_stale = False
+        if self.config_format == 'json':
+            self._running_config = self.running_config_tree.text().strip()
             return self._running_config
         params = 'all' if self.config_defaults else None
-        self._running_config = self.get_config(params=params,
-                                               as_string=True)
+        probe, token = self._detect_probe()
+        pending, self._probe_token = self._probe_token, None
+        if not probe:
+            self._running_config = self.get_config(params=params,
+                                                   as_string=True)
+            return self._running_config
+        if self._config_cache is not None:
+            token = token or pending or self._run_probe(probe)
+            if self._load_cached_config(token, params):
+                return self._running_config
+        command = 'show running-config'
+        if params:
+            command += ' %s' % params
+        result = self.run_commands([probe, command], 'text')
+        self._config_token = str(result[0]['output']).strip()
+        self._running_config = str(result[1]['output']).strip()
+        if self._config_cache is not None:
+            self._config_cache.store(self._cache_name, self._config_token,
+                                     self._running_config,
+                                     self._chunkify(self._running_config),
+                                     params=params)
         return self._running_config
 
+    @property
+    def running_config_tree(self):
+        tree = self._running_config_tree
+        if tree is not None:
+            return tree
+        with self._lock:
+            if self._running_config_tree is not None:
+                return self._running_config_tree
+            command = 'show running-config'
+            if self.config_defaults:
+                command += ' all'
+            result = self.run_commands(command, 'json')
+            self._running_config_tree = ConfigTree.from_response(result[0])
+            return self._running_config_tree
+
+    @property
+    def _cache_name(self):
+        return self.settings.get('name') or \
+            self.settings.get('host') or 'localhost'
+
+    def _load_cached_config(self, token, params):
+        """Loads the running-config from the on-disk config cache
+
+        Args:
+            token (str): The current probe token of the node
+            params (str): The params used to retrieve the running-config
+
+        Returns:
+            True if a valid entry was found and loaded, otherwise False
+        """
+        entry = self._config_cache.load(self._cache_name, token,
+                                        params=params)
+        if entry is None:
+            return False
+        self._running_config, sections = entry
+        self._sections_seed = (self._running_config, sections)
+        self._config_token = token
+        self._probe_stats['hits'] += 1
+        return True
+
+    @property
+    def probe_stats(self):
+        """Returns the running-config probe hit and miss counters
+
+        A hit means a refreshed running-config was validated by the probe
+        and did not need to be downloaded again, a miss means the probe
+        detected a change and the running-config was re-fetched.
+        """
+        return dict(self._probe_stats)
+
+    @property
+    def config_fingerprint(self):
+        """Returns the fingerprint of the current running-config
+
+        The fingerprint is computed once per running-config and is used to
+        key the parsed models returned by memoize.  With the json
+        config_format the fingerprint is computed from the command tree so
+        the running-config text is not rendered.
+        """
+        if self.config_format == 'json':
+            config = self.running_config_tree
+        else:
+            config = self.running_config
+        cached = self._fingerprint
+        if cached is not None and cached[0] is config:
+            return cached[1]
+        if isinstance(config, ConfigTree):
+            value = fingerprint(json.dumps(config.cmds))
+        else:
+            value = fingerprint(config)
+        self._fingerprint = (config, value)
+        return value
+
+    def memoize(self, key, builder, pinned=False):
+        """Returns a parsed model of the running-config
+
+        The value returned by builder is stored under key until the
+        fingerprint of the running-config changes.  This allows API modules
+        to parse a section of the configuration once and share the result
+        across repeated get and getall calls.
+
+        Args:
+            key (hashable): The key to store the model under
+            builder (callable): Called without arguments to build the model
+                if it is not already stored
+            pinned (bool): If True, the model is stored even while memoize
+                is paused (see memoize_paused).  Use it for models shared by
+                all resources of a collection
+
+        Returns:
+            The stored (or newly built) model
+        """
+        token = self.config_fingerprint
+        models = self._models
+        if models[0] != token:
+            models = (token, dict())
+            self._models = models
+        try:
+            return models[1][key]
+        except KeyError:
+            pass
+        value = builder()
+        if pinned or not getattr(self._local, 'memoize_paused', False):
+            models[1][key] = value
+        return value
+
+    @contextmanager
+    def memoize_paused(self):
+        """Stops memoize from storing new models in the current thread
+
+        Models that are already stored are still returned.  This is used
+        when streaming large collections so their parsed resources are not
+        kept in memory.
+        """
+        paused = getattr(self._local, 'memoize_paused', False)
+        self._local.memoize_paused = True
+        try:
+            yield
+        finally:
+            self._local.memoize_paused = paused
+
+    def _get_probe_command(self):
+        """Returns the probe command supported by the node
+
+        The candidate commands are tried in order the first time this method
+        is called and the result is remembered for the life of the instance.
+
+        Returns:
+            The probe command as a string or None if probing is disabled or
+                none of the candidate commands is supported by the node
+        """
+        return self._detect_probe()[0]
+
+    def _detect_probe(self):
+        """Returns the probe command and the token read while detecting it
+
+        The output of the supported candidate command is the current probe
+        token, so the caller does not need to send the probe again when
+        the command was detected by this call.
+
+        Returns:
+            A (command, token) tuple.  The command is None if probing is
+                disabled or not supported by the node.  The token is None
+                unless the candidate commands were tried by this call
+        """
+        if not self.config_probe or self.config_format == 'json':
+            return None, None
+        if self._probe_command is not None:
+            return self._probe_command or None, None
+        candidates = CONFIG_PROBES
+        if isinstance(self.config_probe, str) and \
+                self.config_probe.lower() not in ['true', 'yes', 'on']:
+            candidates = [self.config_probe]
+        self._probe_command = ''
+        for command in candidates:
+            try:
+                result = self.run_commands(command, 'text')
+            except CommandError:
+                continue
+            self._probe_command = command
+            return command, str(result[0]['output']).strip()
+        return None, None
+
+    def _probe_config(self):
+        """Checks if the cached running-config is still current
+
+        Returns:
+            True if the probe token returned by the node matches the token
+                stored with the cached running-config, otherwise False
+        """
+        probe, token = self._detect_probe()
+        if not probe or self._config_token is None:
+            # keep the token read by the detection for the download
+            self._probe_token = token
+            return False
+        token = token or self._run_probe(probe)
+        if token == self._config_token:
+            self._probe_stats['hits'] += 1
+            return True
+        self._probe_stats['misses'] += 1
+        self._probe_token = token
+        return False
+
+    def _run_probe(self, probe):
+        result = self.run_commands(probe, 'text')
+        return str(result[0]['output']).strip()
+
     @property
     def startup_config(self):
-        if self._startup_config is not None:
+        config = self._startup_config
+        if config is not None:
+            return config
+        with self._lock:
+            if self._startup_config is None:
+                self._startup_config = self.get_config('startup-config',
+                                                       as_string=True)
             return self._startup_config
-        self._startup_config = self.get_config('startup-config',
-                                               as_string=True)
-        return self._startup_config
 
     @property
     def version(self):
         if self._version:
             return self._version
-        self._get_version_properties()
+        self._load_version_properties()
         return self._version
 
     @property
     def version_number(self):
         if self._version_number:
             return self._version_number
-        self._get_version_properties()
+        self._load_version_properties()
         return self._version_number
 
     @property
     def model(self):
         if self._model:
             return self._model
-        self._get_version_properties()
+        self._load_version_properties()
         return self._model
 
+    def _load_version_properties(self):
+        with self._lock:
+            if not (self._version and self._version_number and self._model):
+                self._get_version_properties()
+
+    @property
+    def _session_name(self):
+        # config sessions are tracked per thread
+        return getattr(self._local, 'session_name', None)
+
+    @_session_name.setter
+    def _session_name(self, value):
+        self._local.session_name = value
+
+    @property
+    def _transaction(self):
+        # transactions are tracked per thread
+        return getattr(self._local, 'transaction', None)
+
+    @_transaction.setter
+    def _transaction(self, value):
+        self._local.transaction = value
+
     def _get_version_properties(self):
         """Parses version and model information out of 'show version' output
         and uses the output to populate class properties.
         """
-        # Parse out version info
         output = self.enable('show version')
-        self._version = str(output[0]['result']['version'])
-        match = re.match(r'[\d.\d]+', str(output[0]['result']['version']))
+        self._set_version_properties(output[0]['result'])
+
+    def _set_version_properties(self, result):
+        """Populates the version and model properties from the json
+        result of 'show version'
+        """
+        # Parse out version info
+        self._version = str(result['version'])
+        match = re.match(r'[\d.\d]+', str(result['version']))
         if match:
             self._version_number = str(match.group(0))
         else:
-            self._version_number = str(output[0]['result']['version'])
+            self._version_number = str(result['version'])
         # Parse out model number
-        match = re.search(r'\d\d\d\d', str(output[0]['result']['modelName']))
+        match = re.search(r'\d\d\d\d', str(result['modelName']))
         if match:
             self._model = str(match.group(0))
         else:
-            self._model = str(output[0]['result']['modelName'])
+            self._model = str(result['modelName'])
+
+    def prefetch(self, *items):
+        """Retrieves several lazily loaded properties at once
+
+        This method bundles the commands for the requested properties into
+        a single eAPI request per encoding and populates the properties from
+        the response.  Since eAPI applies a single encoding per request,
+        'version' (json) and the text configs are retrieved with two
+        requests; a json config_format allows a single request.
+
+        Args:
+            *items (str): The properties to retrieve.  Valid values are
+                'version', 'running_config' and 'startup_config'.  If no
+                items are specified, all properties are retrieved.  The
+                version, version_number and model properties are populated
+                by 'version'
+
+        Raises:
+            TypeError: If an invalid item is specified
+        """
+        items = items or PREFETCH_ITEMS
+        invalid = set(items) - set(PREFETCH_ITEMS)
+        if invalid:
+            raise TypeError('invalid prefetch item(s) specified: %s'
+                            % ', '.join(sorted(invalid)))
+
+        with self._lock:
+            self._prefetch(items)
+
+    def _prefetch(self, items):
+        params = ' all' if self.config_defaults else ''
+        requests = dict(json=list(), text=list())
+        if 'version' in items:
+            requests['json'].append(('version', 'show version'))
+        if 'running_config' in items:
+            if self.config_format == 'json':
+                requests['json'].append(('running_config_tree',
+                                         'show running-config%s' % params))
+            else:
+                probe = self._get_probe_command()
+                if probe:
+                    requests['text'].append(('probe', probe))
+                requests['text'].append(('running_config',
+                                         'show running-config%s' % params))
+        if 'startup_config' in items:
+            requests['text'].append(('startup_config', 'show startup-config'))
+
+        for encoding, request in requests.items():
+            if not request:
+                continue
+            names, commands = zip(*request)
+            response = self.run_commands(list(commands), encoding)
+            for name, result in zip(names, response):
+                if name == 'version':
+                    self._set_version_properties(result)
+                elif name == 'running_config_tree':
+                    self._running_config_tree = \
+                        ConfigTree.from_response(result)
+                elif name == 'probe':
+                    self._config_token = str(result['output']).strip()
+                elif name == 'running_config':
+                    self._running_config = str(result['output']).strip()
+                    self._config_stale = False
+                elif name == 'startup_config':
+                    self._startup_config = str(result['output']).strip()
+
+        if self._config_cache is not None and 'running_config' in items \
+                and self._config_token is not None:
+            self._config_cache.store(self._cache_name, self._config_token,
+                                     self._running_config,
+                                     self._chunkify(self._running_config),
+                                     params=params.strip() or None)
 
     def enable_authentication(self, password):
         """Configures the enable mode authentication password
@@ -602,7 +1248,7 @@ class Node(object):
                 CliVariants type, it will be cast to a list.
                 The list of commands will also be prepended with the necessary
                 commands to put the session in config mode.
-                CliVariants could be part of a list too, however only a single
+                CliVariants could be part of a list too, more than one
                 occurrence of CliVariants type in commands is supported.
                 CliVariants type facilitates execution of alternative commands
                 sequences, e.g.:
@@ -615,6 +1261,11 @@ class Node(object):
                 rest of commands and all command sequences will be tried until
                 one variant succeeds. If all variants fail the last failure
                 exception will be re-raised.
+                The variant that succeeds is remembered in variants_cache
+                for the EOS version of the node and tried first next time.
+                If all variants fail, the variants attribute of the
+                re-raised exception holds the index of the variant tried
+                last for every CliVariants in commands.
 
             **kwargs: Additional keyword arguments for expanded eAPI
                 functionality. Only supported eAPI params are used in building
@@ -625,30 +1276,40 @@ class Node(object):
                 output from each command.  The function will strip the
                 response from any commands it prepends.
         """
-        def variant_cli_idx( cmds ):
-            # return index of first occurrence of CliVariants type in cmds
-            try:
-                return [ type(v) for v in cmds ].index( CliVariants )
-            except (ValueError):
-                return -1
+        if self._transaction is not None:
+            return self._transaction.add(commands)
 
         cfg_call = self._configure_session if self._session_name \
             else self._configure_terminal
 
         if isinstance( commands, CliVariants ):
             commands = [ commands ]
-        idx = variant_cli_idx( commands )
-        if idx == -1:
+        variants = [ v for v in commands if isinstance( v, CliVariants ) ]
+        if not variants:
             return cfg_call( commands, **kwargs )
 
-        # commands contain CliVariants obj, e.g.: [ '...', CliVariants, ... ]
+        # commands contain CliVariants objs, e.g.: [ '...', CliVariants, ... ]
+        # every combination of variants is tried, the cached ones first
         err = None
-        for variant in commands[ idx ].variants:
-            cmd = commands[ :idx ] + variant + commands[ idx + 1: ]
+        version = self.version_number
+        orders = [ self.variants_cache.order( version, v ) for v in variants ]
+        for choice in product( *orders ):
+            selected = iter( choice )
+            cmd = list()
+            for command in commands:
+                if isinstance( command, CliVariants ):
+                    cmd.extend( command.variants[ next( selected ) ] )
+                else:
+                    cmd.append( command )
             try:
-                return cfg_call( cmd, **kwargs )
+                response = cfg_call( cmd, **kwargs )
             except (CommandError) as exp:
+                exp.variants = choice
                 err = exp
+                continue
+            for cli, vidx in zip( variants, choice ):
+                self.variants_cache.set( version, cli, vidx )
+            return response
         raise err  # re-raising last occurred CommandError
 
 
@@ -661,12 +1322,13 @@ class Node(object):
 
         # push the configure command onto the command stack
         commands.insert(0, 'configure terminal')
-        response = self.run_commands(commands, **kwargs)
-        # after config change the _chunkify lru_cache has to be cleared
-        self._chunkify.cache_clear()
+        with self._lock:
+            response = self.run_commands(commands, **kwargs)
+            # after config change the _chunkify lru_cache has to be cleared
+            self._chunkify.cache_clear()
 
-        if self.autorefresh:
-            self.refresh()
+            if self.autorefresh:
+                self.refresh(force=True)
 
         # pop the configure command output off the stack
         response.pop(0)
@@ -685,9 +1347,10 @@ class Node(object):
 
         # push the configure command onto the command stack
         commands.insert(0, 'configure session %s' % self._session_name)
-        response = self.run_commands(commands, **kwargs)
-        # after config change the _chunkify lru_cache has to be cleared
-        self._chunkify.cache_clear()
+        with self._lock:
+            response = self.run_commands(commands, **kwargs)
+            # after config change the _chunkify lru_cache has to be cleared
+            self._chunkify.cache_clear()
 
         # pop the configure command output off the stack
         response.pop(0)
@@ -765,10 +1428,34 @@ class Node(object):
 
         Returns:
             The configuration section as a string object.
+
+        Raises:
+            TypeError: If no section matches the regular expression
         """
+        if config == 'running_config' and self.config_format == 'json':
+            tree = self.running_config_tree.section(regex)
+            if tree is None:
+                raise TypeError('config section not found')
+            return tree.text()
+
         if config in ['running_config', 'startup_config']:
             config = getattr(self, config)
-        chunked = self._chunkify(config)
+        seed = self._sections_seed
+        if seed is not None and seed[0] is config:
+            chunked = seed[1]
+        else:
+            chunked = self._chunkify(config)
+
+        # an anchored literal expression (the form used by get_block) is
+        # resolved with a direct lookup instead of scanning all keys
+        match = SECTION_LITERAL_RE.match(regex)
+        if match:
+            key = match.group(1).replace('\\.', '.')
+            if key in chunked:
+                return chunked[key]
+            if '.' not in key:
+                raise TypeError('config section not found')
+
         r = re.compile(regex)
         matching_keys = [k for k in chunked.keys() if r.search(k)]
         if len(matching_keys) == 0:
@@ -896,7 +1583,9 @@ class Node(object):
             else:
                 commands.insert(0, 'enable')
 
-        response = self._connection.execute(commands, encoding, **kwargs)
+        # the underlying transport does not support concurrent requests
+        with self._lock:
+            response = self._connection.execute(commands, encoding, **kwargs)
 
         # pop enable command from the response only if we sent enable
         if send_enable:
@@ -904,7 +1593,7 @@ class Node(object):
 
         return response['result']
 
-    def api(self, name, namespace='pyeapi.api'):
+    def api(self, name, namespace='pyeapi.api', cache=True):
         """Loads the specified api module
 
         This method is the API autoload mechanism that will load the API
@@ -913,22 +1602,59 @@ class Node(object):
         instance() function.  In both cases, the node object is passed to
         the module.
 
+        The loaded API instance is cached per namespace and name so
+        repeated calls return the same object, along with any state it
+        holds.  Cached instances are notified through their invalidate
+        method whenever the node is refreshed.  Use clear_api to discard
+        cached instances.
+
         Args:
             name (str): The name of the module to load.  The name should be
                 the name of the python file to import
             namespace (str): The namespace to use to load the module.  The
                 default value is 'pyeapi.api'
+            cache (bool): If False, a new instance is always created and the
+                cache is bypassed.  The default value is True
 
         Returns:
             The API module loaded with the node instance.
         """
+        key = (namespace, name)
+        if cache and key in self._apis:
+            return self._apis[key]
         module = load_module('{}.{}'.format(namespace, name))
         if hasattr(module, 'initialize'):
             module.initialize(self)
         if hasattr(module, 'instance'):
-            return module.instance(self)
+            module = module.instance(self)
+        if cache:
+            with self._lock:
+                module = self._apis.setdefault(key, module)
         return module
 
+    def clear_api(self, name=None, namespace='pyeapi.api'):
+        """Discards cached API instances
+
+        Args:
+            name (str): The name of the API module to discard.  If not
+                specified, all cached API instances are discarded
+            namespace (str): The namespace of the API module to discard.
+                The default value is 'pyeapi.api'
+        """
+        with self._lock:
+            if name is None:
+                self._apis.clear()
+            else:
+                self._apis.pop((namespace, name), None)
+
+    def _invalidate_apis(self):
+        for api in list(self._apis.values()):
+            # look the hook up on the type since some API classes proxy
+            # unknown attributes as interface methods
+            invalidate = getattr(type(api), 'invalidate', None)
+            if callable(invalidate):
+                invalidate(api)
+
     def get_config(self, config='running-config', params=None,
                    as_string=False):
         """ Retreives the config from the node
@@ -968,7 +1694,7 @@ class Node(object):
 
         return str(result[0]['output']).split('\n')
 
-    def refresh(self):
+    def refresh(self, force=False):
         """Refreshes the instance config properties
 
         This method will refresh the public running_config and startup_config
@@ -976,9 +1702,64 @@ class Node(object):
         clear the current internal instance variables.  One the next call the
         instance variables will be repopulated with the current config
 
+        If config_probe is enabled, the cached running-config is kept and
+        validated with the probe command on its next access instead.  It is
+        only downloaded again if the probe reports a change.
+
+        Args:
+            force (bool): If True, the cached running-config is discarded
+                even if config_probe is enabled
+
         """
-        self._running_config = None
-        self._startup_config = None
+        with self._lock:
+            if force or not self.config_probe or self._config_token is None:
+                self._running_config = None
+                self._config_token = None
+                self._config_stale = False
+                self._sections_seed = None
+            else:
+                self._config_stale = True
+            self._running_config_tree = None
+            self._startup_config = None
+            self._invalidate_apis()
+
+    @contextmanager
+    def transaction(self, session=False):
+        """Batches configuration commands into a single request
+
+        While the context is active, commands passed to config (including
+        the commands of all API setters) are buffered in a Transaction and
+        the setters return True.  When the context exits without an
+        exception the buffered commands are sent with a single request and
+        the result of each setter is available in Transaction.results.  If
+        the context exits with an exception, nothing is sent.  Nested
+        transactions join the outermost transaction.
+
+        Example:
+
+            >>> with node.transaction() as txn:
+            ...     node.api('interfaces').set_description('Ethernet1', 'a')
+            ...     node.api('vlans').set_name(10, 'web')
+            >>> txn.results
+            [True, True]
+
+        Args:
+            session (bool): If True the commands are sent in a config
+                session that is committed in the same request
+
+        Yields:
+            The Transaction instance
+        """
+        if self._transaction is not None:
+            yield self._transaction
+            return
+        txn = Transaction(self, session=session)
+        self._transaction = txn
+        try:
+            yield txn
+        finally:
+            self._transaction = None
+        txn.commit()
 
     def configure_session(self):
         """Enter a config session
@@ -1005,11 +1786,103 @@ class Node(object):
         """
         return self._configure_session(['abort'])
 
+    def apply_session(self, commands, action='commit', timer=None,
+                      confirm=None):
+        """Stages, reviews and commits a config session in one request
+
+        This method sends the configure session command, the staged
+        commands, "show session-config diffs" and the commit (or abort)
+        command in a single eAPI request with text encoding.  If a confirm
+        callback is specified the diff is passed to the callback before the
+        session is committed, which requires a second request.
+
+        If any command fails the session is aborted and the CommandError is
+        re-raised.
+
+        Args:
+            commands (list): The config commands to stage in the session
+            action (str): Either 'commit' to commit the session, 'abort' to
+                discard it (for instance to review the diff only) or None to
+                leave the session pending.  The default is 'commit'
+            timer (int, str): Commits the session with a commit timer.  The
+                timer is either a number of seconds or a string in the form
+                hh:mm:ss.  The session is rolled back unless it is confirmed
+                with confirm_session before the timer expires
+            confirm (callable): A callback that is passed the diff and
+                returns True if the session should be committed
+
+        Returns:
+            A dict object with the session name, the diff, the response of
+                the staged commands and the committed and aborted flags
+        """
+        if action not in ['commit', 'abort', None]:
+            raise TypeError('invalid session action specified')
+        session = str(uuid4())
+        commands = list(make_iterable(commands))
+        if action == 'commit' and timer is not None:
+            if not isinstance(timer, str):
+                timer = '%02d:%02d:%02d' % (timer // 3600,
+                                            timer % 3600 // 60, timer % 60)
+            final = 'commit timer %s' % timer
+        else:
+            final = action
+
+        request = ['configure session %s' % session] + commands + \
+            ['show session-config diffs']
+        if final and confirm is None:
+            request.append(final)
+        try:
+            response = self.run_commands(request, 'text')
+        except CommandError:
+            self._abort_session(session)
+            raise
+
+        result = dict(session=session, committed=False, aborted=False,
+                      diff=response[len(commands) + 1]['output'],
+                      response=response[1:len(commands) + 1])
+        if final and confirm is not None:
+            if not confirm(result['diff']):
+                final = 'abort'
+            try:
+                self.run_commands(['configure session %s' % session, final],
+                                  'text')
+            except CommandError:
+                self._abort_session(session)
+                raise
+
+        if final == 'abort':
+            result['aborted'] = True
+        elif final:
+            result['committed'] = True
+            if self.autorefresh:
+                self.refresh(force=True)
+        return result
+
+    def confirm_session(self, session):
+        """Confirms a session committed with a commit timer
+
+        Args:
+            session (str): The name of the session returned by
+                apply_session
+        """
+        response = self.run_commands(['configure session %s' % session,
+                                      'commit'], 'text')
+        if self.autorefresh:
+            self.refresh(force=True)
+        return response[1:]
+
+    def _abort_session(self, session):
+        try:
+            self.run_commands(['configure session %s' % session, 'abort'],
+                              'text')
+        except CommandError:
+            pass
+
     def _configure_and_exit_session(self, commands, **kwargs):
         response = self._configure_session(commands, **kwargs)
 
         if self.autorefresh:
-            self.refresh()
+            self.refresh(force=True)
 
         # Exit the current config session
         self._session_name = None
@@ -1043,5 +1916,7 @@ def connect_to(name):
     if not kwargs:
         raise AttributeError('connection profile not found in config')
 
+    kwargs.setdefault('name', name)
+
     node = connect(return_node=True, **kwargs)
     return node
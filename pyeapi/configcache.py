@@ -0,0 +1,180 @@
+#
+# Copyright (c) 2014, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+"""Persistent running-config cache for Node instances
+
+This module provides an optional on-disk cache for the running-config of
+EOS nodes.  Each cache entry holds the compressed running-config text
+along with the pre-built section index for a single connection and is
+keyed by the probe token returned by the node (see
+pyeapi.client.CONFIG_PROBES).  A cold Node can validate a cache entry with
+a single probe command and answer section lookups without downloading the
+full running-config.
+
+Each cache file is made up of a single line JSON header followed by a
+zlib compressed JSON payload.  The header is read and validated first and
+the payload is only read and decompressed for a matching entry.
+
+Example:
+
+    >>> node = pyeapi.connect(host='veos01', return_node=True,
+    ...                       config_probe=True,
+    ...                       config_cache='/var/tmp/pyeapi')
+    >>> node.section('^interface Ethernet1$')
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import zlib
+
+CACHE_VERSION = 1
+
+
+def fingerprint(config):
+    """Returns the fingerprint of a config string
+
+    Args:
+        config (str): The configuration text to fingerprint
+
+    Returns:
+        The hex encoded sha256 digest of the configuration text
+    """
+    return hashlib.sha256(config.encode()).hexdigest()
+
+
+class ConfigCache(object):
+    """Stores running-config snapshots on disk
+
+    Attributes:
+        path (str): The directory used to store the cache files
+
+    Args:
+        path (str): The directory used to store the cache files.  The
+            directory is created if it does not exist
+    """
+
+    def __init__(self, path):
+        self.path = os.path.expanduser(path)
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+
+    def _prefix(self, name):
+        return re.sub(r'[^\w.-]', '_', str(name)) + '@'
+
+    def filename(self, name, token, params=None):
+        """Returns the cache filename for a connection and probe token
+
+        Args:
+            name (str): The connection name the config belongs to
+            token (str): The probe token returned by the node
+            params (str): The params used to retrieve the running-config
+
+        Returns:
+            The full path to the cache file
+        """
+        key = hashlib.sha256(('%s\n%s' % (params, token)).encode())
+        return os.path.join(self.path, '%s%s.cache' % (self._prefix(name),
+                                                      key.hexdigest()[:32]))
+
+    def load(self, name, token, params=None):
+        """Loads a cached running-config
+
+        Args:
+            name (str): The connection name the config belongs to
+            token (str): The probe token returned by the node
+            params (str): The params used to retrieve the running-config
+
+        Returns:
+            A tuple of the config text and its section index, or None if
+                the cache does not hold a valid entry for the token
+        """
+        filename = self.filename(name, token, params)
+        try:
+            with open(filename, 'rb') as fh:
+                header = json.loads(fh.readline().decode())
+                if header.get('version') != CACHE_VERSION or \
+                        header.get('token') != token:
+                    return None
+                payload = json.loads(zlib.decompress(fh.read()).decode())
+            config = payload['config']
+            sections = payload['sections']
+            if fingerprint(config) != header.get('fingerprint'):
+                return None
+        except (OSError, ValueError, KeyError, TypeError, AttributeError,
+                zlib.error):
+            return None
+        return config, sections
+
+    def store(self, name, token, config, sections, params=None):
+        """Writes a running-config entry to the cache
+
+        Older entries for the same connection name are removed.
+
+        Args:
+            name (str): The connection name the config belongs to
+            token (str): The probe token returned by the node
+            config (str): The running-config text
+            sections (dict): The section index of the running-config
+            params (str): The params used to retrieve the running-config
+
+        Returns:
+            The full path to the written cache file
+        """
+        filename = self.filename(name, token, params)
+        header = dict(version=CACHE_VERSION, token=token, params=params,
+                      fingerprint=fingerprint(config))
+        payload = json.dumps(dict(config=config, sections=sections))
+        fd, tmpname = tempfile.mkstemp(dir=self.path)
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(json.dumps(header).encode() + b'\n')
+            fh.write(zlib.compress(payload.encode()))
+        os.replace(tmpname, filename)
+        self.purge(name, keep=filename)
+        return filename
+
+    def purge(self, name, keep=None):
+        """Removes the cache files of a connection
+
+        Args:
+            name (str): The connection name to remove the files for
+            keep (str): The full path of a file that should not be removed
+        """
+        prefix = self._prefix(name)
+        for entry in os.listdir(self.path):
+            filename = os.path.join(self.path, entry)
+            if entry.startswith(prefix) and filename != keep and \
+                    re.match(r'^[0-9a-f]{32}\.cache$', entry[len(prefix):]):
+                try:
+                    os.remove(filename)
+                except OSError:
+                    pass
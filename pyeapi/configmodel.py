@@ -0,0 +1,145 @@
+#
+# Copyright (c) 2014, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+"""Normalized config section model shared by the API modules
+
+Several API modules read the same sections of the running-config (an
+interface block is read by interfaces, switchports, ipinterfaces, stp,
+vrrp, mlag and varp).  This module provides the Section class that splits
+a section into its command lines once and indexes them by keyword, so the
+modules look the commands up instead of scanning the section text with
+their own regular expressions.
+
+The sections are built by BaseEntity.get_section_models from either the
+text or the structured (json) running-config and are memoized on the node
+per running-config fingerprint.
+"""
+from pyeapi.configtree import INDENT
+
+
+class Section(object):
+    """A config section split into its command lines
+
+    The command lines are indexed by their first word.  A command is
+    looked up by its prefix, the words that precede its value, for
+    instance 'switchport access vlan'.  The in operator tests for a
+    complete command line, for instance 'no switchport' in section.
+
+    Attributes:
+        key (str): The config line that starts the section
+        lines (list): The config lines of the section body in config order
+            without the indentation of the section level.  Nested lines
+            keep their additional indentation
+
+    Args:
+        key (str): The config line that starts the section
+        lines (list): The config lines of the section body
+    """
+
+    def __init__(self, key, lines):
+        self.key = key
+        self.lines = lines
+        index = dict()
+        for line in lines:
+            index.setdefault(line.split(' ', 1)[0], []).append(line)
+        self._index = index
+
+    @classmethod
+    def from_text(cls, text):
+        """Builds a Section from the text of a top level section
+
+        Args:
+            text (str): The section text as returned by Node.section
+
+        Returns:
+            A Section instance
+        """
+        lines = text.splitlines()
+        return cls(lines[0], [line[INDENT:] for line in lines[1:]])
+
+    @classmethod
+    def from_tree(cls, tree):
+        """Builds a Section from a top level ConfigTree section
+
+        Args:
+            tree (ConfigTree): The section of the structured running-config
+
+        Returns:
+            A Section instance
+        """
+        return cls(tree.key, [line[INDENT:] for line in tree.lines()[1:]])
+
+    def __repr__(self):
+        return 'Section(key=%r)' % self.key
+
+    def __contains__(self, line):
+        return line in self._index.get(line.split(' ', 1)[0], ())
+
+    def commands(self, prefix):
+        """Yields the lines that start with a command prefix
+
+        Args:
+            prefix (str): The leading words of the command
+
+        Returns:
+            An iterator of the matching lines in config order
+        """
+        head = prefix + ' '
+        for line in self._index.get(prefix.split(' ', 1)[0], ()):
+            if line == prefix or line.startswith(head):
+                yield line
+
+    def getall(self, prefix):
+        """Returns the values of all lines that start with a command prefix
+
+        Args:
+            prefix (str): The leading words of the command
+
+        Returns:
+            list: The remainders of the matching lines in config order.  The
+                value of a line without a value is an empty string
+        """
+        return [line[len(prefix) + 1:] for line in self.commands(prefix)]
+
+    def get(self, prefix, default=None):
+        """Returns the value of the first line that starts with a prefix
+
+        Args:
+            prefix (str): The leading words of the command
+            default: The value returned if no line matches
+
+        Returns:
+            str: The remainder of the matching line, an empty string if the
+                line has no value, or default if no line matches
+        """
+        for line in self.commands(prefix):
+            return line[len(prefix) + 1:]
+        return default
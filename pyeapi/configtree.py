@@ -0,0 +1,213 @@
+#
+# Copyright (c) 2014, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+"""Structured running-config tree
+
+EOS can return the running-config as a structured JSON command tree when
+``show running-config`` is sent with json encoding.  Each command in the
+tree maps either to None (a command without a body) or to a dict holding
+the nested ``cmds`` and ``comments`` of the command::
+
+    {"cmds": {"hostname veos01": null,
+              "interface Ethernet1": {"cmds": {"description foo": null},
+                                      "comments": []}},
+     "header": ["! device: veos01 (vEOS, EOS-4.26.0F)"]}
+
+This module provides the ConfigTree class that wraps the command tree and
+answers section lookups without parsing the config text.
+"""
+import re
+
+# Number of spaces EOS uses to indent each nested config level
+INDENT = 3
+
+_REGEX_CHARS = re.compile(r'[\\^$.|?*+()\[\]{}]')
+
+
+class ConfigTree(object):
+    """Represents a (sub)section of the structured running-config
+
+    Attributes:
+        key (str): The config line that starts the section.  The key is
+            None for the root of the tree
+        depth (int): The nesting level of the section.  Top level sections
+            have a depth of 0
+        cmds (dict): The nested commands of the section
+        comments (list): The comments of the section
+
+    Args:
+        cmds (dict): The nested commands of the section as returned by eAPI
+        key (str): The config line that starts the section
+        depth (int): The nesting level of the section
+        comments (list): The comments of the section
+    """
+
+    def __init__(self, cmds=None, key=None, depth=-1, comments=None):
+        self.cmds = cmds or {}
+        self.key = key
+        self.depth = depth
+        self.comments = comments or []
+
+    @classmethod
+    def from_response(cls, response):
+        """Builds a ConfigTree from a show running-config json response
+
+        Args:
+            response (dict): The json result of show running-config
+
+        Returns:
+            The root ConfigTree instance
+        """
+        return cls(response.get('cmds'), comments=response.get('comments'))
+
+    def __repr__(self):
+        return 'ConfigTree(key=%r, depth=%d)' % (self.key, self.depth)
+
+    def __contains__(self, key):
+        return key in self.cmds
+
+    def __iter__(self):
+        return iter(self.children())
+
+    def __len__(self):
+        return len(self.cmds)
+
+    def _child(self, key, value):
+        if value is None:
+            return ConfigTree(key=key, depth=self.depth + 1)
+        return ConfigTree(value.get('cmds'), key, self.depth + 1,
+                          value.get('comments'))
+
+    def child(self, key):
+        """Returns the direct child section with the specified key
+
+        Args:
+            key (str): The config line of the child section
+
+        Returns:
+            A ConfigTree instance or None if the key is not found
+        """
+        if key not in self.cmds:
+            return None
+        return self._child(key, self.cmds[key])
+
+    def children(self):
+        """Returns the direct child sections in config order
+
+        Returns:
+            A list of ConfigTree instances
+        """
+        return [self._child(key, value) for key, value in self.cmds.items()]
+
+    def commands(self):
+        """Returns the config lines of the direct child sections
+
+        Returns:
+            A list of config lines without indentation
+        """
+        return list(self.cmds)
+
+    def section(self, regex):
+        """Returns the first section whose line matches the regex
+
+        Section lines are matched with their indentation, exactly as in the
+        text running-config, so an expression anchored with ^ only matches
+        top level sections.  The tree is searched one level at a time
+        starting with the top level.  A literal expression of the form
+        ^line$ for a top level line is resolved with a direct key lookup.
+
+        Args:
+            regex (str): A valid regular expression used to select the
+                section
+
+        Returns:
+            A ConfigTree instance or None if no section matches
+        """
+        literal = regex[1:-1] if regex.startswith('^') and \
+            regex.endswith('$') else None
+        if self.key is None and literal and not literal.startswith(' ') \
+                and not _REGEX_CHARS.search(literal):
+            return self.child(literal)
+
+        r = re.compile(regex)
+        level = [self]
+        while level:
+            following = list()
+            for node in level:
+                prefix = ' ' * (INDENT * (node.depth + 1))
+                for key, value in node.cmds.items():
+                    if r.search(prefix + key):
+                        return node._child(key, value)
+                    if value:
+                        following.append(node._child(key, value))
+            level = following
+        return None
+
+    def lines(self):
+        """Returns the section as a list of indented config lines
+
+        Returns:
+            A list of config lines including the nested sections
+        """
+        lines = list()
+        if self.key is not None:
+            lines.append(' ' * (INDENT * self.depth) + self.key)
+        prefix = ' ' * (INDENT * (self.depth + 1))
+        for comment in self.comments:
+            lines.append('%s!! %s' % (prefix, comment))
+        stack = [(self.depth + 1, iter(self.cmds.items()))]
+        while stack:
+            depth, items = stack[-1]
+            item = next(items, None)
+            if item is None:
+                stack.pop()
+                continue
+            key, value = item
+            prefix = ' ' * (INDENT * depth)
+            lines.append(prefix + key)
+            if value:
+                for comment in value.get('comments') or []:
+                    lines.append('%s%s!! %s' % (prefix, ' ' * INDENT,
+                                                comment))
+                stack.append((depth + 1, iter(value.get('cmds', {}).items())))
+        return lines
+
+    def text(self):
+        """Returns the section as config text
+
+        The returned text has the same form as a section returned by
+        Node.section for the text running-config.
+
+        Returns:
+            The section as a newline terminated string
+        """
+        lines = self.lines()
+        return '\n'.join(lines) + '\n' if lines else ''
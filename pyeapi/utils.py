@@ -30,7 +30,10 @@
 # IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
 import os
+import re
 import sys
+import json
+import tempfile
 import importlib
 import inspect
 import logging
@@ -233,6 +236,213 @@ def collapse_range(arg, value_delimiter=',', range_delimiter='-'):
     return [str(x) for x in values]
 
 
+def iter_sections(config, regex):
+    """Yields the top level sections of a configuration in a single pass
+
+    The sections are delimited the same way as Node.section does, so the
+    text of each yielded section is identical to the one returned by
+    Node.section for the same section line.  Each section is yielded as
+    soon as its last line has been read.
+
+    Args:
+        config (str): The configuration text to split
+        regex (str): A regular expression used to select the sections by
+            their (unindented) first line
+
+    Returns:
+        An iterator of (section line, section text) tuples in
+            configuration order
+    """
+    search = re.compile(regex).search
+    key = lines = None
+    banner = False
+    for line in config.splitlines(True):
+        line_rs = line.rstrip()
+        if banner:
+            banner = line_rs != 'EOF'
+            continue
+        if line.startswith('banner '):
+            banner = True
+            continue
+        if line_rs[:1].isspace():
+            if lines is not None:
+                lines.append(line)
+            continue
+        if lines is not None:
+            yield key, ''.join(lines)
+        if search(line_rs):
+            key, lines = line_rs, [line]
+        else:
+            lines = None
+    if lines is not None:
+        yield key, ''.join(lines)
+
+
+def split_sections(config, regex):
+    """Splits a configuration into its top level sections in a single pass
+
+    See iter_sections.
+
+    Args:
+        config (str): The configuration text to split
+        regex (str): A regular expression used to select the sections by
+            their (unindented) first line
+
+    Returns:
+        A dict of the section text keyed by the first line of each
+            selected section, in configuration order
+    """
+    return dict(iter_sections(config, regex))
+
+
+class VlanSet(object):
+    """An immutable set of VLAN IDs backed by a 4096 bit bitmap
+
+    A VlanSet is created from the EOS VLAN range syntax (for instance
+    '1-10,20'), from 'all' or 'none', from an int or from an iterable of
+    VLAN IDs and is formatted back to the range syntax by str().  Set
+    operations are performed on the bitmap, so they do not depend on the
+    number of VLANs in the sets.
+
+    Example:
+
+        >>> current = VlanSet('1-10,20')
+        >>> desired = VlanSet('5-30')
+        >>> str(desired - current), str(current - desired)
+        ('11-19,21-30', '1-4')
+
+    Args:
+        value (str, int, iterable): The VLAN IDs of the set
+
+    Raises:
+        ValueError: If a VLAN ID is not in the range of 1 to 4094
+    """
+    __slots__ = ('_bits',)
+
+    MIN_VLAN = 1
+    MAX_VLAN = 4094
+
+    def __init__(self, value=None):
+        if isinstance(value, VlanSet):
+            self._bits = value._bits
+        elif value is None:
+            self._bits = 0
+        elif isinstance(value, int):
+            self._bits = self._range(value, value)
+        elif isinstance(value, str):
+            self._bits = self._parse(value)
+        else:
+            bits = 0
+            for vid in value:
+                vid = int(vid)
+                bits |= self._range(vid, vid)
+            self._bits = bits
+
+    @classmethod
+    def _from_bits(cls, bits):
+        obj = cls.__new__(cls)
+        obj._bits = bits
+        return obj
+
+    @classmethod
+    def _range(cls, start, end):
+        if not cls.MIN_VLAN <= start <= end <= cls.MAX_VLAN:
+            raise ValueError('invalid vlan range %s-%s' % (start, end))
+        return ((1 << (end - start + 1)) - 1) << start
+
+    @classmethod
+    def _parse(cls, value):
+        value = value.strip()
+        if value in ('', 'none'):
+            return 0
+        if value == 'all':
+            return cls._range(cls.MIN_VLAN, cls.MAX_VLAN)
+        bits = 0
+        for item in value.split(','):
+            start, _, end = item.strip().partition('-')
+            try:
+                start = int(start)
+                end = int(end) if end else start
+            except ValueError:
+                raise ValueError('invalid vlan range %r' % item)
+            bits |= cls._range(start, end)
+        return bits
+
+    def __len__(self):
+        return bin(self._bits).count('1')
+
+    def __bool__(self):
+        return self._bits != 0
+
+    def __contains__(self, vid):
+        try:
+            vid = int(vid)
+        except (TypeError, ValueError):
+            return False
+        return vid >= 0 and bool(self._bits >> vid & 1)
+
+    def __iter__(self):
+        for start, end in self.ranges():
+            for vid in range(start, end + 1):
+                yield vid
+
+    def __eq__(self, other):
+        if not isinstance(other, VlanSet):
+            return NotImplemented
+        return self._bits == other._bits
+
+    def __hash__(self):
+        return hash(self._bits)
+
+    def __le__(self, other):
+        return self._bits & ~VlanSet(other)._bits == 0
+
+    def __ge__(self, other):
+        return VlanSet(other) <= self
+
+    def __or__(self, other):
+        return self._from_bits(self._bits | VlanSet(other)._bits)
+
+    def __and__(self, other):
+        return self._from_bits(self._bits & VlanSet(other)._bits)
+
+    def __sub__(self, other):
+        return self._from_bits(self._bits & ~VlanSet(other)._bits)
+
+    def __xor__(self, other):
+        return self._from_bits(self._bits ^ VlanSet(other)._bits)
+
+    union = __or__
+    intersection = __and__
+    difference = __sub__
+    symmetric_difference = __xor__
+    issubset = __le__
+    issuperset = __ge__
+
+    def ranges(self):
+        """Yields the ranges of consecutive VLAN IDs in the set
+
+        Returns:
+            An iterator of (start, end) tuples in ascending order
+        """
+        bits = self._bits
+        while bits:
+            # the lowest set bit starts a range, the lowest set bit of the
+            # inverted remainder ends it
+            start = (bits & -bits).bit_length() - 1
+            run = ~bits >> start
+            length = (run & -run).bit_length() - 1
+            yield start, start + length - 1
+            bits &= ~(((1 << length) - 1) << start)
+
+    def __str__(self):
+        return ','.join(str(start) if start == end else '%d-%d' % (start, end)
+                        for start, end in self.ranges())
+
+    def __repr__(self):
+        return "VlanSet('%s')" % self
+
+
 class CliVariants:
     """
     Provides an interface for cli variants (typically to handle a transition
@@ -275,6 +485,126 @@ class CliVariants:
             str) and isinstance(v, Iterable) else [v] for v in cli ]
 
 
+class CliVariantsCache(object):
+    """
+    Remembers which variant of a CliVariants instance succeeded on a given
+    EOS version, so that Node.config can try that variant first instead of
+    sending the failing variants on every call.
+
+    Entries are keyed by the EOS version and the shape of the variant set,
+    i.e. the variants with the tokens that are common to all variants (for
+    instance interface names and values) masked out.  A cached variant that
+    fails is not fatal: the remaining variants are still tried and the cache
+    is updated with the one that succeeds.
+
+    A cache instance can be shared by any number of nodes and persisted to
+    a JSON file.
+
+    Args:
+        filename (str): The JSON file used to persist the cache.  If the
+            file exists, it is loaded and each new entry is written to it
+    """
+    def __init__(self, filename=None):
+        self.filename = filename
+        self._cache = dict()
+        if filename and os.path.exists(filename):
+            self.load(filename)
+
+    @staticmethod
+    def key(variants):
+        """ Returns the cache key of a CliVariants instance
+
+        Args:
+            variants (CliVariants): The variants to build the key for
+
+        Returns:
+            A string that identifies the shape of the variant set
+        """
+        split = [ [ str(cmd).split() for cmd in v ] for v in variants.variants ]
+
+        def common(i, j, token):
+            return all( len(v) > i and len(v[i]) > j and v[i][j] == token
+                for v in split )
+
+        masked = [ [ ' '.join( '*' if common(i, j, token) else token
+                               for j, token in enumerate(cmd) )
+                     for i, cmd in enumerate(v) ] for v in split ]
+        return json.dumps( masked )
+
+    def get(self, version, variants):
+        """ Returns the index of the variant known to work on version
+
+        Args:
+            version (str): The EOS version of the node
+            variants (CliVariants): The variants to look up
+
+        Returns:
+            The index of the variant or None if it isn't known
+        """
+        return self._cache.get( str(version), {} ).get( self.key(variants) )
+
+    def set(self, version, variants, index):
+        """ Stores the index of the variant that succeeded on version
+
+        Args:
+            version (str): The EOS version of the node
+            variants (CliVariants): The variants that were tried
+            index (int): The index of the variant that succeeded
+        """
+        entries = self._cache.setdefault( str(version), {} )
+        key = self.key(variants)
+        if entries.get(key) == index:
+            return
+        entries[key] = index
+        if self.filename:
+            self.save(self.filename)
+
+    def order(self, version, variants):
+        """ Returns the variant indexes in the order they should be tried
+
+        Args:
+            version (str): The EOS version of the node
+            variants (CliVariants): The variants to order
+
+        Returns:
+            A list of indexes into variants.variants
+        """
+        indexes = list( range( len(variants.variants) ) )
+        known = self.get(version, variants)
+        if known is not None and known < len(indexes):
+            indexes.remove(known)
+            indexes.insert(0, known)
+        return indexes
+
+    def clear(self):
+        self._cache.clear()
+
+    def load(self, filename):
+        """ Loads cache entries from a JSON file
+
+        Args:
+            filename (str): The file to load
+        """
+        with open(filename) as fh:
+            self._cache.update( json.load(fh) )
+
+    def save(self, filename):
+        """ Writes the cache entries to a JSON file
+
+        Args:
+            filename (str): The file to write
+        """
+        fd, tmpname = tempfile.mkstemp(
+            dir=os.path.dirname( os.path.abspath(filename) ) )
+        with os.fdopen(fd, 'w') as fh:
+            json.dump( self._cache, fh )
+        os.replace( tmpname, filename )
+
+
+# Cache shared by all Node instances unless one is specified
+CLI_VARIANTS_CACHE = CliVariantsCache()
+
+
 def _interpolate_docstr( *tkns ):
     """Docstring decorator.
     SYNOPSIS:
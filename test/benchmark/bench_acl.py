@@ -0,0 +1,87 @@
+#
+# Copyright (c) 2014, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+"""Compares the dict and compact models of large extended ACLs
+
+Builds a synthetic configuration with a single extended ACL of N entries
+and reports the time and peak memory used to parse it with
+ExtendedAcls.get and ExtendedAcls.get_compact.
+"""
+import tracemalloc
+
+from benchlib import make_node, report, timeit
+
+from pyeapi.api.acl import ExtendedAcls
+
+SIZES = [10000, 50000]
+
+
+def build(count):
+    lines = ['ip access-list big']
+    for index in range(1, count + 1):
+        lines.append('   %d permit tcp 10.%d.%d.0/24 any eq %d' % (
+            index * 10, index // 256 % 256, index % 256, index % 1024))
+    return '\n'.join(lines) + '\n!'
+
+
+def peak(func):
+    tracemalloc.start()
+    value = func()
+    size = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del value
+    return size / 1024.0 / 1024.0
+
+
+def main():
+    rows = list()
+    memory = list()
+    for count in SIZES:
+        config = build(count)
+
+        def dict_model():
+            return ExtendedAcls(make_node(config)).get('big')
+
+        def compact_model():
+            return ExtendedAcls(make_node(config)).get_compact('big')
+
+        rows.append(('get', count, timeit(dict_model)))
+        rows.append(('get_compact', count, timeit(compact_model)))
+        memory.append(('get', count, peak(dict_model)))
+        memory.append(('get_compact', count, peak(compact_model)))
+    report('extended acl parse time', rows)
+    print('extended acl peak memory')
+    for label, size, mib in memory:
+        print('  %-28s %8s %9.2fMiB' % (label, size, mib))
+
+
+if __name__ == '__main__':
+    main()
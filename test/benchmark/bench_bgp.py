@@ -0,0 +1,102 @@
+#
+# Copyright (c) 2014, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+"""Times BgpNeighbors.getall on route reflectors with thousands of neighbors
+
+Builds a synthetic router bgp block with N neighbors spread over peer
+groups and compares the neighbor index with a baseline that runs one
+regex with the neighbor name interpolated per attribute and neighbor over
+the whole block, which is how the neighbors were parsed before.
+"""
+import re
+
+from benchlib import make_node, report, timeit
+
+from pyeapi.api.bgp import BgpNeighbors
+
+SIZES = [500, 1000, 2000]
+
+ATTRIBUTES = [r'neighbor {} peer-group ([^\s]+)',
+              r'(?<=neighbor {} remote-as ).*',
+              r'no neighbor {} send-community',
+              r'(?<!no )neighbor {} shutdown',
+              r'neighbor {} description (.*)$',
+              r'no neighbor {} next-hop-self',
+              r'neighbor {} route-map ([^\s]+) in',
+              r'neighbor {} route-map ([^\s]+) out']
+
+
+def build(count):
+    lines = ['router bgp 65000', '   router-id 1.1.1.1']
+    for group in range(10):
+        lines.append('   neighbor PG%d peer-group' % group)
+        lines.append('   neighbor PG%d route-map RM-IN in' % group)
+    for index in range(count):
+        name = '10.%d.%d.1' % (index // 256, index % 256)
+        lines.append('   neighbor %s peer-group PG%d' % (name, index % 10))
+        lines.append('   neighbor %s remote-as %d' % (name, 65001 + index))
+        lines.append('   neighbor %s description peer %d' % (name, index))
+    lines.append('   !')
+    lines.append('   address-family ipv4')
+    for index in range(count):
+        lines.append('      neighbor 10.%d.%d.1 activate' % (index // 256,
+                                                           index % 256))
+    lines.append('!')
+    return '\n'.join(lines)
+
+
+def baseline(neighbors):
+    config = neighbors.get_block('^router bgp .*')
+    names = dict.fromkeys(re.findall(r'neighbor ([^\s]+)', config))
+    for name in names:
+        for pattern in ATTRIBUTES:
+            re.search(pattern.format(name), config, re.M)
+
+
+def main():
+    rows = list()
+    for count in SIZES:
+        config = build(count)
+
+        def regex_per_neighbor():
+            baseline(BgpNeighbors(make_node(config)))
+
+        def neighbor_index():
+            BgpNeighbors(make_node(config)).getall()
+
+        rows.append(('regex per neighbor', count,
+                     timeit(regex_per_neighbor, repeat=1)))
+        rows.append(('neighbor index getall', count, timeit(neighbor_index)))
+    report('bgp neighbors', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#
+# Copyright (c) 2014, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+"""Compares section lookups on the text and json running-config
+
+Builds a synthetic configuration with N interfaces and times resolving the
+block of every interface with BaseEntity.get_block using the text
+running-config (regex section scan) and the structured json running-config
+(ConfigTree lookups).
+"""
+from benchlib import make_node, report, timeit
+
+from pyeapi.api.abstract import BaseEntity
+from pyeapi.configtree import ConfigTree
+
+SIZES = [1000, 5000, 10000]
+
+
+def build(count):
+    cmds = dict()
+    for index in range(1, count + 1):
+        cmds['interface Ethernet%d' % index] = dict(cmds={
+            'description port %d' % index: None,
+            'mtu 9214': None,
+            'no switchport': None,
+            'ip address 10.%d.%d.1/24' % (index // 256, index % 256): None},
+            comments=[])
+    tree = ConfigTree(cmds)
+    return tree, tree.text().strip()
+
+
+def lookup_all(entity, count):
+    for index in range(1, count + 1):
+        entity.get_block('interface Ethernet%d' % index)
+
+
+def main():
+    rows = list()
+    for count in SIZES:
+        tree, text = build(count)
+
+        def text_path():
+            node = make_node(text)
+            lookup_all(BaseEntity(node), count)
+
+        def tree_path():
+            node = make_node(config_format='json')
+            node._running_config_tree = tree
+            lookup_all(BaseEntity(node), count)
+
+        rows.append(('text get_block', count, timeit(text_path, repeat=1)))
+        rows.append(('json get_block', count, timeit(tree_path)))
+    report('get_block for every interface', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#
+# Copyright (c) 2014, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+"""Compares Interfaces.getall with looking up every interface with get
+
+Builds a synthetic text configuration with N Ethernet interfaces and a
+Vxlan interface and times building the resources of all interfaces with
+the single pass Interfaces.getall parser and with one Interfaces.get call
+per interface.
+"""
+from benchlib import make_node, report, timeit
+
+from pyeapi.api.interfaces import Interfaces
+
+SIZES = [1000, 5000, 10000]
+
+
+def build(count):
+    lines = list()
+    for index in range(1, count + 1):
+        lines.append('interface Ethernet%d' % index)
+        lines.append('   description port %d' % index)
+        lines.append('   mtu 9214')
+        if index % 2:
+            lines.append('   no shutdown')
+        lines.append('   flowcontrol receive on')
+        lines.append('   no sflow')
+    lines.append('interface Vxlan1')
+    lines.append('   vxlan source-interface Loopback0')
+    lines.append('   vxlan udp-port 4789')
+    lines.append('   vxlan vlan 10 vni 10010')
+    return '\n'.join(lines)
+
+
+def main():
+    rows = list()
+    for count in SIZES:
+        config = build(count)
+
+        def per_interface():
+            interfaces = Interfaces(make_node(config))
+            for name in interfaces.iterkeys():
+                interfaces.get(name)
+
+        def single_pass():
+            Interfaces(make_node(config)).getall()
+
+        rows.append(('get per interface', count, timeit(per_interface)))
+        rows.append(('getall single pass', count, timeit(single_pass)))
+    report('resources of every interface', rows)
+
+
+if __name__ == '__main__':
+    main()
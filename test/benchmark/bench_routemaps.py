@@ -0,0 +1,95 @@
+#
+# Copyright (c) 2014, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+"""Times Routemaps.getall on configurations with thousands of entries
+
+Builds a synthetic configuration of route-maps with ten entries each and
+compares the single pass getall with a baseline that scans the config for
+every route-map name, looks up the block of every entry with a regular
+expression and runs one regex per attribute, which is how the route-maps
+were parsed before.
+"""
+import re
+
+from benchlib import make_node, report, timeit
+
+from pyeapi.api.routemaps import Routemaps
+
+SIZES = [1000, 5000, 10000]
+
+
+def build(entries):
+    lines = list()
+    for index in range(entries):
+        lines.append('route-map RM%d %s %d' % (
+            index // 10, 'permit' if index % 2 else 'deny',
+            (index % 10 + 1) * 10))
+        lines.append('   description entry %d' % index)
+        lines.append('   match as %d' % index)
+        lines.append('   match interface Ethernet%d' % (index % 48 + 1))
+        lines.append('   set tag %d' % index)
+        lines.append('   continue %d' % ((index % 10 + 2) * 10))
+        lines.append('!')
+    return '\n'.join(lines)
+
+
+def baseline(routemaps, name):
+    for action, seqno in re.findall(r'^route-map\s%s\s(\w+)\s(\d+)$' % name,
+                                    routemaps.config, re.M):
+        block = routemaps.get_block(r'route-map\s%s\s%s\s%s'
+                                    % (name, action, seqno))
+        re.findall(r'^\s+match\s(.+)$', block, re.M)
+        re.findall(r'^\s+set\s(.+)$', block, re.M)
+        re.search(r'^\s+continue\s(\d+)$', block, re.M)
+        re.search(r'^\s+description\s(.+)$', block, re.M)
+
+
+def main():
+    rows = list()
+    for count in SIZES:
+        config = build(count)
+
+        def regex_per_entry():
+            routemaps = Routemaps(make_node(config))
+            for name in set(routemaps.iterkeys()):
+                baseline(routemaps, name)
+
+        def single_pass():
+            Routemaps(make_node(config)).getall()
+
+        rows.append(('regex per entry', count,
+                     timeit(regex_per_entry, repeat=1)))
+        rows.append(('single pass getall', count, timeit(single_pass)))
+    report('route-map entries', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#
+# Copyright (c) 2014, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+"""Times StaticRoute.converge on configurations with thousands of routes
+
+Builds a synthetic configuration of static routes and converges the node
+to a desired set in which a tenth of the routes are retagged, a tenth are
+removed and a tenth are new.  The requests are counted instead of sent, so
+the timings cover diffing the routes and building the chunked requests.
+"""
+from unittest.mock import Mock
+
+from benchlib import make_node, report, timeit
+
+from pyeapi.api.staticroute import StaticRoute
+
+SIZES = [1000, 5000, 20000]
+
+
+def route(index):
+    octets = (index // 256, index % 256)
+    return 'ip route 10.%d.%d.0/24 Null0 1 tag 10' % octets
+
+
+def build(count):
+    config = '\n'.join(route(index) for index in range(count))
+    desired = StaticRoute(make_node(config)).getall()
+    for index, ip_dest in enumerate(sorted(desired)):
+        if index % 10 == 0:
+            desired[ip_dest]['Null0'][None][1]['tag'] = 20
+        elif index % 10 == 1:
+            del desired[ip_dest]
+    for index in range(count, count + count // 10):
+        desired['11.%d.%d.0/24' % (index // 256 % 256, index % 256)] = \
+            {'Null0': {None: {1: {'tag': 10}}}}
+    return config, desired
+
+
+def main():
+    rows = list()
+    for count in SIZES:
+        config, desired = build(count)
+
+        def converge():
+            node = make_node(config)
+            node.config = Mock(return_value=[])
+            StaticRoute(node).converge(desired)
+
+        rows.append(('converge', count, timeit(converge)))
+    report('static routes', rows)
+
+
+if __name__ == '__main__':
+    main()
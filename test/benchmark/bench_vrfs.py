@@ -0,0 +1,97 @@
+#
+# Copyright (c) 2014, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+"""Times Vrfs.getall on PE routers with hundreds of VRFs
+
+Builds a synthetic configuration with N VRFs, each with a routed
+interface, and compares the single pass VRF model with a baseline that
+looks up the vrf section and both routing lines of every VRF with
+get_block, which is how the VRFs were parsed before.
+"""
+import re
+
+from benchlib import make_node, report, timeit
+
+from pyeapi.api.vrfs import Vrfs
+
+SIZES = [250, 500, 1000]
+
+
+def build(count):
+    lines = list()
+    for index in range(count):
+        lines.extend(['vrf instance VRF%d' % index,
+                      '   rd 65000:%d' % index,
+                      '   description customer %d' % index, '!'])
+    for index in range(count):
+        lines.extend(['interface Ethernet%d' % (index + 1),
+                      '   no switchport',
+                      '   vrf VRF%d' % index,
+                      '   ip address 10.%d.%d.1/24' % (index // 256,
+                                                     index % 256), '!'])
+    for index in range(count):
+        lines.append('ip routing vrf VRF%d' % index)
+        lines.append('no ipv6 unicast-routing vrf VRF%d' % index)
+    return '\n'.join(lines)
+
+
+def baseline(vrfs):
+    names = re.findall(r'(?<=^vrf instance\s)(\w+)', vrfs.config, re.M)
+    for name in names:
+        if vrfs.version_number >= '4.23':
+            config = vrfs.get_block('vrf instance %s' % name)
+        else:
+            config = vrfs.get_block('vrf definition %s' % name)
+        re.search(r'(?:\srd\s)(?P<value>.*)$', config, re.M)
+        re.search(r'(?:description\s)(?P<value>.*)$', config, re.M)
+        vrfs.get_block('no ip routing vrf %s' % name)
+        vrfs.get_block('no ipv6 unicast-routing vrf %s' % name)
+
+
+def main():
+    rows = list()
+    for count in SIZES:
+        config = build(count)
+
+        def block_per_vrf():
+            baseline(Vrfs(make_node(config)))
+
+        def vrf_model():
+            Vrfs(make_node(config)).getall()
+
+        rows.append(('get_block per vrf', count,
+                     timeit(block_per_vrf, repeat=1)))
+        rows.append(('vrf model getall', count, timeit(vrf_model)))
+    report('vrfs getall', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#
+# Copyright (c) 2014, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+"""Times Vrrp.getall on configurations with thousands of VRRP groups
+
+Builds a synthetic configuration of Vlan interfaces with four VRRP groups
+each and compares the single pass VRRP line parser with a baseline that
+scans the interface block with one formatted regex per attribute and VRID,
+which is how the groups were parsed before.
+"""
+import re
+
+from benchlib import make_node, report, timeit
+
+from pyeapi.api.vrrp import Vrrp, VRRP_RULES
+
+SIZES = [1000, 5000, 10000]
+
+
+def build(groups):
+    lines = list()
+    for index in range(groups // 4):
+        lines.append('interface Vlan%d' % (index + 2))
+        lines.append('   ip address 10.%d.%d.2/24' % (index // 256,
+                                                      index % 256))
+        for vrid in range(1, 5):
+            lines.append('   vrrp %d priority-level %d' % (vrid, 100 + vrid))
+            lines.append('   vrrp %d advertisement interval 1' % vrid)
+            lines.append('   vrrp %d preempt delay minimum 30' % vrid)
+            lines.append('   vrrp %d ipv4 10.%d.%d.%d' % (
+                vrid, index // 256, index % 256, vrid))
+            lines.append('   vrrp %d tracked-object up decrement 20' % vrid)
+    return '\n'.join(lines)
+
+
+def baseline(vrrp, config):
+    patterns = [regex.pattern for rules in VRRP_RULES[True].values()
+                for _, regex, _ in rules]
+    for vrid in set(re.findall(r'^\s+(?:no |)vrrp (\d+)', config, re.M)):
+        for pattern in patterns:
+            re.search(r'^\s+vrrp %s %s' % (vrid, pattern), config, re.M)
+
+
+def main():
+    rows = list()
+    for count in SIZES:
+        config = build(count)
+
+        def regex_per_attribute():
+            vrrp = Vrrp(make_node(config))
+            for name in re.findall(r'^interface\s(\S+)', config, re.M):
+                baseline(vrrp, vrrp.get_block('interface %s' % name))
+
+        def single_pass():
+            Vrrp(make_node(config)).getall()
+
+        rows.append(('regex per attribute', count,
+                     timeit(regex_per_attribute)))
+        rows.append(('single pass getall', count, timeit(single_pass)))
+    report('vrrp groups', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -33,12 +33,15 @@ import sys
 import os
 import unittest
 
+from unittest.mock import Mock, patch
+
 sys.path.append(os.path.join(os.path.dirname(__file__), '../lib'))
 
 from testlib import get_fixture, function
 from testlib import EapiConfigUnitTest
 
 import pyeapi.api.acl
+import pyeapi.eapilib
 
 class TestApiAclFunctions(unittest.TestCase):
 
@@ -62,12 +65,45 @@ class TestApiAcls(EapiConfigUnitTest):
         result = pyeapi.api.acl.instance(None)
         self.assertIsInstance(result, pyeapi.api.acl.Acls)
 
+    def test_keys_do_not_parse_acls(self):
+        with patch.object(self.instance, 'get') as get, \
+                patch.object(self.instance, 'getall') as getall:
+            self.assertEqual(list(self.instance), ['test', 'exttest'])
+            self.assertIn('exttest', self.instance)
+            self.assertNotIn('standard', self.instance)
+            self.assertEqual(get.call_count + getall.call_count, 0)
+
+    def test_reconcile(self):
+        self.node.config.return_value = []
+        acls = self.node.api('acl')
+        result = acls.reconcile('test', ['permit host 1.2.3.4 log',
+                                         'permit 1.2.3.4/16 log'])
+        self.node.config.assert_called_once_with(
+            ['ip access-list standard test', 'no 30', 'no 40', 'no 50',
+             'no 60', 'exit', 'commit'])
+        self.assertTrue(result['result'])
+
+    def test_reconcile_creates_acl(self):
+        self.node.config.return_value = []
+        result = self.instance.reconcile('new', ['permit ip any any'],
+                                         type='extended')
+        self.node.config.assert_called_once_with(
+            ['ip access-list new', '10 permit ip any any', 'exit',
+             'commit'])
+        self.assertEqual(list(result['added']), ['10'])
+
     def test_getall(self):
         result = self.instance.getall()
         self.assertIsInstance(result, dict)
         self.assertIn('exttest', result['extended'])
         self.assertIn('test', result['standard'])
 
+    def test_iter_all(self):
+        result = dict(self.instance.stream())
+        expected = self.instance.getall()
+        expected = dict(expected['standard'], **expected['extended'])
+        self.assertEqual(result, expected)
+
     def test_get_not_configured(self):
         self.assertIsNone(self.instance.get('unconfigured'))
 
@@ -122,6 +158,11 @@ class TestApiAcls(EapiConfigUnitTest):
         with self.assertRaises(AttributeError):
             self.instance.nonmethod('test', '10')
 
+    def test_get_compact(self):
+        result = self.instance.get_compact('exttest')
+        self.assertIsInstance(result, pyeapi.api.acl.CompactAcl)
+        self.assertEqual(result.to_dict(), self.instance.get('exttest'))
+
 
 class TestApiStandardAcls(EapiConfigUnitTest):
 
@@ -136,9 +177,92 @@ class TestApiStandardAcls(EapiConfigUnitTest):
         self.assertEqual(sorted(keys), sorted(result.keys()))
         self.assertEqual(result['type'], 'standard')
 
+    def test_keys(self):
+        self.assertEqual(list(self.instance), ['test'])
+
     def test_get_not_configured(self):
         self.assertIsNone(self.instance.get('unconfigured'))
 
+    def test_get_compact(self):
+        result = self.instance.get_compact('test')
+        self.assertEqual(result.to_dict(), self.instance.get('test'))
+        self.assertEqual(list(result), ['10', '20', '30', '40', '50', '60'])
+        self.assertEqual(result['20'], dict(action='permit', log=True,
+                                            srcaddr='1.2.3.4', srclen=16))
+        entry = result.entry(40)
+        self.assertIsInstance(entry, pyeapi.api.acl.StandardAclEntry)
+        self.assertEqual((entry.seqno, entry.srcaddr, entry.srclen),
+                         (40, '5.6.7.0', '24'))
+        with self.assertRaises(KeyError):
+            result.entry(25)
+        self.assertNotIn('25', result)
+
+    def test_get_compact_not_configured(self):
+        self.assertIsNone(self.instance.get_compact('unconfigured'))
+
+    def test_reconcile(self):
+        self.node.config.return_value = []
+        entries = ['permit host 1.2.3.4 log', 'deny 9.9.9.0/24',
+                   'permit 1.2.3.4 255.255.0.0 log', 'deny any',
+                   'permit 5.6.7.0/24']
+        current = self.instance.get('test')['entries']
+        result = self.instance.reconcile('test', entries)
+        self.node.config.assert_called_once_with(
+            ['ip access-list standard test', 'no 50', 'no 60',
+             '15 deny 9.9.9.0/24', 'exit', 'commit'])
+        self.assertEqual(result['added'], {'15': dict(
+            action='deny', srcaddr='9.9.9.0', srclen='24', log=False)})
+        self.assertEqual(result['removed'],
+                         dict((seqno, current[seqno])
+                              for seqno in ('50', '60')))
+        self.assertIsNone(result['resequence'])
+        self.assertTrue(result['result'])
+
+    def test_reconcile_no_changes(self):
+        entries = ['permit host 1.2.3.4 log', 'permit 1.2.3.4/16 log']
+        self.node._running_config = 'ip access-list standard test\n' \
+            '   10 permit host 1.2.3.4 log\n' \
+            '   20 permit 1.2.3.4 255.255.0.0 log\n!\n'
+        result = self.instance.reconcile('test', entries)
+        self.assertEqual(self.node.config.call_count, 0)
+        self.assertEqual((result['added'], result['removed']), ({}, {}))
+
+    def test_reconcile_resequence(self):
+        self.node.config.return_value = []
+        self.node._running_config = 'ip access-list standard test\n' \
+            '   1 permit 1.1.1.0/24\n' \
+            '   2 permit 2.2.2.0/24\n!\n'
+        entries = ['permit 1.1.1.0/24', 'deny 3.3.3.0/24', 'deny any',
+                   'permit 2.2.2.0/24']
+        result = self.instance.reconcile('test', entries)
+        self.node.config.assert_called_once_with(
+            ['ip access-list standard test', 'resequence 10 10',
+             '13 deny 3.3.3.0/24', '16 deny any', 'exit', 'commit'])
+        self.assertEqual(result['resequence'], (10, 10))
+        self.assertEqual(sorted(result['added']), ['13', '16'])
+
+    def test_reconcile_in_transaction(self):
+        self.node.config.return_value = [{}] * 6
+        entries = ['permit host 1.2.3.4 log', 'deny 9.9.9.0/24',
+                   'permit 1.2.3.4 255.255.0.0 log', 'deny any',
+                   'permit 5.6.7.0/24']
+        with self.node.transaction() as txn:
+            result = self.instance.reconcile('test', entries)
+            txn.add(['ip access-list standard other', '10 deny any',
+                     'exit'])
+            self.assertEqual(self.node.config.call_count, 0)
+        self.assertIsNone(result['result'])
+        self.node.config.assert_called_once_with(
+            ['ip access-list standard test', 'no 50', 'no 60',
+             '15 deny 9.9.9.0/24', 'exit', 'ip access-list standard other',
+             '10 deny any', 'exit'])
+        self.assertEqual(txn.results, [True, True])
+
+    def test_reconcile_invalid_entry(self):
+        with self.assertRaises(ValueError):
+            self.instance.reconcile('test', ['allow everything'])
+        self.assertEqual(self.node.config.call_count, 0)
+
     def test_acl_functions(self):
         for name in ['create', 'delete', 'default']:
             if name == 'create':
@@ -216,9 +340,44 @@ class TestApiExtendedAcls(EapiConfigUnitTest):
                      srclen='24', srcport='neq irc')
         self.assertEqual(entry, result['entries']['70'])
 
+    def test_keys(self):
+        self.assertEqual(list(self.instance), ['exttest'])
+
     def test_get_not_configured(self):
         self.assertIsNone(self.instance.get('unconfigured'))
 
+    def test_get_compact(self):
+        result = self.instance.get_compact('exttest')
+        self.assertEqual(result.to_dict(), self.instance.get('exttest'))
+        self.assertEqual(result.entry(70).other,
+                         'urg ttl eq 24 fragments tracked log')
+
+    def test_reconcile_new_acl(self):
+        self.node.config.return_value = []
+        result = self.instance.reconcile(
+            'new', ['permit tcp any any eq www', 'deny ip any any log'])
+        self.node.config.assert_called_once_with(
+            ['ip access-list new', '10 permit tcp any any eq www',
+             '20 deny ip any any log', 'exit', 'commit'])
+        self.assertEqual(sorted(result['added']), ['10', '20'])
+        self.assertEqual(result['removed'], {})
+
+    def test_reconcile_failed(self):
+        self.node.config.side_effect = pyeapi.eapilib.CommandError(
+            1002, 'invalid command')
+        self.node._configure_session = Mock()
+        result = self.instance.reconcile('new', ['permit ip any any'])
+        self.node._configure_session.assert_called_once_with(['abort'])
+        self.assertFalse(result['result'])
+
+    def test_compact_acl_orders_entries(self):
+        entry = pyeapi.api.acl.ExtendedAclEntry
+        result = pyeapi.api.acl.CompactAcl('a', 'extended', [
+            entry(seqno=20, action='deny'), entry(seqno=10, action='permit'),
+            entry(seqno=20, action='permit')])
+        self.assertEqual(list(result), ['10', '20'])
+        self.assertEqual(result['20']['action'], 'permit')
+
     def test_acl_functions(self):
         for name in ['create', 'delete', 'default']:
             if name == 'create':
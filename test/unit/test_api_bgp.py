@@ -195,6 +195,62 @@ class TestApiBgpNeighbor(EapiConfigUnitTest):
                 'peer_group']
         self.assertEqual(sorted(keys), sorted(result.keys()))
 
+    def test_get_values(self):
+        result = self.instance.get('test1')
+        self.assertEqual(result['route_map_in'], 'RM-IN')
+        self.assertEqual(result['route_map_out'], 'RM-OUT')
+        result = self.instance.get('172.16.10.1')
+        self.assertEqual(result['peer_group'], 'test')
+        self.assertEqual(result['remote_as'], '65000')
+
+    def test_ispeergroup(self):
+        self.assertTrue(self.instance.ispeergroup('test'))
+        self.assertFalse(self.instance.ispeergroup('172.16.10.1'))
+
+    def test_vrf_and_address_family(self):
+        self.node._version_number = '4.23.0'
+        self.node._running_config = '\n'.join([
+            'router bgp 65000',
+            '   neighbor 10.0.0.1 remote-as 65001',
+            '   neighbor 10.0.0.1 description core',
+            '   !',
+            '   address-family ipv4',
+            '      neighbor 10.0.0.1 activate',
+            '      neighbor 10.0.0.1 route-map RM-IN in',
+            '   !',
+            '   vrf red',
+            '      neighbor 10.1.0.1 remote-as 65002',
+            '      neighbor 10.1.0.1 shutdown',
+            '      !',
+            '      address-family ipv6',
+            '         no neighbor 10.1.0.1 activate',
+            '   !',
+            '   neighbor PG peer group',
+            '!', ''])
+        self.assertEqual(self.instance.vrfs(), ['default', 'red'])
+        self.assertEqual(sorted(self.instance.getall()),
+                         ['10.0.0.1', '10.1.0.1', 'PG'])
+        self.assertEqual(sorted(self.instance.getall(vrf='default')),
+                         ['10.0.0.1', 'PG'])
+        result = self.instance.getall(vrf='red')
+        self.assertEqual(list(result), ['10.1.0.1'])
+        self.assertEqual(result['10.1.0.1']['remote_as'], '65002')
+        self.assertTrue(result['10.1.0.1']['shutdown'])
+        result = self.instance.get('10.0.0.1', vrf='red')
+        self.assertIsNone(result['remote_as'])
+        self.assertEqual(self.instance.get_address_families('10.0.0.1'), {
+            'ipv4': dict(activate=True, route_map_in='RM-IN',
+                         route_map_out=None)})
+        self.assertEqual(
+            self.instance.get_address_families('10.1.0.1', vrf='red'),
+            {'ipv6': dict(activate=False, route_map_in=None,
+                          route_map_out=None)})
+        self.assertTrue(self.instance.ispeergroup('PG'))
+
+    def test_getall_not_configured(self):
+        self.node._running_config = 'hostname veos01\n'
+        self.assertIsNone(self.instance.getall())
+
     def test_delete(self):
         cmds = ['router bgp 65000', 'no neighbor test']
         func = function('delete', 'test')
@@ -34,6 +34,8 @@ import os
 import unittest
 import json
 
+from unittest.mock import patch
+
 sys.path.append(os.path.join(os.path.dirname(__file__), '../lib'))
 
 from testlib import get_fixture, random_string, function, random_int
@@ -82,6 +84,20 @@ class TestApiInterfaces(EapiConfigUnitTest):
         result = self.instance.get('Foo1')
         self.assertEqual(result, None)
 
+    def test_getall_matches_get(self):
+        self.node.enable.return_value = [{'result': {'output': ''}}]
+        result = self.instance.getall()
+        self.assertEqual(list(result), list(self.instance))
+        for name, value in result.items():
+            self.assertEqual(value, self.instance.get(name))
+
+    def test_keys_do_not_parse_interfaces(self):
+        with patch.object(self.instance, 'get') as get:
+            self.assertIn('Ethernet1', self.instance)
+            self.assertNotIn('Foo1', self.instance)
+            self.assertEqual(len(self.instance), len(list(self.instance)))
+            self.assertEqual(get.call_count, 0)
+
     def test_proxy_method_success(self):
         result = self.instance.set_sflow('Ethernet1', True)
         self.assertTrue(result)
@@ -90,6 +106,19 @@ class TestApiInterfaces(EapiConfigUnitTest):
         with self.assertRaises(AttributeError):
             self.instance.set_sflow('Management1', True)
 
+    def test_reconcile(self):
+        desired = dict(Ethernet1=dict(description='uplink', shutdown=True,
+                                      sflow=True, flowcontrol_send='on'),
+                       Loopback0=dict(shutdown=False))
+        cmds = ['interface Ethernet1', 'description uplink', 'shutdown',
+                'flowcontrol send on']
+        func = function('reconcile_state', desired)
+        self.eapi_positive_config_test(func, cmds)
+
+    def test_reconcile_unsupported_attribute(self):
+        with self.assertRaises(ValueError):
+            self.instance.reconcile_state(dict(Loopback0=dict(sflow=True)))
+
 
 class TestApiBaseInterface(EapiConfigUnitTest):
 
@@ -380,6 +409,17 @@ class TestApiPortchannelInterface(EapiConfigUnitTest):
         result = self.instance.get_members('Port-Channel1')
         self.assertEqual(result, ['Ethernet5', 'Ethernet6'])
 
+    def test_get_members_from_bulk_json(self):
+        channel = dict(activePorts={'Ethernet5': {}, 'PeerEthernet5': {}},
+                       inactivePorts={'Ethernet6': {}})
+        self.node.enable.return_value = [
+            {'result': {'portChannels': {'Port-Channel1': channel}}}]
+        result = self.instance.get_members('Port-Channel1')
+        self.assertEqual(result, ['Ethernet5', 'Ethernet6'])
+        self.assertEqual(self.instance.get_members('Port-Channel2'), [])
+        self.instance.get('Port-Channel1')
+        self.node.enable.assert_called_once_with('show port-channel all-ports')
+
     def test_set_members(self):
         cmds = ['interface Ethernet6', 'no channel-group 1',
                 'interface Ethernet7', 'channel-group 1 mode on']
@@ -510,6 +550,38 @@ class TestApiVxlanInterface(EapiConfigUnitTest):
         func = function('remove_vlan', 'Vxlan1', 10)
         self.eapi_positive_config_test(func, cmds)
 
+    def test_get_vlans(self):
+        self.node._running_config = '\n'.join([
+            'interface Vxlan1',
+            '   vxlan vlan 10 vni 10',
+            '   vxlan vlan 10 flood vtep 3.3.3.3 4.4.4.4',
+            '   vxlan vlan 20-22 vni 1020-1022',
+            '   vxlan vlan 30 flood vtep 5.5.5.5',
+            '   vxlan udp-port 4789', ''])
+        result = self.instance.get('Vxlan1')['vlans']
+        self.assertEqual(result, {
+            '10': dict(vni='10', flood_list=['3.3.3.3', '4.4.4.4']),
+            '20': dict(vni='1020', flood_list=[]),
+            '21': dict(vni='1021', flood_list=[]),
+            '22': dict(vni='1022', flood_list=[]),
+            '30': dict(vni=None, flood_list=['5.5.5.5'])})
+
+    def test_set_vlans(self):
+        self.node._running_config = '\n'.join([
+            'interface Vxlan1',
+            '   vxlan vlan 10 vni 10',
+            '   vxlan vlan 20 vni 20',
+            '   vxlan vlan 30 vni 30',
+            '   vxlan udp-port 4789', ''])
+        cmds = ['interface Vxlan1', 'vxlan vlan add 20 vni 2000',
+                'vxlan vlan add 40 vni 40', 'vxlan vlan remove 30 vni']
+        func = function('set_vlans', 'Vxlan1', {10: 10, '20': 2000, 40: 40})
+        self.eapi_positive_config_test(func, cmds)
+
+    def test_set_vlans_no_change(self):
+        func = function('set_vlans', 'Vxlan1', {10: 10})
+        self.eapi_positive_config_test(func)
+
     def test_add_vtep(self):
         cmds = ['interface Vxlan1', 'vxlan flood vtep add 1.1.1.1']
         func = function('add_vtep', 'Vxlan1', '1.1.1.1')
@@ -36,6 +36,7 @@ import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '../lib'))
 
 
+from unittest.mock import patch
 from testlib import get_fixture, function, random_int, random_string
 from testlib import EapiConfigUnitTest
 
@@ -62,6 +63,14 @@ class TestApiIpinterfaces(EapiConfigUnitTest):
             secondary=['3.255.255.1/24', '4.255.255.1/24'], mtu=None )
         self.assertEqual(result, values)
 
+    def test_keys_do_not_parse_interfaces(self):
+        expected = list(self.instance.getall())
+        with patch.object(self.instance, 'get') as get, \
+                patch.object(self.instance, 'getall') as getall:
+            self.assertEqual(list(self.instance), expected)
+            self.assertEqual(len(self.instance), 4)
+            self.assertEqual(get.call_count + getall.call_count, 0)
+
     def test_getall(self):
         result = self.instance.getall()
         self.assertIsInstance(result, dict)
@@ -140,5 +149,23 @@ class TestApiIpinterfaces(EapiConfigUnitTest):
                 self.eapi_positive_config_test(func, cmds)
 
 
+    def test_reconcile(self):
+        desired = dict(Vlan10=dict(address='6.7.5.6/24', mtu=9000))
+        func = function('reconcile_state', desired)
+        self.eapi_positive_config_test(func, ['interface Vlan10', 'mtu 9000'])
+
+    def test_reconcile_creates_ipinterface(self):
+        desired = dict(Ethernet1=dict(address='1.1.1.1/24'))
+        cmds = ['interface Ethernet1', 'no switchport',
+                'ip address 1.1.1.1/24']
+        func = function('reconcile_state', desired)
+        self.eapi_positive_config_test(func, cmds)
+
+    def test_reconcile_unchanged(self):
+        desired = dict(Vlan10=dict(address='6.7.5.6/24', mtu=1500))
+        func = function('reconcile_state', desired)
+        self.eapi_positive_config_test(func)
+
+
 if __name__ == '__main__':
     unittest.main()
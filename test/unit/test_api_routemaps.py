@@ -32,6 +32,7 @@
 import sys
 import os
 import unittest
+from unittest.mock import patch
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '../lib'))
 
@@ -67,6 +68,44 @@ class TestApiRoutemaps(EapiConfigUnitTest):
         self.assertIsInstance(result, dict)
         self.assertEqual(len(result.keys()), 4)
 
+    def test_getall_matches_get(self):
+        result = self.instance.getall()
+        self.assertEqual(list(result), ['TEST', 'FOO', 'FOOBAR', 'FOO-BAR'])
+        for name, routemap in result.items():
+            self.assertEqual(routemap, self.instance.get(name))
+
+    def test_getall_entry_attributes(self):
+        self.node._running_config = 'route-map RM permit 10\n' \
+            '   description first entry\n' \
+            '   match as 100\n' \
+            '   set tag 5\n' \
+            '   set community 1:1 additive\n' \
+            '   continue 20\n!\n' \
+            'route-map RM deny 20\n!\n'
+        result = self.instance.getall()
+        self.assertEqual(result, {'RM': {
+            'permit': {10: {'match': ['as 100'],
+                            'set': ['tag 5', 'community 1:1 additive'],
+                            'continue': 20,
+                            'description': 'first entry'}},
+            'deny': {20: {'match': [], 'set': [], 'continue': None,
+                          'description': None}}}})
+        self.assertEqual(result['RM'], self.instance.get('RM'))
+
+    def test_iter_all(self):
+        names = [name for name, _ in self.instance.iter_all()]
+        self.assertEqual(len(names), 4)
+        self.assertEqual(dict(self.instance.iter_all()),
+                         self.instance.getall())
+
+    def test_iter_all_parses_config_once(self):
+        with patch.object(self.instance, 'get') as get, \
+                patch.object(self.instance, 'get_block') as get_block:
+            result = list(self.instance.iter_all())
+            get.assert_not_called()
+            get_block.assert_not_called()
+        self.assertEqual(dict(result), self.instance.getall())
+
     def test_routemaps_functions(self):
         for name in ['create', 'delete', 'default']:
             if name == 'create':
@@ -36,10 +36,12 @@ import unittest
 sys.path.append(os.path.join(os.path.dirname(__file__), '../lib'))
 
 from random import choice
+from unittest.mock import patch
 from testlib import get_fixture, function, random_int, random_string
 from testlib import EapiConfigUnitTest
 
 import pyeapi.api.staticroute
+import pyeapi.eapilib
 
 IP_DESTS = ['11.111.11.0/24', '222.22.222.0/24', '33.34.35.0/24']
 NEXT_HOPS = [('Ethernet1', '3.3.3.3'), ('Ethernet2', '2.2.2.2'),
@@ -58,6 +60,14 @@ class TestApiStaticroute(EapiConfigUnitTest):
         result = pyeapi.api.staticroute.instance(None)
         self.assertIsInstance(result, pyeapi.api.staticroute.StaticRoute)
 
+    def test_keys_do_not_parse_routes(self):
+        expected = list(self.instance.getall())
+        with patch.object(self.instance, 'get') as get, \
+                patch.object(self.instance, 'getall') as getall:
+            self.assertEqual(list(self.instance), expected)
+            self.assertEqual(len(self.instance), 2)
+            self.assertEqual(get.call_count + getall.call_count, 0)
+
     def test_get(self):
         # Test retrieval of a specific static route entry
         # Assumes running_config.text file contains the following
@@ -147,6 +157,150 @@ class TestApiStaticroute(EapiConfigUnitTest):
         result = self.instance.getall()
         self.assertEqual(result, routes)
 
+    def test_iter_all(self):
+        result = list(self.instance.iter_all())
+        self.assertEqual([name for name, _ in result],
+                         ['0.0.0.0/0', '1.2.3.0/24'])
+        self.assertEqual(dict(result), self.instance.getall())
+
+    def test_iter_all_unsorted_routes(self):
+        self.node._running_config = '\n'.join([
+            'ip route 10.0.0.0/8 Null0 1',
+            'ip route 1.2.3.0/24 Ethernet1 1.1.1.1 1',
+            'ip route 10.0.0.0/8 Ethernet2 2.2.2.2 5',
+            'ip route 1.2.3.0/24 Ethernet1 1.1.1.1 10',
+            'ip route 9.9.9.0/24 Null0 1'])
+        result = list(self.instance.iter_all())
+        self.assertEqual([name for name, _ in result],
+                         ['10.0.0.0/8', '1.2.3.0/24', '9.9.9.0/24'])
+        self.assertEqual(dict(result), self.instance.getall())
+
+    def test_get_uses_index(self):
+        self.instance.get('0.0.0.0/0')
+        self.instance.get('1.2.3.0/24')
+        self.assertIsNone(self.instance.get('9.9.9.0/24'))
+        self.assertIs(self.instance.index(), self.instance.index())
+
+    def test_longest_match(self):
+        result = self.instance.longest_match('1.2.3.4')
+        self.assertEqual(list(result), ['1.2.3.0/24'])
+        result = self.instance.longest_match('8.8.8.8')
+        self.assertEqual(list(result), ['0.0.0.0/0'])
+
+    def test_longest_match_no_route(self):
+        self.node._running_config = 'ip route 10.0.0.0/8 Null0 1\n'
+        self.assertIsNone(self.instance.longest_match('11.0.0.1'))
+
+    def test_within(self):
+        result = self.instance.within('1.0.0.0/8')
+        self.assertEqual(list(result), ['1.2.3.0/24'])
+        self.assertEqual(result['1.2.3.0/24'],
+                         self.instance.get('1.2.3.0/24'))
+        self.assertEqual(self.instance.within('2.0.0.0/8'), {})
+        self.assertEqual(len(self.instance.within('0.0.0.0/0')), 2)
+
+    def test_route_index_queries(self):
+        index = pyeapi.api.staticroute.RouteIndex(
+            dict.fromkeys(['10.0.0.0/8', '10.1.0.0/16', '10.1.2.0/24',
+                           '10.2.0.0/16', '11.0.0.0/8']))
+        self.assertEqual(index.covering('10.1.2.3'),
+                         ['10.1.2.0/24', '10.1.0.0/16', '10.0.0.0/8'])
+        self.assertEqual(index.covering('10.1.0.0/15'), ['10.0.0.0/8'])
+        self.assertEqual(index.within('10.0.0.0/8'),
+                         ['10.0.0.0/8', '10.1.0.0/16', '10.1.2.0/24',
+                          '10.2.0.0/16'])
+        self.assertEqual(index.within('10.1.0.0/16'),
+                         ['10.1.0.0/16', '10.1.2.0/24'])
+
+    def test_converge(self):
+        routes = self.instance.getall()
+        # modify one route, remove one and add a new one
+        routes['1.2.3.0/24']['Ethernet1']['1.1.1.1'][10]['tag'] = 5
+        del routes['1.2.3.0/24']['Ethernet1']['10.1.1.1']
+        routes['9.9.9.0/24'] = {'Null0': {None: {1: {}}}}
+        result = self.instance.converge(routes)
+        self.node.config.assert_called_once_with(
+            ['no ip route 1.2.3.0/24 Ethernet1 10.1.1.1 20',
+             'ip route 1.2.3.0/24 Ethernet1 1.1.1.1 10 tag 5 name test1',
+             'ip route 9.9.9.0/24 Null0 1'])
+        self.assertEqual(result[('0.0.0.0/0', '192.68.1.254', None, 1)],
+                         'unchanged')
+        self.assertEqual(
+            result[('1.2.3.0/24', 'Ethernet1', '10.1.1.1', 20)], 'removed')
+        self.assertEqual(
+            result[('1.2.3.0/24', 'Ethernet1', '1.1.1.1', 10)], 'modified')
+        self.assertEqual(result[('9.9.9.0/24', 'Null0', None, 1)], 'added')
+
+    def test_converge_no_changes(self):
+        result = self.instance.converge(self.instance.getall())
+        self.assertEqual(self.node.config.call_count, 0)
+        self.assertEqual(set(result.values()), set(['unchanged']))
+
+    def test_converge_without_replace(self):
+        routes = {'9.9.9.0/24': {'Null0': {None: {1: {'tag': 7}}}}}
+        result = self.instance.converge(routes, replace=False)
+        self.node.config.assert_called_once_with(
+            ['ip route 9.9.9.0/24 Null0 1 tag 7'])
+        self.assertEqual(result, {('9.9.9.0/24', 'Null0', None, 1): 'added'})
+
+    def test_converge_chunks(self):
+        routes = dict(('10.0.%d.0/24' % index, {'Null0': {None: {1: {}}}})
+                      for index in range(5))
+        result = self.instance.converge(routes, replace=False, chunk_size=2)
+        self.assertEqual(self.node.config.call_count, 3)
+        self.assertEqual(len(result), 5)
+
+    def test_converge_failed_chunk(self):
+        error = pyeapi.eapilib.CommandError(
+            1002, 'invalid command',
+            output=[{}, {}, {}, {'errors': ['invalid']}])
+        self.node.config.side_effect = error
+        routes = dict(('10.0.%d.0/24' % index, {'Null0': {None: {1: {}}}})
+                      for index in range(3))
+        result = self.instance.converge(routes, replace=False)
+        self.assertEqual([result[(dest, 'Null0', None, 1)]
+                          for dest in sorted(routes)],
+                         ['added', 'failed', 'failed'])
+
+    def test_converge_in_transaction(self):
+        self.node.config.return_value = [{}] * 5
+        routes = dict(('10.0.%d.0/24' % index, {'Null0': {None: {1: {}}}})
+                      for index in range(5))
+        with self.node.transaction() as txn:
+            result = self.instance.converge(routes, replace=False,
+                                            chunk_size=2)
+            self.assertEqual(self.node.config.call_count, 0)
+        self.assertEqual(set(result.values()), set(['pending']))
+        self.node.config.assert_called_once_with(
+            ['ip route 10.0.%d.0/24 Null0 1' % index for index in range(5)])
+        self.assertEqual(txn.results, [True] * 5)
+
+    def test_converge_invalid_prefix(self):
+        routes = {'1.2.3.300/24': {'Null0': {None: {1: {}}}}}
+        with self.assertRaises(ValueError):
+            self.instance.converge(routes)
+        self.assertEqual(self.node.config.call_count, 0)
+
+    def test_create_invalid_prefix(self):
+        self.assertFalse(self.instance.create('1.2.3.300/24', 'Null0'))
+        self.assertFalse(self.instance.delete('1.2.3.300/24', 'Null0'))
+        self.assertEqual(self.node.config.call_count, 0)
+
+    def test_delete_missing_route(self):
+        self.assertTrue(self.instance.delete('10.0.0.0/24', 'Null0'))
+        self.assertTrue(self.instance.default('1.2.3.0/24', 'Ethernet1',
+                                              next_hop_ip='1.1.1.1',
+                                              distance=20))
+        self.assertEqual(self.node.config.call_count, 0)
+
+    def _configure_route(self, ip_dest, next_hop, next_hop_ip, distance):
+        # delete and default only send routes found in the running-config
+        route = 'ip route %s %s' % (ip_dest, next_hop)
+        if next_hop_ip is not None:
+            route += ' %s' % next_hop_ip
+        route += ' %s' % (1 if distance is None else distance)
+        self.node._running_config = '%s\n%s\n' % (self.config, route)
+
     def test_create(self):
         # Test passing in a full set of parameters to 'create'
         # Some parameters may be not set: None
@@ -224,6 +378,7 @@ class TestApiStaticroute(EapiConfigUnitTest):
                    (ip_dest, next_hop, cmd_next_hop_ip, cmd_distance,
                     cmd_tag, cmd_route_name)
 
+            self._configure_route(ip_dest, next_hop, next_hop_ip, distance)
             self.eapi_positive_config_test(func, cmds)
 
     def test_default(self):
@@ -263,6 +418,7 @@ class TestApiStaticroute(EapiConfigUnitTest):
                    (ip_dest, next_hop, cmd_next_hop_ip, cmd_distance,
                     cmd_tag, cmd_route_name)
 
+            self._configure_route(ip_dest, next_hop, next_hop_ip, distance)
             self.eapi_positive_config_test(func, cmds)
 
     def test_set_tag(self):
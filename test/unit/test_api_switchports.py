@@ -36,6 +36,7 @@ import unittest
 sys.path.append(os.path.join(os.path.dirname(__file__), '../lib'))
 
 
+from unittest.mock import patch
 from testlib import get_fixture, random_vlan, function
 from testlib import EapiConfigUnitTest
 
@@ -57,6 +58,14 @@ class TestApiSwitchports(EapiConfigUnitTest):
                 'trunk_allowed_vlans', 'trunk_groups']
         self.assertEqual(sorted(result.keys()), sorted(keys))
 
+    def test_keys_do_not_parse_interfaces(self):
+        expected = list(self.instance.getall())
+        with patch.object(self.instance, 'get') as get, \
+                patch.object(self.instance, 'getall') as getall:
+            self.assertEqual(list(self.instance), expected)
+            self.assertEqual(len(self.instance), 9)
+            self.assertEqual(get.call_count + getall.call_count, 0)
+
     def test_getall(self):
         expected = sorted(['Port-Channel10',
                            'Ethernet1', 'Ethernet2',
@@ -151,6 +160,30 @@ class TestApiSwitchports(EapiConfigUnitTest):
             func = function('set_trunk_allowed_vlans', intf, vid)
             self.eapi_positive_config_test(func, cmds)
 
+    def test_update_trunk_allowed_vlans(self):
+        self.node._running_config = 'interface Ethernet1\n' \
+            '   switchport trunk allowed vlan 1-100,200\n'
+        cmds = ['interface Ethernet1',
+                'switchport trunk allowed vlan remove 200',
+                'switchport trunk allowed vlan add 101-110']
+        func = function('update_trunk_allowed_vlans', 'Ethernet1', '1-110')
+        self.eapi_positive_config_test(func, cmds)
+
+    def test_update_trunk_allowed_vlans_remove(self):
+        cmds = ['interface Ethernet1',
+                'switchport trunk allowed vlan remove 1-9,11-4094']
+        func = function('update_trunk_allowed_vlans', 'Ethernet1', [10])
+        self.eapi_positive_config_test(func, cmds)
+
+    def test_update_trunk_allowed_vlans_none(self):
+        cmds = ['interface Ethernet1', 'switchport trunk allowed vlan none']
+        func = function('update_trunk_allowed_vlans', 'Ethernet1', 'none')
+        self.eapi_positive_config_test(func, cmds)
+
+    def test_update_trunk_allowed_vlans_no_change(self):
+        func = function('update_trunk_allowed_vlans', 'Ethernet1', 'all')
+        self.eapi_positive_config_test(func)
+
     def test_set_trunk_allowed_vlans_with_no_value(self):
         for intf in self.INTERFACES:
             cmds = ['interface %s' % intf,
@@ -208,5 +241,37 @@ class TestApiSwitchports(EapiConfigUnitTest):
             self.eapi_positive_config_test(func, cmds)
 
 
+    def test_reconcile(self):
+        desired = dict(Ethernet1=dict(mode='trunk', trunk_allowed_vlans='all',
+                                      trunk_groups=['foo']))
+        cmds = ['interface Ethernet1', 'switchport mode trunk',
+                'no switchport trunk group bar']
+        func = function('reconcile_state', desired)
+        self.eapi_positive_config_test(func, cmds)
+
+    def test_reconcile_trunk_allowed_vlans(self):
+        desired = dict(Ethernet1=dict(trunk_allowed_vlans='1-10,11-4094'))
+        self.assertEqual(self.instance.reconcile_commands(desired), [])
+        desired = dict(Ethernet1=dict(trunk_allowed_vlans='10,20'))
+        cmds = ['interface Ethernet1', 'switchport trunk allowed vlan 10,20']
+        self.assertEqual(self.instance.reconcile_commands(desired), cmds)
+
+    def test_reconcile_trunk_allowed_vlans_list(self):
+        desired = dict(Ethernet1=dict(trunk_allowed_vlans=[20, '10', 11]))
+        cmds = ['interface Ethernet1',
+                'switchport trunk allowed vlan 10-11,20']
+        self.assertEqual(self.instance.reconcile_commands(desired), cmds)
+        vlans = list(range(1, 4095))
+        desired = dict(Ethernet1=dict(trunk_allowed_vlans=vlans))
+        self.assertEqual(self.instance.reconcile_commands(desired), [])
+
+    def test_reconcile_creates_switchport(self):
+        desired = dict(Ethernet99=dict(access_vlan='10'))
+        cmds = ['interface Ethernet99', 'no ip address', 'switchport',
+                'switchport access vlan 10']
+        func = function('reconcile_state', desired)
+        self.eapi_positive_config_test(func, cmds)
+
+
 if __name__ == '__main__':
     unittest.main()
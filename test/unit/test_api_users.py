@@ -35,6 +35,7 @@ import unittest
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '../lib'))
 
+from unittest.mock import patch
 from testlib import get_fixture, function
 from testlib import EapiConfigUnitTest
 
@@ -51,6 +52,14 @@ class TestApiUsers(EapiConfigUnitTest):
         result = pyeapi.api.users.isprivilege('test')
         self.assertFalse(result)
 
+    def test_keys_do_not_parse_users(self):
+        expected = list(self.instance.getall())
+        with patch.object(self.instance, 'get') as get, \
+                patch.object(self.instance, 'getall') as getall:
+            self.assertEqual(list(self.instance), expected)
+            self.assertEqual(len(self.instance), 6)
+            self.assertEqual(get.call_count + getall.call_count, 0)
+
     def test_get(self):
         keys = ['nopassword', 'privilege', 'role', 'secret', 'format', 'sshkey']
         result = self.instance.get('test')
@@ -35,6 +35,7 @@ import unittest
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '../lib'))
 
+from unittest.mock import patch
 from testlib import get_fixture, function
 from testlib import EapiConfigUnitTest
 
@@ -113,6 +114,14 @@ class TestApiVarpInterfaces(EapiConfigUnitTest):
         result = self.instance.get('Vlan1000')
         self.assertIsNone(result)
 
+    def test_keys_do_not_parse_interfaces(self):
+        expected = list(self.instance.getall())
+        with patch.object(self.instance, 'get') as get, \
+                patch.object(self.instance, 'getall') as getall:
+            self.assertEqual(list(self.instance), expected)
+            self.assertEqual(len(self.instance), 3)
+            self.assertEqual(get.call_count + getall.call_count, 0)
+
     def test_add_address_with_value(self):
         func = function('set_addresses', 'Vlan4001', addresses=['1.1.1.4'])
         cmds = ['interface Vlan4001', 'no ip virtual-router address 1.1.1.2',
@@ -33,6 +33,8 @@ import sys
 import os
 import unittest
 
+from unittest.mock import Mock
+
 sys.path.append(os.path.join(os.path.dirname(__file__), '../lib'))
 
 from testlib import get_fixture, random_vlan, random_string, function
@@ -77,6 +79,24 @@ class TestApiVlans(EapiConfigUnitTest):
         self.assertIsInstance(result, dict)
         self.assertEqual(len(result), 5)
 
+    def test_get_vlan_set(self):
+        result = self.instance.get_vlan_set()
+        self.assertEqual(str(result), '1,10,100,200-202,204,300')
+
+    def test_len_and_contains(self):
+        self.assertEqual(len(self.instance), 5)
+        self.assertIn('1', self.instance)
+        self.assertNotIn('1000', self.instance)
+
+    def test_getall_is_memoized(self):
+        self.node.section = Mock(wraps=self.node.section)
+        self.instance.getall()
+        count = self.node.section.call_count
+        result = self.instance.getall()
+        self.assertEqual(self.node.section.call_count, count)
+        result['1']['name'] = 'changed'
+        self.assertEqual(self.instance.getall()['1']['name'], 'default')
+
     def test_vlan_functions(self):
         for name in ['create', 'delete', 'default']:
             vid = random_vlan()
@@ -89,6 +109,33 @@ class TestApiVlans(EapiConfigUnitTest):
             func = function(name, vid)
             self.eapi_positive_config_test(func, cmds)
 
+    def test_create_vlans(self):
+        attributes = {'1000': dict(name='web'),
+                      1001: dict(name='VLAN1001', state='suspend'),
+                      1002: dict(state='suspend'),
+                      10: dict(name='VLAN0010', trunk_groups=['tg2']),
+                      100: dict(name='mytest', state='active')}
+        cmds = ['vlan 10', 'no trunk group tg1', 'trunk group tg2',
+                'vlan 1000', 'name web',
+                'vlan 1001-1002', 'state suspend',
+                'vlan 1003-1099']
+        func = function('create_vlans', '1000-1099', attributes)
+        self.eapi_positive_config_test(func, cmds)
+
+    def test_create_vlans_no_change(self):
+        func = function('create_vlans', '1,200-202',
+                        {201: dict(name='grouping')})
+        self.eapi_positive_config_test(func)
+
+    def test_delete_vlans(self):
+        cmds = 'no vlan 10,100,200-202,204'
+        func = function('delete_vlans', '2-250')
+        self.eapi_positive_config_test(func, cmds)
+
+    def test_delete_vlans_not_configured(self):
+        func = function('delete_vlans', [2000, 3000])
+        self.eapi_positive_config_test(func)
+
     def test_set_name(self):
         for state in ['config', 'negate', 'default']:
             vid = random_vlan()
@@ -157,5 +204,29 @@ class TestApiVlans(EapiConfigUnitTest):
         self.eapi_positive_config_test(func, cmds)
 
 
+    def test_reconcile(self):
+        desired = {'10': dict(name='foo', trunk_groups=['tg2']),
+                   '4000': dict(name='new')}
+        cmds = ['vlan 10', 'name foo', 'no trunk group tg1',
+                'trunk group tg2', 'vlan 4000', 'name new']
+        self.assertEqual(self.instance.reconcile_commands(desired), cmds)
+        func = function('reconcile_state', desired)
+        self.eapi_positive_config_test(func, cmds)
+
+    def test_reconcile_unchanged(self):
+        desired = {'10': dict(name='VLAN0010', state='active',
+                              trunk_groups=['tg1'])}
+        func = function('reconcile_state', desired)
+        self.eapi_positive_config_test(func)
+
+    def test_reconcile_creates_vlan(self):
+        func = function('reconcile_state', {'4000': None})
+        self.eapi_positive_config_test(func, ['vlan 4000'])
+
+    def test_reconcile_invalid_attribute(self):
+        with self.assertRaises(ValueError):
+            self.instance.reconcile_state({'10': dict(vni=10)})
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -32,6 +32,7 @@
 import sys
 import os
 import unittest
+from unittest.mock import patch
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '../lib'))
 
@@ -163,5 +164,61 @@ class TestApiVrfs(EapiConfigUnitTest):
                 self.eapi_positive_config_test(func, cmds)
 
 
+    def test_reconcile(self):
+        desired = dict(blah=dict(rd='10:10', description='new',
+                                 ipv6_routing=True),
+                       test=dict(ipv4_routing=False))
+        cmds = ['vrf definition blah', 'description new', 'exit',
+                'ipv6 unicast-routing vrf blah']
+        func = function('reconcile_state', desired)
+        self.eapi_positive_config_test(func, cmds)
+
+    def test_reconcile_creates_vrf(self):
+        desired = dict(red=dict(rd='1:1', ipv4_routing=True))
+        cmds = ['vrf definition red', 'rd 1:1', 'exit', 'ip routing vrf red']
+        func = function('reconcile_state', desired)
+        self.eapi_positive_config_test(func, cmds)
+
+    def test_reconcile_vrf_instance(self):
+        self.node._version_number = '4.23.0'
+        cmds = self.instance.reconcile_commands(dict(red=dict(rd='1:1')))
+        self.assertEqual(cmds, ['vrf instance red', 'rd 1:1'])
+
+
+    def test_get_interfaces(self):
+        self.assertEqual(self.instance.get_interfaces('blah'), ['Ethernet1'])
+        self.assertEqual(self.instance.get_interfaces('test'), [])
+        self.assertIsNone(self.instance.get_interfaces('missing'))
+
+    def test_get_parses_config_once(self):
+        with patch.object(pyeapi.api.vrfs, 'parse_vrfs',
+                          wraps=pyeapi.api.vrfs.parse_vrfs) as parse:
+            self.instance.getall()
+            self.instance.get_interfaces('blah')
+            self.assertEqual(parse.call_count, 1)
+
+    def test_parse_vrfs(self):
+        config = '\n'.join(['vrf instance red-1', '   rd 1:1', '!',
+                            'vrf instance blue',
+                            '   description blue vrf', '!',
+                            'interface Ethernet1', '   vrf red-1', '!',
+                            'interface Ethernet2', '   vrf forwarding blue',
+                            '!', 'interface Ethernet3', '   vrf red-1', '!',
+                            'no ip routing vrf red-1',
+                            'no ipv6 unicast-routing vrf blue'])
+        result = pyeapi.api.vrfs.parse_vrfs(config)
+        self.assertEqual(list(result), ['red-1', 'blue'])
+        self.assertEqual(result['red-1'],
+                         dict(rd='1:1', description=None,
+                              ipv4_routing=False, ipv6_routing=True,
+                              interfaces=['Ethernet1', 'Ethernet3']))
+        self.assertEqual(result['blue'],
+                         dict(rd=None, description='blue vrf',
+                              ipv4_routing=True, ipv6_routing=False,
+                              interfaces=['Ethernet2']))
+        self.assertEqual(pyeapi.api.vrfs.parse_vrfs(config, 'definition'),
+                         dict())
+
+
 if __name__ == '__main__':
     unittest.main()
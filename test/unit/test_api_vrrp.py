@@ -35,6 +35,7 @@ import unittest
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '../lib'))
 
+from unittest.mock import patch
 from testlib import get_fixture, function
 from testlib import EapiConfigUnitTest
 
@@ -148,6 +149,14 @@ class TestApiVrrp(EapiConfigUnitTest):
         result = pyeapi.api.vrrp.instance(None)
         self.assertIsInstance(result, pyeapi.api.vrrp.Vrrp)
 
+    def test_keys_do_not_parse_interfaces(self):
+        expected = list(self.instance.getall())
+        with patch.object(self.instance, 'get') as get, \
+                patch.object(self.instance, 'getall') as getall:
+            self.assertEqual(list(self.instance), expected)
+            self.assertEqual(len(self.instance), 3)
+            self.assertEqual(get.call_count + getall.call_count, 0)
+
     def test_get(self):
         # Request various sets of vrrp configurations
         for interface in known_vrrps:
@@ -157,6 +166,29 @@ class TestApiVrrp(EapiConfigUnitTest):
             result = self.instance.get(interface)
             self.assertEqual(result, known)
 
+    def test_get_legacy_syntax(self):
+        self.node._version_number = '4.17.0'
+        self.node._running_config = (
+            'interface Vlan10\n'
+            '   vrrp 5 ip 10.10.10.1\n'
+            '   vrrp 5 ip 10.10.10.2 secondary\n'
+            '   vrrp 5 priority 150\n'
+            '   vrrp 5 description primary vip\n'
+            '   vrrp 5 shutdown\n'
+            '   vrrp 5 track Ethernet1 decrement 10\n'
+            '   no vrrp 6 preempt\n')
+        result = self.instance.get('Vlan10')
+        self.assertEqual(sorted(result), [5, 6])
+        self.assertEqual(result[5]['primary_ip'], '10.10.10.1')
+        self.assertEqual(result[5]['secondary_ip'], ['10.10.10.2'])
+        self.assertEqual(result[5]['priority'], 150)
+        self.assertEqual(result[5]['description'], 'primary vip')
+        self.assertFalse(result[5]['enable'])
+        self.assertEqual(result[5]['track'], [
+            dict(name='Ethernet1', action='decrement', amount=10)])
+        self.assertFalse(result[6]['preempt'])
+        self.assertIsNone(result[6]['primary_ip'])
+
     def test_get_non_existent_interface(self):
         # Request vrrp configuration for an interface that
         # is not defined
@@ -175,6 +207,13 @@ class TestApiVrrp(EapiConfigUnitTest):
         result = self.instance.getall()
         self.assertEqual(result, known_vrrps)
 
+    def test_iter_all(self):
+        result = self.instance.iter_all()
+        self.assertEqual(dict(result), known_vrrps)
+        # only the shared section models are kept
+        self.assertEqual(list(self.node._models[1]),
+                         [('section_models', 'interface')])
+
     def test_create(self):
         interface = 'Ethernet1'
         vrid = 10
@@ -31,8 +31,10 @@
 #
 import sys
 import os
+import time
 import unittest
 import importlib
+import threading
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '../lib'))
 
@@ -211,6 +213,27 @@ class TestNode(unittest.TestCase):
         result = self.node.api('system')
         self.assertIsNotNone(result)
 
+    def test_api_returns_cached_instance(self):
+        result = self.node.api('interfaces')
+        self.assertIs(self.node.api('interfaces'), result)
+        self.assertIsNot(self.node.api('interfaces', cache=False), result)
+
+    def test_clear_api(self):
+        result = self.node.api('interfaces')
+        self.node.api('vlans')
+        self.node.clear_api('interfaces')
+        self.assertIsNot(self.node.api('interfaces'), result)
+        self.assertIn(('pyeapi.api', 'vlans'), self.node._apis)
+        self.node.clear_api()
+        self.assertEqual(self.node._apis, {})
+
+    def test_refresh_invalidates_cached_api(self):
+        self.node._running_config = 'ip access-list standard test\n'
+        acls = self.node.api('acl')
+        acls.get_instance('test')
+        self.node.refresh()
+        self.assertEqual(acls._instances, {})
+
     def test_enable_authentication(self):
         self.assertIsNone(self.node._enablepwd)
         self.node.enable_authentication('test')
@@ -221,6 +244,392 @@ class TestNode(unittest.TestCase):
         with self.assertRaises(TypeError):
             self.node.enable(cmds)
 
+    def test_running_config_probe_hit_skips_download(self):
+        node = pyeapi.client.Node(None, config_probe='show probe')
+        node.run_commands = Mock(return_value=[dict(output='1'),
+                                               dict(output='config')])
+        self.assertEqual(node.running_config, 'config')
+        node.run_commands = Mock(return_value=[dict(output='1')])
+        node.refresh()
+        self.assertEqual(node.running_config, 'config')
+        node.run_commands.assert_called_once_with('show probe', 'text')
+        self.assertEqual(node.probe_stats, dict(hits=1, misses=0))
+
+    def test_running_config_probe_miss_downloads_config(self):
+        node = pyeapi.client.Node(None, config_probe='show probe')
+        node.run_commands = Mock(return_value=[dict(output='1'),
+                                               dict(output='config')])
+        self.assertEqual(node.running_config, 'config')
+        node.refresh()
+        node.run_commands.side_effect = [
+            [dict(output='2')], [dict(output='2'), dict(output='new')]]
+        self.assertEqual(node.running_config, 'new')
+        node.run_commands.assert_called_with(
+            ['show probe', 'show running-config all'], 'text')
+        self.assertEqual(node.probe_stats, dict(hits=0, misses=1))
+
+    def test_running_config_probe_detects_supported_command(self):
+        node = pyeapi.client.Node(None, config_probe=True)
+        unsupported = pyeapi.eapilib.CommandError(1002, 'invalid command')
+        node.run_commands = Mock(side_effect=[unsupported,
+                                              [dict(output='1')]])
+        probe = node._get_probe_command()
+        self.assertEqual(probe, pyeapi.client.CONFIG_PROBES[1])
+        self.assertEqual(node._get_probe_command(), probe)
+        self.assertEqual(node.run_commands.call_count, 2)
+
+    def test_running_config_probe_detection_token_reused(self):
+        node = pyeapi.client.Node(None, config_probe='show probe')
+        node._running_config = 'config'
+        node._config_token = '1'
+        node._config_stale = True
+        node.run_commands = Mock(return_value=[dict(output='1')])
+        self.assertEqual(node.running_config, 'config')
+        node.run_commands.assert_called_once_with('show probe', 'text')
+        self.assertEqual(node.probe_stats, dict(hits=1, misses=0))
+
+    def test_running_config_probe_unsupported_falls_back(self):
+        node = pyeapi.client.Node(None, config_probe=True)
+        unsupported = pyeapi.eapilib.CommandError(1002, 'invalid command')
+        node.run_commands = Mock(side_effect=unsupported)
+        node.get_config = Mock(return_value='config')
+        self.assertEqual(node.running_config, 'config')
+        node.refresh()
+        self.assertIsNone(node._running_config)
+
+    def test_prefetch_all_items(self):
+        version = {'version': '4.30.1F', 'modelName': 'DCS-7050SX3-48YC8'}
+
+        def run_commands(commands, encoding):
+            if encoding == 'json':
+                return [version]
+            return [dict(output='running\n'), dict(output='startup\n')]
+
+        self.node.run_commands = Mock(side_effect=run_commands)
+        self.node.prefetch()
+        self.assertEqual(self.node.run_commands.mock_calls, [
+            call(['show version'], 'json'),
+            call(['show running-config all', 'show startup-config'],
+                 'text')])
+        self.assertEqual(self.node.version, '4.30.1F')
+        self.assertEqual(self.node.version_number, '4.30.1')
+        self.assertEqual(self.node.model, '7050')
+        self.assertEqual(self.node.running_config, 'running')
+        self.assertEqual(self.node.startup_config, 'startup')
+        self.assertEqual(self.node.run_commands.call_count, 2)
+
+    def test_prefetch_single_request_for_json_config(self):
+        node = pyeapi.client.Node(None, config_format='json')
+        version = {'version': '4.30.1F', 'modelName': 'vEOS'}
+        node.run_commands = Mock(return_value=[version, dict(cmds={})])
+        node.prefetch('version', 'running_config')
+        node.run_commands.assert_called_once_with(
+            ['show version', 'show running-config all'], 'json')
+        self.assertEqual(node.model, 'vEOS')
+        self.assertIsNotNone(node._running_config_tree)
+
+    def test_prefetch_raises_type_error(self):
+        with self.assertRaises(TypeError):
+            self.node.prefetch('version', 'invalid')
+
+    def test_transaction_sends_single_request(self):
+        self.node.run_commands = Mock(return_value=[{}] * 7)
+        with self.node.transaction() as txn:
+            self.assertEqual(self.node.config(['interface Ethernet1',
+                                               'description a']), [{}, {}])
+            self.node.config('vlan 10')
+            self.node.config(['interface Ethernet1', 'mtu 9000'])
+            self.node.config(['interface Ethernet1', 'description a'])
+            self.node.run_commands.assert_not_called()
+        self.node.run_commands.assert_called_once_with(
+            ['configure terminal', 'interface Ethernet1', 'mtu 9000',
+             'description a', 'vlan 10'])
+        self.assertEqual(txn.results, [True, True, True, True])
+
+    def test_transaction_keeps_order_of_conflicting_sections(self):
+        self.node.run_commands = Mock(return_value=[{}] * 6)
+        with self.node.transaction() as txn:
+            self.node.config(['interface Ethernet1.1', 'description a'])
+            self.node.config('no interface Ethernet1.1')
+            self.node.config(['interface Ethernet1.1', 'description b'])
+        commands, positions = txn.build()
+        self.assertEqual(commands, ['interface Ethernet1.1', 'description a',
+                                    'no interface Ethernet1.1',
+                                    'interface Ethernet1.1', 'description b'])
+        self.assertEqual(positions, [[0, 1], [2], [3, 4]])
+
+    def test_transaction_results_on_failure(self):
+        error = pyeapi.eapilib.CommandError(
+            1002, 'invalid command',
+            output=[{}, {}, {}, {}, {'errors': ['invalid']}])
+        self.node.run_commands = Mock(side_effect=error)
+        with self.node.transaction() as txn:
+            self.node.config(['interface Ethernet1', 'description a'])
+            self.node.config(['vlan 10', 'name bad name'])
+            self.node.config('ip routing')
+        self.assertEqual(txn.results, [True, False, False])
+        self.assertIs(txn.error, error)
+
+    def test_transaction_discarded_on_exception(self):
+        self.node.run_commands = Mock()
+        with self.assertRaises(ValueError):
+            with self.node.transaction():
+                self.node.config('vlan 10')
+                raise ValueError()
+        self.node.run_commands.assert_not_called()
+        self.assertIsNone(self.node._transaction)
+
+    def test_transaction_with_session(self):
+        self.node.run_commands = Mock(return_value=[{}, {}, {}, {}])
+        with patch('pyeapi.client.uuid4', return_value='s1'):
+            with self.node.transaction(session=True) as txn:
+                self.node.config(['vlan 10', 'name web'])
+        self.node.run_commands.assert_called_once_with(
+            ['configure session s1', 'vlan 10', 'name web', 'commit'])
+        self.assertEqual(txn.results, [True])
+        self.assertIsNone(self.node._session_name)
+
+    def test_transaction_with_api_setters(self):
+        self.node._running_config = 'hostname veos01\n'
+        self.node.run_commands = Mock(return_value=[{}] * 5)
+        with self.node.transaction() as txn:
+            interfaces = self.node.api('interfaces')
+            self.assertTrue(interfaces.set_description('Ethernet1', 'a'))
+            self.assertTrue(interfaces.set_shutdown('Ethernet1', disable=True))
+        self.node.run_commands.assert_called_once_with(
+            ['configure terminal', 'interface Ethernet1', 'description a',
+             'no shutdown'])
+        self.assertEqual(txn.results, [True, True])
+
+    def test_transaction_keeps_multi_mode_blocks(self):
+        self.node.run_commands = Mock(return_value=[{}] * 8)
+        members = ['interface Ethernet6', 'no channel-group 1',
+                   'interface Ethernet7', 'channel-group 1 mode active']
+        with self.node.transaction() as txn:
+            self.node.config(members)
+            self.node.config(['interface Ethernet6',
+                              'description uplink-Et6'])
+        commands, positions = txn.build()
+        self.assertEqual(commands, members + ['interface Ethernet6',
+                                              'description uplink-Et6'])
+        self.assertEqual(positions, [[0, 1, 2, 3], [4, 5]])
+
+    def test_transaction_does_not_dedupe_across_modes(self):
+        self.node.run_commands = Mock(return_value=[{}] * 6)
+        members = ['interface Ethernet6', 'channel-group 1 mode active',
+                   'interface Ethernet7', 'channel-group 1 mode active']
+        with self.node.transaction():
+            self.node.config(members)
+        self.node.run_commands.assert_called_once_with(
+            ['configure terminal'] + members)
+
+    def test_transaction_with_exit_block(self):
+        with open(get_fixture('running_config.vrf')) as fixture:
+            self.node._running_config = fixture.read()
+        self.node._version_number = '4.17.1.1'
+        self.node.run_commands = Mock(return_value=[{}] * 7)
+        vrfs = self.node.api('vrfs')
+        with self.node.transaction() as txn:
+            vrfs.reconcile_state(dict(blah=dict(description='new',
+                                                ipv6_routing=True)))
+            vrfs.set_description('blah', 'x')
+        self.node.run_commands.assert_called_once_with(
+            ['configure terminal', 'vrf definition blah', 'description new',
+             'exit', 'ipv6 unicast-routing vrf blah', 'vrf definition blah',
+             'description x'])
+        self.assertEqual(txn.results, [True, True])
+
+    def test_transaction_with_multiple_cli_variants(self):
+        self.node._running_config = 'hostname veos01\n'
+        self.node._version_number = '4.17.1.1'
+        self.node.variants_cache = pyeapi.utils.CliVariantsCache()
+        self.node.run_commands = Mock(return_value=[{}] * 4)
+        interfaces = self.node.api('interfaces')
+        with self.node.transaction() as txn:
+            interfaces.remove_vlan('Vxlan1', 10)
+            interfaces.remove_vlan('Vxlan1', 20)
+        self.node.run_commands.assert_called_once_with(
+            ['configure terminal', 'interface Vxlan1',
+             'vxlan vlan remove 10 vni $', 'vxlan vlan remove 20 vni $'])
+        self.assertEqual(txn.results, [True, True])
+
+    def test_transaction_results_on_failure_with_cli_variants(self):
+        first = pyeapi.eapilib.CommandError(
+            1002, 'invalid command',
+            output=[{}, {}, {}, {}, {}, {}, {'errors': ['invalid']}])
+        last = pyeapi.eapilib.CommandError(
+            1002, 'invalid command',
+            output=[{}, {}, {}, {}, {}, {}, {}, {'errors': ['invalid']}])
+        self.node._version_number = '4.17.1.1'
+        self.node.variants_cache = pyeapi.utils.CliVariantsCache()
+        self.node.run_commands = Mock(side_effect=[first, last])
+        with self.node.transaction() as txn:
+            self.node.config(['interface Ethernet1', 'description a'])
+            self.node.config(['interface Vxlan1',
+                              pyeapi.utils.CliVariants(['new a', 'new b'],
+                                                       'legacy')])
+            self.node.config(['vlan 10', 'name bad name'])
+        self.assertEqual(txn.results, [True, True, False])
+        self.assertIs(txn.error, last)
+        self.assertEqual(last.variants, (1,))
+
+    def test_apply_session_single_request(self):
+        self.node.run_commands = Mock(return_value=[
+            dict(output=''), dict(output=''), dict(output='+vlan 10\n'),
+            dict(output='')])
+        self.node._running_config = 'config'
+        with patch('pyeapi.client.uuid4', return_value='s1'):
+            result = self.node.apply_session(['vlan 10'])
+        self.node.run_commands.assert_called_once_with(
+            ['configure session s1', 'vlan 10', 'show session-config diffs',
+             'commit'], 'text')
+        self.assertEqual(result['diff'], '+vlan 10\n')
+        self.assertTrue(result['committed'])
+        self.assertFalse(result['aborted'])
+        self.assertEqual(result['response'], [dict(output='')])
+        self.assertIsNone(self.node._running_config)
+
+    def test_apply_session_with_timer(self):
+        self.node.run_commands = Mock(return_value=[dict(output='')] * 4)
+        with patch('pyeapi.client.uuid4', return_value='s1'):
+            self.node.apply_session('vlan 10', timer=300)
+        self.node.run_commands.assert_called_once_with(
+            ['configure session s1', 'vlan 10', 'show session-config diffs',
+             'commit timer 00:05:00'], 'text')
+
+    def test_apply_session_confirm_rejected(self):
+        self.node.run_commands = Mock(return_value=[dict(output='')] * 3)
+        with patch('pyeapi.client.uuid4', return_value='s1'):
+            result = self.node.apply_session('vlan 10',
+                                             confirm=lambda diff: False)
+        self.assertEqual(self.node.run_commands.mock_calls, [
+            call(['configure session s1', 'vlan 10',
+                  'show session-config diffs'], 'text'),
+            call(['configure session s1', 'abort'], 'text')])
+        self.assertTrue(result['aborted'])
+        self.assertFalse(result['committed'])
+
+    def test_apply_session_aborts_on_error(self):
+        error = pyeapi.eapilib.CommandError(1002, 'invalid command')
+        self.node.run_commands = Mock(side_effect=[error, []])
+        with patch('pyeapi.client.uuid4', return_value='s1'):
+            with self.assertRaises(pyeapi.eapilib.CommandError):
+                self.node.apply_session('vlan x')
+        self.node.run_commands.assert_called_with(
+            ['configure session s1', 'abort'], 'text')
+
+    def test_apply_session_aborts_on_confirmed_commit_error(self):
+        error = pyeapi.eapilib.CommandError(1002, 'commit failed')
+        self.node.run_commands = Mock(
+            side_effect=[[dict(output='')] * 3, error, []])
+        with patch('pyeapi.client.uuid4', return_value='s1'):
+            with self.assertRaises(pyeapi.eapilib.CommandError):
+                self.node.apply_session('vlan 10',
+                                        confirm=lambda diff: True)
+        self.assertEqual(self.node.run_commands.mock_calls[1:], [
+            call(['configure session s1', 'commit'], 'text'),
+            call(['configure session s1', 'abort'], 'text')])
+
+    def test_apply_session_raises_type_error(self):
+        with self.assertRaises(TypeError):
+            self.node.apply_session('vlan 10', action='invalid')
+
+    def test_config_cli_variants_remembers_variant(self):
+        cache = pyeapi.utils.CliVariantsCache()
+        node = pyeapi.client.Node(None, variants_cache=cache)
+        node._version_number = '4.20.1'
+        error = pyeapi.eapilib.CommandError(1002, 'invalid command')
+        node.run_commands = Mock(side_effect=[error, [{}, {}, {}]])
+        variants = pyeapi.utils.CliVariants('new 1', 'old 1')
+        node.config(['interface Ethernet1', variants])
+        self.assertEqual(node.run_commands.call_count, 2)
+
+        node.run_commands = Mock(return_value=[{}, {}, {}])
+        node.config(['interface Ethernet2',
+                     pyeapi.utils.CliVariants('new 2', 'old 2')])
+        node.run_commands.assert_called_once_with(
+            ['configure terminal', 'interface Ethernet2', 'old 2'])
+
+    def test_running_config_single_flight(self):
+        def get_config(*args, **kwargs):
+            time.sleep(0.05)
+            return 'config'
+
+        self.node.get_config = Mock(side_effect=get_config)
+        results = list()
+        threads = [threading.Thread(
+            target=lambda: results.append(self.node.running_config))
+            for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ['config'] * 5)
+        self.assertEqual(self.node.get_config.call_count, 1)
+
+    def test_session_name_is_per_thread(self):
+        self.node.configure_session()
+        names = list()
+        thread = threading.Thread(
+            target=lambda: names.append(self.node._session_name))
+        thread.start()
+        thread.join()
+        self.assertIsNotNone(self.node._session_name)
+        self.assertEqual(names, [None])
+
+    def test_transaction_is_per_thread(self):
+        self.node.run_commands = Mock(return_value=[{}, {}])
+        with self.node.transaction():
+            thread = threading.Thread(
+                target=lambda: self.node.config('hostname a'))
+            thread.start()
+            thread.join()
+            self.node.run_commands.assert_called_once_with(
+                ['configure terminal', 'hostname a'])
+
+    def test_section_literal_lookup(self):
+        self.node._running_config = ('interface Ethernet1\n   mtu 9214\n'
+                                     'interface Ethernet10\n   mtu 1500')
+        result = self.node.section('^^interface Ethernet1$')
+        self.assertEqual(result.strip(), 'interface Ethernet1\n   mtu 9214')
+        with self.assertRaises(TypeError):
+            self.node.section('^interface Ethernet2$')
+
+    def test_section_literal_lookup_with_dot(self):
+        self.node._running_config = 'interface Ethernet1/1\n   mtu 9214'
+        result = self.node.section('^interface Ethernet1.1$')
+        self.assertEqual(result, 'interface Ethernet1/1\n   mtu 9214')
+
+    def test_memoize_returns_stored_value(self):
+        self.node._running_config = 'hostname a'
+        builder = Mock(return_value='model')
+        self.assertEqual(self.node.memoize('key', builder), 'model')
+        self.assertEqual(self.node.memoize('key', builder), 'model')
+        self.assertEqual(builder.call_count, 1)
+
+    def test_memoize_discards_value_on_config_change(self):
+        self.node._running_config = 'hostname a'
+        builder = Mock(return_value='model')
+        self.node.memoize('key', builder)
+        self.node._running_config = 'hostname b'
+        self.node.memoize('key', builder)
+        self.assertEqual(builder.call_count, 2)
+
+    def test_memoize_keeps_value_for_identical_config(self):
+        self.node._running_config = 'hostname a'
+        builder = Mock(return_value='model')
+        self.node.memoize('key', builder)
+        self.node._running_config = ''.join(['hostname ', 'a'])
+        self.node.memoize('key', builder)
+        self.assertEqual(builder.call_count, 1)
+
+    def test_refresh_force_discards_probed_config(self):
+        node = pyeapi.client.Node(None, config_probe='show probe')
+        node._running_config = 'config'
+        node._config_token = '1'
+        node.refresh(force=True)
+        self.assertIsNone(node._running_config)
+
 
 class TestClient(unittest.TestCase):
 
@@ -457,6 +866,25 @@ class TestClient(unittest.TestCase):
             transport.assert_called_once_with(**kwargs)
             self.assertEqual(node._enablepwd, 'enablepwd')
 
+    def test_connect_return_node_prefetch(self):
+        transport = Mock()
+        with patch.dict(pyeapi.client.TRANSPORTS, {'https': transport}):
+            with patch('pyeapi.client.Node.prefetch') as prefetch:
+                pyeapi.client.connect(return_node=True,
+                                      prefetch='version, running_config')
+                prefetch.assert_called_once_with('version', 'running_config')
+
+    def test_connect_return_node_prefetch_disabled(self):
+        transport = Mock()
+        with patch.dict(pyeapi.client.TRANSPORTS, {'https': transport}):
+            with patch('pyeapi.client.Node.prefetch') as prefetch:
+                for value in ['false', 'No', ' off ', '']:
+                    node = pyeapi.client.connect(return_node=True,
+                                                 prefetch=value,
+                                                 config_probe=value)
+                    self.assertFalse(node.config_probe)
+                prefetch.assert_not_called()
+
     def test_connect_to_with_config(self):
         transport = Mock()
         with patch.dict(pyeapi.client.TRANSPORTS, {'https': transport}):
@@ -0,0 +1,146 @@
+#
+# Copyright (c) 2014, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+import os
+import sys
+import shutil
+import tempfile
+import zlib
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../lib'))
+
+from unittest.mock import Mock
+
+from testlib import get_fixture
+
+import pyeapi.client
+from pyeapi.configcache import ConfigCache, fingerprint
+
+
+class TestConfigCache(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.cache = ConfigCache(self.path)
+        self.config = open(get_fixture('running_config.text')).read()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_store_and_load(self):
+        sections = {'hostname localhost': 'hostname localhost\n'}
+        self.cache.store('veos01', '1', self.config, sections, params='all')
+        result = self.cache.load('veos01', '1', params='all')
+        self.assertEqual(result, (self.config, sections))
+
+    def test_load_returns_none_for_different_token(self):
+        self.cache.store('veos01', '1', self.config, {})
+        self.assertIsNone(self.cache.load('veos01', '2'))
+
+    def test_load_returns_none_for_different_params(self):
+        self.cache.store('veos01', '1', self.config, {}, params='all')
+        self.assertIsNone(self.cache.load('veos01', '1'))
+
+    def test_load_returns_none_for_corrupt_file(self):
+        filename = self.cache.store('veos01', '1', self.config, {})
+        with open(filename, 'r+b') as fh:
+            fh.seek(-10, os.SEEK_END)
+            fh.write(b'x' * 10)
+        self.assertIsNone(self.cache.load('veos01', '1'))
+
+    def test_load_returns_none_for_invalid_payload(self):
+        filename = self.cache.store('veos01', '1', self.config, {})
+        with open(filename, 'rb') as fh:
+            header = fh.readline()
+        for payload in [b'{"config": "hostname', b'{"config": "x"}',
+                        b'["config"]']:
+            with open(filename, 'wb') as fh:
+                fh.write(header + zlib.compress(payload))
+            self.assertIsNone(self.cache.load('veos01', '1'))
+
+    def test_store_purges_previous_entries(self):
+        first = self.cache.store('veos01', '1', self.config, {})
+        other = self.cache.store('veos01.lab', '1', self.config, {})
+        second = self.cache.store('veos01', '2', self.config, {})
+        self.assertFalse(os.path.exists(first))
+        self.assertTrue(os.path.exists(second))
+        self.assertTrue(os.path.exists(other))
+
+    def test_fingerprint(self):
+        self.assertEqual(fingerprint('a'), fingerprint('a'))
+        self.assertNotEqual(fingerprint('a'), fingerprint('b'))
+
+
+class TestNodeConfigCache(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.config = open(get_fixture('running_config.text')).read().strip()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def node(self):
+        return pyeapi.client.Node(None, name='veos01',
+                                  config_probe='show probe',
+                                  config_cache=self.path)
+
+    def test_cold_node_loads_config_from_cache(self):
+        node = self.node()
+        node.run_commands = Mock(return_value=[dict(output='1'),
+                                               dict(output=self.config)])
+        self.assertEqual(node.running_config, self.config)
+
+        node = self.node()
+        node.run_commands = Mock(return_value=[dict(output='1')])
+        self.assertEqual(node.running_config, self.config)
+        self.assertEqual(node.section('^hostname'), 'hostname veos01\n')
+        # the output of the probe detection is reused as the token
+        node.run_commands.assert_called_once_with('show probe', 'text')
+        self.assertEqual(node.probe_stats['hits'], 1)
+
+    def test_cold_node_downloads_changed_config(self):
+        node = self.node()
+        node.run_commands = Mock(return_value=[dict(output='1'),
+                                               dict(output=self.config)])
+        node.running_config
+
+        node = self.node()
+        node.run_commands = Mock(side_effect=[
+            [dict(output='2')],
+            [dict(output='2'), dict(output='hostname veos02')]])
+        self.assertEqual(node.running_config, 'hostname veos02')
+        self.assertEqual(node.run_commands.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+#
+# Copyright (c) 2014, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../lib'))
+
+from unittest.mock import Mock, patch
+
+from testlib import get_fixture
+
+import pyeapi.client
+from pyeapi.configmodel import Section
+from pyeapi.configtree import ConfigTree
+
+RESPONSE = {
+    'cmds': {
+        'interface Ethernet1': {
+            'cmds': {'description foo bar': None,
+                     'no switchport': None,
+                     'ip address 10.0.0.1/24': None,
+                     'ip address 10.0.1.1/24 secondary': None},
+            'comments': []},
+        'interface Vlan10': {
+            'cmds': {'ip virtual-router address 10.10.10.1': None},
+            'comments': []},
+    }
+}
+
+TEXT = """interface Ethernet1
+   description foo bar
+   no switchport
+   ip address 10.0.0.1/24
+   ip address 10.0.1.1/24 secondary
+interface Vlan10
+   ip virtual-router address 10.10.10.1
+"""
+
+
+class TestSection(unittest.TestCase):
+
+    def setUp(self):
+        self.section = Section.from_text(TEXT.split('interface Vlan10')[0])
+
+    def test_from_text(self):
+        self.assertEqual(self.section.key, 'interface Ethernet1')
+        self.assertEqual(self.section.lines[0], 'description foo bar')
+
+    def test_from_tree(self):
+        tree = ConfigTree.from_response(RESPONSE).child('interface Ethernet1')
+        section = Section.from_tree(tree)
+        self.assertEqual(section.key, self.section.key)
+        self.assertEqual(section.lines, self.section.lines)
+
+    def test_contains_matches_complete_lines(self):
+        self.assertIn('no switchport', self.section)
+        self.assertNotIn('no', self.section)
+        self.assertNotIn('switchport', self.section)
+
+    def test_get(self):
+        self.assertEqual(self.section.get('description'), 'foo bar')
+        self.assertEqual(self.section.get('no switchport'), '')
+        self.assertIsNone(self.section.get('mtu'))
+        self.assertEqual(self.section.get('mtu', 'none'), 'none')
+
+    def test_getall(self):
+        self.assertEqual(self.section.getall('ip address'),
+                         ['10.0.0.1/24', '10.0.1.1/24 secondary'])
+        self.assertEqual(self.section.getall('ip'),
+                         ['address 10.0.0.1/24',
+                          'address 10.0.1.1/24 secondary'])
+        self.assertEqual(self.section.getall('ip addr'), [])
+
+
+class TestSectionModels(unittest.TestCase):
+
+    def setUp(self):
+        self.tree_node = pyeapi.client.Node(None, config_format='json')
+        self.tree_node.run_commands = Mock(return_value=[RESPONSE])
+        self.text_node = pyeapi.client.Node(None)
+        self.text_node._running_config = TEXT
+
+    def test_models_match_between_formats(self):
+        tree_models = self.tree_node.api('interfaces') \
+            .get_section_models('interface')
+        text_models = self.text_node.api('interfaces') \
+            .get_section_models('interface')
+        self.assertEqual(sorted(tree_models), ['Ethernet1', 'Vlan10'])
+        self.assertEqual(sorted(tree_models), sorted(text_models))
+        for name, section in tree_models.items():
+            self.assertEqual(section.lines, text_models[name].lines)
+        self.assertIsNone(self.tree_node._running_config)
+
+    def test_models_shared_between_modules(self):
+        node = pyeapi.client.Node(None)
+        node._version_number = '4.17.1.1'
+        with open(get_fixture('running_config.text')) as fixture:
+            node._running_config = fixture.read()
+        node.enable = Mock(return_value=[{'result': {'portChannels': {}}}])
+        with patch.object(Section, 'from_text',
+                          wraps=Section.from_text) as from_text:
+            for module in ['interfaces', 'switchports', 'ipinterfaces',
+                           'vrrp']:
+                node.api(module).getall()
+            node.api('stp').interfaces.getall()
+            node.api('mlag').get()
+            node.api('varp').get()
+        interfaces = node.api('interfaces').get_section_models('interface')
+        # every interface block is split once for all the modules, the
+        # remaining section is the global mlag configuration
+        self.assertEqual(from_text.call_count, len(interfaces) + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
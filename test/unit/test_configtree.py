@@ -0,0 +1,226 @@
+#
+# Copyright (c) 2014, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../lib'))
+
+from unittest.mock import Mock
+
+import pyeapi.client
+from pyeapi.configtree import ConfigTree
+
+RESPONSE = {
+    'header': ['! device: veos01 (vEOS, EOS-4.26.0F)'],
+    'cmds': {
+        'hostname veos01': None,
+        'interface Ethernet1': {
+            'cmds': {'description foo': None, 'no switchport': None},
+            'comments': []},
+        'interface Port-Channel10': {
+            'cmds': {'mlag 10': None}, 'comments': ['uplink']},
+        'mac security': {
+            'cmds': {'profile PR': {
+                'cmds': {'cipher aes256-gcm': None}, 'comments': []}},
+            'comments': []},
+        'router bgp 65000': {
+            'cmds': {'router-id 1.1.1.1': None,
+                     'neighbor 2.2.2.2 remote-as 65001': None},
+            'comments': []},
+    }
+}
+
+TEXT = """hostname veos01
+interface Ethernet1
+   description foo
+   no switchport
+interface Port-Channel10
+   !! uplink
+   mlag 10
+mac security
+   profile PR
+      cipher aes256-gcm
+router bgp 65000
+   router-id 1.1.1.1
+   neighbor 2.2.2.2 remote-as 65001"""
+
+RESOURCES = {
+    'cmds': {
+        'interface Ethernet1': {
+            'cmds': {'description uplink': None, 'no switchport': None,
+                     'vrf red': None, 'ip address 10.0.0.1/24': None,
+                     'mtu 9000': None},
+            'comments': []},
+        'interface Vlan10': {
+            'cmds': {'ip virtual-router address 10.10.10.1': None},
+            'comments': []},
+        'ip access-list standard mgmt': {
+            'cmds': {'10 permit host 1.1.1.1': None,
+                     '20 deny any log': None},
+            'comments': []},
+        'ip access-list web': {
+            'cmds': {'10 permit tcp any any eq www': None},
+            'comments': []},
+        'ip route 0.0.0.0/0 192.168.1.1 1': None,
+        'ip route 10.0.0.0/8 Ethernet1 10.0.0.2 1 tag 5': None,
+        'ip virtual-router mac-address 00:11:22:33:44:55': None,
+        'no ipv6 unicast-routing vrf red': None,
+        'vlan 10': {
+            'cmds': {'name storage': None, 'state active': None,
+                     'trunk group mlag': None},
+            'comments': []},
+        'vrf instance red': {
+            'cmds': {'rd 1:1': None, 'description red vrf': None},
+            'comments': []},
+    }
+}
+
+
+class TestConfigTree(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = ConfigTree.from_response(RESPONSE)
+
+    def test_text_renders_running_config(self):
+        self.assertEqual(self.tree.text().strip(), TEXT)
+
+    def test_section_literal_lookup(self):
+        section = self.tree.section('^interface Ethernet1$')
+        self.assertEqual(section.key, 'interface Ethernet1')
+        self.assertEqual(section.commands(),
+                         ['description foo', 'no switchport'])
+
+    def test_section_regex_lookup(self):
+        section = self.tree.section(r'^router bgp .*$')
+        self.assertEqual(section.key, 'router bgp 65000')
+
+    def test_section_nested_lookup(self):
+        section = self.tree.section('^   profile PR$')
+        self.assertEqual(section.depth, 1)
+        self.assertEqual(section.text(),
+                         '   profile PR\n      cipher aes256-gcm\n')
+
+    def test_section_not_found(self):
+        self.assertIsNone(self.tree.section('^interface Ethernet2$'))
+        self.assertIsNone(self.tree.section('^profile PR$'))
+
+    def test_children(self):
+        section = self.tree.section('^mac security$')
+        self.assertEqual([c.key for c in section], ['profile PR'])
+        self.assertIn('profile PR', section)
+        self.assertEqual(len(section), 1)
+
+
+class TestNodeConfigTree(unittest.TestCase):
+
+    def setUp(self):
+        self.tree_node = pyeapi.client.Node(None, config_format='json')
+        self.tree_node.run_commands = Mock(return_value=[RESPONSE])
+        self.text_node = pyeapi.client.Node(None)
+        self.text_node._running_config = TEXT + '\n'
+
+    def test_running_config_tree_uses_json(self):
+        self.assertIsInstance(self.tree_node.running_config_tree, ConfigTree)
+        self.tree_node.run_commands.assert_called_once_with(
+            'show running-config all', 'json')
+
+    def test_running_config_rendered_from_tree(self):
+        self.assertEqual(self.tree_node.running_config, TEXT)
+
+    def test_section_matches_text_path(self):
+        for regex in ['^hostname veos01$', '^interface Ethernet1$',
+                      '^interface Port-Channel10$', '^mac security$',
+                      r'^router bgp .*$', '^   profile PR$']:
+            self.assertEqual(self.tree_node.section(regex),
+                             self.text_node.section(regex), regex)
+
+    def test_section_not_found_raises_type_error(self):
+        with self.assertRaises(TypeError):
+            self.tree_node.section('^interface Ethernet2$')
+
+    def test_section_keys_read_from_tree(self):
+        interfaces = self.tree_node.api('interfaces')
+        self.assertEqual(list(interfaces),
+                         ['Ethernet1', 'Port-Channel10'])
+        self.assertEqual(list(interfaces),
+                         list(self.text_node.api('interfaces')))
+        # the running-config text is not rendered to list the keys
+        self.assertIsNone(self.tree_node._running_config)
+
+    def test_sections_read_from_tree(self):
+        regex = r'^interface\s'
+        sections = list(self.tree_node.api('interfaces').get_sections(regex))
+        self.assertEqual(sections,
+                         list(self.text_node.api('interfaces')
+                              .get_sections(regex)))
+        self.assertEqual([line for line, _ in sections],
+                         ['interface Ethernet1', 'interface Port-Channel10'])
+        self.assertIsNone(self.tree_node._running_config)
+
+    def test_resources_read_from_tree(self):
+        tree_node = pyeapi.client.Node(None, config_format='json')
+        tree_node._version_number = '4.23.0'
+        tree_node.run_commands = Mock(return_value=[RESOURCES])
+        tree_node.enable = Mock(return_value=[{'result': {}}])
+        text_node = pyeapi.client.Node(None)
+        text_node._version_number = '4.23.0'
+        text_node._running_config = \
+            ConfigTree.from_response(RESOURCES).text()
+        text_node.enable = tree_node.enable
+        for module in ['interfaces', 'ipinterfaces', 'vlans', 'vrfs',
+                       'staticroute', 'acl']:
+            self.assertEqual(tree_node.api(module).getall(),
+                             text_node.api(module).getall(), module)
+        self.assertEqual(tree_node.api('varp').get(),
+                         text_node.api('varp').get())
+        self.assertEqual(tree_node.api('acl').get_compact('mgmt'),
+                         text_node.api('acl').get_compact('mgmt'))
+        self.assertEqual(list(tree_node.api('acl').iter_all()),
+                         list(text_node.api('acl').iter_all()))
+        self.assertEqual(list(tree_node.api('staticroute').iter_all()),
+                         list(text_node.api('staticroute').iter_all()))
+        self.assertEqual(tree_node.api('vrfs').get('red'),
+                         dict(vrf_name='red', rd='1:1',
+                              description='red vrf', ipv4_routing=True,
+                              ipv6_routing=False))
+        # the parsers read the tree, the running-config is not rendered
+        self.assertIsNone(tree_node._running_config)
+
+    def test_refresh_clears_tree(self):
+        self.tree_node.running_config_tree
+        self.tree_node.refresh()
+        self.assertIsNone(self.tree_node._running_config_tree)
+
+
+if __name__ == '__main__':
+    unittest.main()
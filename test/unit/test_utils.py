@@ -80,8 +80,116 @@ class TestUtils(unittest.TestCase):
         result = pyeapi.utils.collapse_range(vlans)
         self.assertEqual(result, ['1', '3', '5-7', '9'])
 
+    def test_split_sections(self):
+        config = ('interface Ethernet1\n'
+                  '   description a\n'
+                  'banner motd\n'
+                  'interface Ethernet9\n'
+                  'EOF\n'
+                  'vlan 10\n'
+                  '   name ten\n'
+                  'interface Ethernet2\n'
+                  '   shutdown')
+        result = pyeapi.utils.split_sections(config, r'^interface\s')
+        self.assertEqual(result, {
+            'interface Ethernet1': 'interface Ethernet1\n   description a\n',
+            'interface Ethernet2': 'interface Ethernet2\n   shutdown'})
+
+    def test_iter_sections(self):
+        config = ('interface Ethernet1\n'
+                  '   description a\n'
+                  'vlan 10\n'
+                  'interface Ethernet2\n'
+                  '   shutdown')
+        result = pyeapi.utils.iter_sections(config, r'^interface\s')
+        self.assertEqual(next(result), ('interface Ethernet1',
+                                        'interface Ethernet1\n'
+                                        '   description a\n'))
+        self.assertEqual(list(result), [('interface Ethernet2',
+                                         'interface Ethernet2\n'
+                                         '   shutdown')])
+
+    def test_vlanset_parse_and_format(self):
+        vlans = pyeapi.utils.VlanSet('1-10, 20,30-31')
+        self.assertEqual(str(vlans), '1-10,20,30-31')
+        self.assertEqual(len(vlans), 13)
+        self.assertIn(20, vlans)
+        self.assertIn('5', vlans)
+        self.assertNotIn(11, vlans)
+        self.assertEqual(list(pyeapi.utils.VlanSet('3,5-6')), [3, 5, 6])
+        self.assertEqual(str(pyeapi.utils.VlanSet([7, 1, '2', 3])), '1-3,7')
+        self.assertEqual(str(pyeapi.utils.VlanSet('all')), '1-4094')
+        self.assertFalse(pyeapi.utils.VlanSet('none'))
+        self.assertEqual(pyeapi.utils.VlanSet(4094), pyeapi.utils.VlanSet(
+            '4094'))
+
+    def test_vlanset_invalid(self):
+        for value in ['0', '4095', '10-5', 'a', '1,,2']:
+            with self.assertRaises(ValueError):
+                pyeapi.utils.VlanSet(value)
+
+    def test_vlanset_operations(self):
+        current = pyeapi.utils.VlanSet('1-10,20')
+        desired = pyeapi.utils.VlanSet('5-30')
+        self.assertEqual(str(desired - current), '11-19,21-30')
+        self.assertEqual(str(current - desired), '1-4')
+        self.assertEqual(str(current | desired), '1-30')
+        self.assertEqual(str(current & '8-25'), '8-10,20')
+        self.assertEqual(str(current ^ desired), '1-4,11-19,21-30')
+        self.assertTrue(current.issubset('1-20'))
+        self.assertFalse(current <= desired)
+        self.assertEqual(len({current, pyeapi.utils.VlanSet('1-10,20')}), 1)
+
+    def test_split_sections_matches_node_section(self):
+        from pyeapi.client import Node
+        config = ('interface Ethernet1\n   no shutdown\n!\n'
+                  'interface Ethernet1\n   shutdown\n'
+                  '   vrrp 1 priority 10\n      ! comment\n'
+                  'interface Vlan1\n')
+        node = Node(None)
+        node._running_config = config
+        result = pyeapi.utils.split_sections(config, r'^interface\s')
+        self.assertEqual(list(result), ['interface Ethernet1',
+                                        'interface Vlan1'])
+        for key, value in result.items():
+            self.assertEqual(value, node.section('^%s$' % key))
+
     @patch('pyeapi.utils._LOGGER')
     def test_debug(self, mock_logger):
         pyeapi.utils.islocalconnection = Mock(return_value=True)
         pyeapi.utils.debug('test')
         mock_logger.debug.assert_called_with('test_utils.test_debug: test')
+
+
+class TestCliVariantsCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = pyeapi.utils.CliVariantsCache()
+
+    def variants(self, vrid, value):
+        return pyeapi.utils.CliVariants(
+            'vrrp %d priority-level %d' % (vrid, value),
+            'vrrp %d priority %d' % (vrid, value))
+
+    def test_key_masks_common_tokens(self):
+        self.assertEqual(self.cache.key(self.variants(1, 100)),
+                         self.cache.key(self.variants(2, 200)))
+
+    def test_order_prefers_known_variant(self):
+        variants = self.variants(1, 100)
+        self.assertEqual(self.cache.order('4.20.1', variants), [0, 1])
+        self.cache.set('4.20.1', variants, 1)
+        self.assertEqual(self.cache.order('4.20.1', self.variants(3, 10)),
+                         [1, 0])
+        self.assertEqual(self.cache.order('4.30.1', variants), [0, 1])
+
+    def test_save_and_load(self):
+        import os
+        import tempfile
+        filename = os.path.join(tempfile.mkdtemp(), 'variants.json')
+        cache = pyeapi.utils.CliVariantsCache(filename)
+        cache.set('4.20.1', self.variants(1, 100), 1)
+        loaded = pyeapi.utils.CliVariantsCache(filename)
+        self.assertEqual(loaded.get('4.20.1', self.variants(5, 50)), 1)
+        os.remove(filename)
+        os.rmdir(os.path.dirname(filename))